@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 from app.api.v1.articles import router as articles_router
+from app.api.v1.facets import router as facets_router
+from app.api.v1.crawls import router as crawls_router
 
 api_router = APIRouter()
 
@@ -7,4 +9,16 @@ api_router.include_router(
     articles_router,
     prefix="/articles",
     tags=["articles"]
-) 
\ No newline at end of file
+)
+
+api_router.include_router(
+    facets_router,
+    prefix="/facets",
+    tags=["facets"]
+)
+
+api_router.include_router(
+    crawls_router,
+    prefix="/crawls",
+    tags=["crawls"]
+)
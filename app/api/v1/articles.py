@@ -1,6 +1,6 @@
 import logging
 from typing import List, Optional, Dict
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy import select, update, delete
 from sqlalchemy.orm import Session
 from datetime import datetime
@@ -8,6 +8,8 @@ from app.core.database import get_db
 from app.models.article import Article
 from app.schemas.article import ArticleInDB
 from app.core.config import settings
+from app.core.pagination import keyset_condition, next_cursor
+from app.services.facets import invalidate_facets
 from app.services.crawler.ltn_crawler import LTNCrawler
 
 router = APIRouter()
@@ -23,20 +25,39 @@ def get_sources():
 
 @router.get("/", response_model=List[ArticleInDB])
 def get_articles(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    days: Optional[int] = None
+    days: Optional[int] = None,
+    cursor: Optional[str] = None
 ):
-    query = select(Article).order_by(Article.published_at.desc())
+    """
+    取得文章列表
+
+    下一頁的游標放在 X-Next-Cursor 標頭，帶入 cursor 參數即可取得下一頁；
+    使用 cursor 時忽略 skip。
+    """
+    query = select(Article).order_by(Article.published_at.desc(), Article.id.desc())
     
     if days:
         from datetime import datetime, timedelta
         cutoff_date = datetime.now() - timedelta(days=days)
         query = query.filter(Article.published_at >= cutoff_date)
     
-    query = query.offset(skip).limit(limit)
-    articles = db.execute(query).scalars().all()
+    if cursor:
+        try:
+            query = query.where(keyset_condition(cursor))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        query = query.offset(skip)
+
+    articles = db.execute(query.limit(limit)).scalars().all()
+
+    cursor_for_next = next_cursor(articles, limit)
+    if cursor_for_next:
+        response.headers["X-Next-Cursor"] = cursor_for_next
     
     logger.info(f"Found {len(articles)} articles in database")
     for article in articles:
@@ -132,6 +153,7 @@ async def delete_all_articles(
         stmt = delete(Article)
         db.execute(stmt)
         db.commit()
+        invalidate_facets(db)
         return {"message": "All articles deleted"}
     except Exception as e:
         db.rollback()
@@ -235,6 +257,8 @@ async def crawl_articles(
                 continue
         
         logger.info(f"Crawling completed. Total articles added: {total_articles}")
+        if total_articles:
+            invalidate_facets(db)
         return {"message": f"Successfully crawled {total_articles} articles"}
         
     except Exception as e:
@@ -0,0 +1,31 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.models.crawl_job import CrawlRun
+from app.schemas.crawl import CrawlRunInfo, CrawlRunList
+from app.services.crawl_queue import list_runs
+
+router = APIRouter()
+
+@router.get("", response_model=CrawlRunList)
+def read_crawls(
+    limit: int = Query(20, ge=1, le=100),
+    before: Optional[int] = Query(None, description="只列出 ID 小於此值的紀錄"),
+    source: Optional[str] = Query(None, description="只列出包含此來源的紀錄"),
+    db: Session = Depends(get_db)
+):
+    """列出爬取紀錄（由新到舊），含各來源的狀態、文章數、頁數與耗時"""
+    runs = list_runs(db, limit=limit, before=before, source=source)
+    return {
+        "items": runs,
+        "next_before": runs[-1].id if len(runs) == limit else None
+    }
+
+@router.get("/{run_id}", response_model=CrawlRunInfo)
+def read_crawl(run_id: int, db: Session = Depends(get_db)):
+    """取得單次爬取紀錄"""
+    run = db.get(CrawlRun, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Crawl run not found")
+    return run
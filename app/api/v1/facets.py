@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.schemas.facets import Facets
+from app.services.facets import get_facets
+
+router = APIRouter()
+
+@router.get("", response_model=Facets)
+def read_facets(db: Session = Depends(get_db)):
+    """取得來源、分類、各來源文章數與日期範圍（快取）"""
+    return get_facets(db)
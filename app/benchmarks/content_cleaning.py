@@ -0,0 +1,69 @@
+"""
+文章內容清理效能比較
+以儲存的文章 HTML 比較逐一 str.replace 的舊寫法與預先編譯的 ContentCleaner。
+
+使用方式：
+    python -m app.benchmarks.content_cleaning --html debug_ettoday_article.html --iterations 200
+"""
+import argparse
+import re
+import time
+from typing import Callable, List
+
+from bs4 import BeautifulSoup
+
+from app.services.crawler.content_cleaner import DEFAULT_AD_TEXTS, get_cleaner
+
+# 各來源廣告文字的聯集，模擬最多廣告文字的情況
+BENCHMARK_AD_TEXTS = list(DEFAULT_AD_TEXTS) + [
+    "相關新聞影音", "更多房產新聞", "googletag.cmd.push", "window.fbAsyncInit",
+    "分享此文：", "延伸閱讀", "相關新聞", "訂閱我們的通訊", "關注我們", "最新房產新聞",
+    "Click here for more property stories", "SUBSCRIBE TO OUR NEWSLETTER",
+    "ARTIKEL BERKAITAN", "BACA JUGA", "Ikuti kami di", "Kongsi artikel", "ADVERTISEMENT", "IKLAN",
+]
+
+
+def legacy_clean(content: str, ad_texts: List[str]) -> str:
+    """改寫前的清理方式：每段廣告文字各做一次 str.replace"""
+    for ad in ad_texts:
+        content = content.replace(ad, "")
+    lines = [line.strip() for line in content.split('\n')]
+    lines = [line for line in lines if line]
+    lines = list(dict.fromkeys(lines))
+    content = '\n'.join(lines)
+    return re.sub(r'\s+', ' ', content).strip()
+
+
+def timed(func: Callable[[], str], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def run(html_path: str, iterations: int):
+    with open(html_path, encoding='utf-8') as f:
+        content = BeautifulSoup(f.read(), 'html.parser').get_text('\n')
+
+    cleaner = get_cleaner(BENCHMARK_AD_TEXTS)
+    if legacy_clean(content, BENCHMARK_AD_TEXTS) != cleaner.clean(content):
+        print("warning: outputs differ")
+
+    methods = {
+        'legacy str.replace': lambda: legacy_clean(content, BENCHMARK_AD_TEXTS),
+        'ContentCleaner': lambda: cleaner.clean(content),
+    }
+
+    print(f"content: {len(content)} chars, ad texts: {len(BENCHMARK_AD_TEXTS)}")
+    print(f"{'method':<24}{'ms/article':>12}")
+    for name, func in methods.items():
+        print(f"{name:<24}{timed(func, iterations) * 1000:>12.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='比較文章內容清理的效能')
+    parser.add_argument('--html', default='debug_ettoday_article.html', help='儲存的文章 HTML')
+    parser.add_argument('--iterations', type=int, default=200, help='重複次數')
+    args = parser.parse_args()
+
+    run(args.html, args.iterations)
@@ -0,0 +1,90 @@
+"""
+端對端爬取吞吐量
+啟動本機模擬新聞網站（app.benchmarks.mock_sites），將各來源的請求導向模擬站，
+以 run_crawler_process 完整執行爬取、解析、清理與寫入資料庫，輸出各來源文章數與整體吞吐量。
+
+使用方式（需連線至資料庫）：
+    python -m app.benchmarks.e2e --pages 3 --per-page 20 --latency-ms 80 --error-rate 0.02
+    python -m app.benchmarks.e2e --serial --sources ltn udn
+
+預設停用速率限制以量測爬蟲本身的處理能力，加上 --rate-limit 則依設定限速。
+指定相同的 --token 重複執行時，未變動的頁面會由 HTTP 快取以條件式請求取得（304）。
+結束後會刪除本次寫入的模擬文章（網址含本次的識別字串），加上 --keep 可保留。
+"""
+import argparse
+import logging
+import time
+import uuid
+
+from app.benchmarks.mock_sites import MockSites, add_arguments, build_server
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.article import Article
+from app.services.crawler.rate_limiter import rate_limiter
+
+
+def cleanup(token: str) -> int:
+    db = SessionLocal()
+    try:
+        deleted = db.query(Article).filter(Article.url.like(f"%{token}%")).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+def run(args) -> float:
+    # 延遲匯入：app.main 會建立應用程式與資料庫連線
+    from app.main import run_crawler_process
+
+    args.token = args.token or f"e2e{uuid.uuid4().hex[:12]}"
+    server = build_server(args).start()
+    sources = args.sources or list(MockSites.ORIGINS)
+    crawl_date = server.sites.article_date.isoformat()
+
+    original_overrides = settings.CRAWLER_ORIGIN_OVERRIDES
+    original_rate_limit = rate_limiter.enabled
+    settings.CRAWLER_ORIGIN_OVERRIDES = server.overrides()
+    rate_limiter.enabled = args.rate_limit
+    try:
+        start = time.perf_counter()
+        results = run_crawler_process(crawl_date, crawl_date, parallel=not args.serial, sources=sources)
+        elapsed = time.perf_counter() - start
+    finally:
+        settings.CRAWLER_ORIGIN_OVERRIDES = original_overrides
+        rate_limiter.enabled = original_rate_limit
+        server.stop()
+        if not args.keep:
+            cleanup(args.token)
+
+    expected = args.pages * args.per_page
+    total = 0
+    print(f"{'source':<20}{'articles':>10}{'expected':>10}{'requests':>10}{'304':>8}{'errors':>8}")
+    for source in sources:
+        result = results.get(source, {})
+        count = result.get('count', 0)
+        total += count
+        status = '' if result.get('status') == 'success' else f"  {result.get('error', 'failed')}"
+        print(
+            f"{source:<20}{count:>10}{expected:>10}"
+            f"{server.requests[source]:>10}{server.not_modified[source]:>8}{server.errors[source]:>8}{status}"
+        )
+    print(f"{'total':<20}{total:>10}{expected * len(sources):>10}"
+          f"{sum(server.requests.values()):>10}{sum(server.not_modified.values()):>8}"
+          f"{sum(server.errors.values()):>8}")
+    print(f"{elapsed:.2f} 秒，{total / elapsed:.1f} articles/s "
+          f"({'並行' if not args.serial else '循序'}，延遲 {args.latency_ms:.0f} ms，錯誤率 {args.error_rate:.0%})")
+    return elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='以本機模擬站量測端對端爬取吞吐量')
+    add_arguments(parser)
+    parser.add_argument('--sources', nargs='+', choices=list(MockSites.ORIGINS), help='要測試的來源，預設為全部')
+    parser.add_argument('--serial', action='store_true', help='依序爬取各來源')
+    parser.add_argument('--rate-limit', action='store_true', help='套用速率限制設定')
+    parser.add_argument('--keep', action='store_true', help='保留寫入的模擬文章')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    run(args)
@@ -0,0 +1,51 @@
+"""
+HTML 解析效能比較
+以儲存的文章頁比較 html.parser、lxml 後端，以及只解析文章容器子樹的 HtmlParser。
+
+使用方式：
+    python -m app.benchmarks.html_parsing --html debug_ettoday_article.html --container .story
+"""
+import argparse
+import time
+from typing import Any, Callable
+
+from bs4 import BeautifulSoup
+
+from app.services.crawler.base import HAS_LXML, HtmlParser
+
+
+def timed(func: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def run(html_path: str, container: str, iterations: int):
+    with open(html_path, encoding='utf-8') as f:
+        html = f.read()
+
+    parser = HtmlParser()
+    methods = {
+        'BeautifulSoup html.parser': lambda: BeautifulSoup(html, 'html.parser').select_one(container).get_text(),
+    }
+    if HAS_LXML:
+        methods['BeautifulSoup lxml'] = lambda: BeautifulSoup(html, 'lxml').select_one(container).get_text()
+        methods['HtmlParser container'] = lambda: parser.parse(html, container).get_text()
+    else:
+        print("lxml is not installed, only html.parser is measured")
+
+    print(f"html: {len(html)} chars, container: {container}")
+    print(f"{'method':<28}{'ms/page':>10}")
+    for name, func in methods.items():
+        print(f"{name:<28}{timed(func, iterations) * 1000:>10.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='比較 HTML 解析後端的效能')
+    parser.add_argument('--html', default='debug_ettoday_article.html', help='儲存的文章 HTML')
+    parser.add_argument('--container', default='.story', help='文章容器的 CSS selector')
+    parser.add_argument('--iterations', type=int, default=20, help='重複次數')
+    args = parser.parse_args()
+
+    run(args.html, args.container, args.iterations)
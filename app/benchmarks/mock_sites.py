@@ -0,0 +1,426 @@
+"""
+本機模擬新聞網站
+依各爬蟲解析的結構產生列表頁、文章頁與 JSON API（LTN AJAX、UDN /house/api/newest、
+NextApple infinite scroll、StarProperty 列表、Free Malaysia Today __NEXT_DATA__ 等），
+可設定頁數、每頁文章數、回應延遲與錯誤率，用於端對端吞吐量測試。
+
+每個來源掛在 /<source> 之下，爬蟲透過 CRAWLER_ORIGIN_OVERRIDES 將請求改送到這裡，
+文章網址仍是原網站的網址。需要瀏覽器才能爬取的 EdgeProp 不在模擬範圍內。
+
+使用方式：
+    python -m app.benchmarks.mock_sites --port 8900 --pages 3 --latency-ms 50
+    # 依輸出的 CRAWLER_ORIGIN_OVERRIDES 設定 worker 或 web 行程
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# 回應：(狀態碼, Content-Type, 內容)；None 表示 404
+Response = Optional[Tuple[int, str, str]]
+
+HTML = 'text/html; charset=utf-8'
+JSON = 'application/json; charset=utf-8'
+
+PARAGRAPHS = [
+    "央行理監事會後宣布利率維持不變，房市觀望氣氛仍濃。",
+    "建商指出，近期推案量增加，但實際成交仍集中在自住需求。",
+    "專家建議購屋族評估自身負擔能力，避免過度槓桿。",
+    "Developers expect demand for affordable housing to remain resilient this year.",
+    "Analysts say mortgage approvals picked up slightly in the last quarter.",
+]
+
+
+class MockSites:
+    """產生各來源的頁面
+
+    Args:
+        pages: 每個來源的列表頁數，超過後回傳空列表
+        per_page: 每頁文章數
+        token: 文章網址中的識別字串，每次測試使用不同值可避免被視為已收錄
+        article_date: 文章日期
+        paragraphs: 每篇文章的段落數
+    """
+
+    ORIGINS = {
+        'ltn': 'https://estate.ltn.com.tw',
+        'udn': 'https://house.udn.com',
+        'nextapple': 'https://tw.nextapple.com',
+        'ettoday': 'https://house.ettoday.net',
+        'starproperty': 'https://www.starproperty.my',
+        'freemalaysiatoday': 'https://www.freemalaysiatoday.com',
+        'hk852house': 'https://852.house',
+    }
+
+    def __init__(
+        self,
+        pages: int = 2,
+        per_page: int = 10,
+        token: Optional[str] = None,
+        article_date: Optional[date] = None,
+        paragraphs: int = 8
+    ):
+        self.pages = pages
+        self.per_page = per_page
+        self.token = token or f"mock{int(time.time())}"
+        self.article_date = article_date or date.today() - timedelta(days=1)
+        self.paragraphs = paragraphs
+        self.routes: Dict[str, Callable[[str, Dict[str, str]], Response]] = {
+            'ltn': self.ltn,
+            'udn': self.udn,
+            'nextapple': self.nextapple,
+            'ettoday': self.ettoday,
+            'starproperty': self.starproperty,
+            'freemalaysiatoday': self.freemalaysiatoday,
+            'hk852house': self.hk852house,
+        }
+
+    # 共用
+
+    def slugs(self, page: int):
+        """列表第 page 頁的文章代碼，超過頁數時為空"""
+        if not 1 <= page <= self.pages:
+            return []
+        return [f"{self.token}-{page}-{i}" for i in range(1, self.per_page + 1)]
+
+    def all_slugs(self):
+        return [slug for page in range(1, self.pages + 1) for slug in self.slugs(page)]
+
+    def published_at(self, slug: str) -> datetime:
+        """同一天內依列表順序由新到舊"""
+        _, page, i = slug.rsplit('-', 2)
+        minutes = (int(page) - 1) * self.per_page + int(i)
+        return datetime.combine(self.article_date, datetime.min.time()) + timedelta(hours=23, minutes=59 - minutes % 1440)
+
+    def title(self, source: str, slug: str) -> str:
+        return f"{source} 模擬新聞 {slug}"
+
+    def body(self, slug: str, tag: str = 'p') -> str:
+        return ''.join(
+            f"<{tag}>{PARAGRAPHS[(i + len(slug)) % len(PARAGRAPHS)]}（{slug} 第 {i + 1} 段）</{tag}>"
+            for i in range(self.paragraphs)
+        )
+
+    @staticmethod
+    def page(path_query: Dict[str, str], default: int = 1) -> int:
+        try:
+            return int(path_query.get('page', default))
+        except ValueError:
+            return default
+
+    @staticmethod
+    def html(body: str, head: str = '') -> Tuple[int, str, str]:
+        return 200, HTML, f"<!DOCTYPE html><html><head><meta charset=\"utf-8\">{head}</head><body>{body}</body></html>"
+
+    # 各來源
+
+    def ltn(self, path: str, query: Dict[str, str]) -> Response:
+        origin = self.ORIGINS['ltn']
+        if path.startswith('/ajaxList/news/'):
+            page = int(path.rsplit('/', 1)[-1] or 1)
+            return 200, JSON, json.dumps([{
+                'url': f"{origin}/article/{slug}",
+                'A_PublishDT': self.published_at(slug).strftime('%Y-%m-%d %H:%M:%S'),
+                'title': self.title('ltn', slug),
+                'summary': f"摘要 {slug}",
+            } for slug in self.slugs(page)], ensure_ascii=False)
+        if path.startswith('/article/'):
+            slug = path.rsplit('/', 1)[-1]
+            return self.html(
+                f"<h1>{self.title('ltn', slug)}</h1><div class=\"text boxTitle\">"
+                f"<div class=\"ph_i\"><img src=\"https://img.ltn.com.tw/{slug}.jpg\"></div>{self.body(slug)}</div>"
+            )
+        return None
+
+    def udn(self, path: str, query: Dict[str, str]) -> Response:
+        if path == '/house/api/newest':
+            page = self.page(query)
+            return 200, JSON, json.dumps({
+                'lists': [{
+                    'url': f"/house/story/{slug}",
+                    'image_url': f"https://pgw.udn.com.tw/{slug}.jpg",
+                    'cate': {'title': '房市'},
+                } for slug in self.slugs(page)],
+                'end': page >= self.pages,
+            }, ensure_ascii=False)
+        if path.startswith('/house/story/'):
+            slug = path.rsplit('/', 1)[-1]
+            return self.html(
+                f"<h1 class=\"article-content__title\">{self.title('udn', slug)}</h1>"
+                f"<time class=\"article-content__time\">{self.published_at(slug):%Y-%m-%d %H:%M}</time>"
+                f"<span class=\"article-content__author\">記者 模擬</span>"
+                f"<section class=\"article-content__paragraph\">{self.body(slug)}</section>"
+            )
+        return None
+
+    def nextapple(self, path: str, query: Dict[str, str]) -> Response:
+        origin = self.ORIGINS['nextapple']
+        if path.startswith('/realtime/property/'):
+            page = int(path.rsplit('/', 1)[-1] or 1)
+            items = ''.join(
+                f"<article articleid=\"{slug}\"><img data-src=\"https://img.nextapple.com/{slug}.jpg\">"
+                f"<div class=\"category\">房產</div>"
+                f"<h3><a class=\"post-title\" href=\"{origin}/property/{slug}\">{self.title('nextapple', slug)}</a></h3>"
+                f"<time datetime=\"{self.published_at(slug):%Y-%m-%dT%H:%M:%S}+08:00\"></time>"
+                f"<p>摘要 {slug}</p></article>"
+                for slug in self.slugs(page)
+            )
+            return self.html(items)
+        if path.startswith('/property/'):
+            slug = path.rsplit('/', 1)[-1]
+            return self.html(
+                f"<blockquote><div>摘要 {slug}</div></blockquote><div class=\"post-content\">{self.body(slug)}</div>"
+            )
+        return None
+
+    def ettoday(self, path: str, query: Dict[str, str]) -> Response:
+        if path in ('', '/'):
+            # 首頁只有一頁，所有文章都放在最新區塊
+            items = ''.join(
+                f"<div class=\"col\"><div class=\"part_pic\"><img src=\"//cdn2.ettoday.net/{slug}.jpg\"></div>"
+                f"<h3><a href=\"/news/{slug}\">{self.title('ettoday', slug)}</a></h3></div>"
+                for slug in self.all_slugs()
+            )
+            return self.html(f"<h2 class=\"block_title_3\">房產最新</h2><div class=\"part_txt_1\">{items}</div>")
+        if path.startswith('/news/'):
+            slug = path.rsplit('/', 1)[-1]
+            return self.html(
+                f"<time class=\"date\">{self.published_at(slug):%Y-%m-%d %H:%M}</time>"
+                f"<div class=\"story\"><p class=\"no_margin\"><img src=\"//cdn2.ettoday.net/{slug}.jpg\"></p>"
+                f"{self.body(slug)}</div>",
+                head=f"<meta name=\"description\" content=\"摘要 {slug}\">"
+            )
+        return None
+
+    def starproperty(self, path: str, query: Dict[str, str]) -> Response:
+        if path == '/news/property-news':
+            page = self.page(query)
+            items = ''.join(
+                f"<div class=\"news-item\" itemtype=\"https://schema.org/NewsArticle\">"
+                f"<div class=\"news-item__image\"><img src=\"/images/{slug}.jpg\"></div>"
+                f"<div class=\"news-item__body\"><a itemprop=\"url\" href=\"/news/{slug}\">"
+                f"<h3>{self.title('starproperty', slug)}</h3></a>"
+                f"<div class=\"news-item__details\">{self.published_at(slug):%A, %d %b %Y %I:%M %p}</div></div></div>"
+                for slug in self.slugs(page)
+            )
+            return self.html(f"<div class=\"row row-flex news-listing\">{items}</div>")
+        if path.startswith('/news/'):
+            slug = path.rsplit('/', 1)[-1]
+            return self.html(
+                f"<div class=\"article\" itemtype=\"https://schema.org/NewsArticle\">"
+                f"<div class=\"article-heading\"><h2 itemprop=\"headline\">{self.title('starproperty', slug)}</h2></div>"
+                f"<div class=\"article-sub\"><div class=\"article-time\">Posted on {self.published_at(slug):%d %b %Y}</div>"
+                f"<div class=\"article-author\">Mock Reporter</div></div>"
+                f"<div class=\"article-content\" id=\"news_content\">{self.body(slug)}</div></div>"
+            )
+        return None
+
+    def freemalaysiatoday(self, path: str, query: Dict[str, str]) -> Response:
+        def next_data(page_props) -> Tuple[int, str, str]:
+            data = escape(json.dumps({'props': {'pageProps': page_props}}, ensure_ascii=False), quote=False)
+            return self.html(f"<script id=\"__NEXT_DATA__\" type=\"application/json\">{data}</script>")
+
+        if path.rstrip('/') == '/category/category/leisure/property':
+            # 列表只有一頁，包含所有文章
+            return next_data({'posts': {'edges': [{'node': {
+                'title': self.title('freemalaysiatoday', slug),
+                'slug': slug,
+                'uri': f"/category/leisure/property/{slug}/",
+                'date': f"{self.published_at(slug):%Y-%m-%dT%H:%M:%S}",
+                'featuredImage': {'node': {'sourceUrl': f"https://media.freemalaysiatoday.com/{slug}.jpg"}},
+                'categories': {'edges': [{'node': {'name': 'Property'}}]},
+            }} for slug in self.all_slugs()]}})
+        if path.startswith('/category/leisure/property/'):
+            slug = path.rstrip('/').rsplit('/', 1)[-1]
+            return next_data({'post': {
+                'title': self.title('freemalaysiatoday', slug),
+                'date': f"{self.published_at(slug):%Y-%m-%dT%H:%M:%S}",
+                'content': self.body(slug),
+                'excerpt': f"<p>Summary {slug}</p>",
+            }})
+        return None
+
+    def hk852house(self, path: str, query: Dict[str, str]) -> Response:
+        if path == '/zh/newses':
+            page = self.page(query)
+            items = ''.join(
+                f"<div class=\"link-element list-group\"><div>"
+                f"<div><div><h5><a href=\"/zh/newses/{slug}\">{self.title('hk852house', slug)}</a></h5></div>"
+                f"<div><small>{self.published_at(slug):%Y-%m-%d}</small></div></div>"
+                f"<div><i>模擬記者</i></div><p><span>摘要 {slug}</span></p></div></div>"
+                for slug in self.slugs(page)
+            )
+            return self.html(f"<div class=\"tab-content pt-2 px-2\">{items}</div>")
+        if path.startswith('/zh/newses/'):
+            slug = path.rsplit('/', 1)[-1]
+            return self.html(
+                f"<main><div class=\"detail-content-wrapper\"><div class=\"container\">"
+                f"<div><div><h1>{self.title('hk852house', slug)}</h1></div>"
+                f"<div><small><span> {self.published_at(slug):%Y-%m-%d} </span><span>模擬記者</span></small></div></div>"
+                f"<div>{self.body(slug)}</div></div></div></main>"
+            )
+        return None
+
+    def respond(self, source: str, path: str, query: Dict[str, str]) -> Response:
+        route = self.routes.get(source)
+        return route(path, query) if route else None
+
+
+class MockSiteServer:
+    """以 HTTP 提供 MockSites 的頁面
+
+    Args:
+        sites: 頁面產生器
+        latency_ms: 每個回應的基本延遲
+        jitter_ms: 延遲的隨機變動上限
+        error_rate: 回應 503 的機率（0~1）
+        port: 監聽埠號，0 表示自動選擇
+    """
+
+    def __init__(
+        self,
+        sites: MockSites,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        host: str = '127.0.0.1',
+        port: int = 0
+    ):
+        self.sites = sites
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.address = (host, port)
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.not_modified: Counter = Counter()
+        self._lock = threading.Lock()
+        self._random = random.Random(sites.token)
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def origin(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def overrides(self) -> Dict[str, str]:
+        """CRAWLER_ORIGIN_OVERRIDES 設定值"""
+        return {origin: f"{self.origin}/{source}" for source, origin in MockSites.ORIGINS.items()}
+
+    def _delay_and_fail(self, source: str) -> bool:
+        """套用延遲，回傳是否應模擬錯誤"""
+        with self._lock:
+            self.requests[source] += 1
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors[source] += 1
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return failed
+
+    def count_not_modified(self, raw_path: str):
+        with self._lock:
+            self.not_modified[urlsplit(raw_path).path.lstrip('/').partition('/')[0]] += 1
+
+    def handle(self, raw_path: str) -> Tuple[int, str, str]:
+        parts = urlsplit(raw_path)
+        source, _, path = parts.path.lstrip('/').partition('/')
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        if self._delay_and_fail(source):
+            return 503, 'text/plain', 'mock error'
+        response = self.sites.respond(source, '/' + path, query)
+        return response or (404, 'text/plain', 'not found')
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, content_type, body = server.handle(self.path)
+                payload = body.encode('utf-8')
+                # 內容相同時回應 304，與真實網站一樣支援條件式請求
+                etag = f'"{hashlib.sha1(payload).hexdigest()[:16]}"'
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    server.count_not_modified(self.path)
+                    status, payload = 304, b''
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                if status in (200, 304):
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "MockSiteServer":
+        self._server = ThreadingHTTPServer(self.address, self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockSiteServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """模擬站的共用命令列參數"""
+    parser.add_argument('--pages', type=int, default=2, help='每個來源的列表頁數')
+    parser.add_argument('--per-page', type=int, default=10, help='每頁文章數')
+    parser.add_argument('--paragraphs', type=int, default=8, help='每篇文章段落數')
+    parser.add_argument('--latency-ms', type=float, default=0, help='每個回應的延遲（毫秒）')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='延遲的隨機變動（毫秒）')
+    parser.add_argument('--error-rate', type=float, default=0, help='回應 503 的機率（0~1）')
+    parser.add_argument('--date', type=date.fromisoformat, default=None, help='文章日期，預設為昨天')
+    parser.add_argument('--token', default=None, help='文章網址識別字串，預設依時間產生')
+
+
+def build_server(args, port: int = 0) -> MockSiteServer:
+    sites = MockSites(
+        pages=args.pages, per_page=args.per_page, token=args.token,
+        article_date=args.date, paragraphs=args.paragraphs
+    )
+    return MockSiteServer(
+        sites, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, port=port
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='啟動本機模擬新聞網站')
+    parser.add_argument('--port', type=int, default=8900, help='監聽埠號')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = build_server(args, port=args.port).start()
+    print(f"模擬站已啟動於 {server.origin}，文章日期 {server.sites.article_date}")
+    print(f"CRAWLER_ORIGIN_OVERRIDES='{json.dumps(server.overrides())}'")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
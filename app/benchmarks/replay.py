@@ -0,0 +1,485 @@
+"""
+爬蟲解析離線重播
+將爬蟲實際抓到的列表頁、文章頁與 JSON API 回應錄製成 fixture（每個來源一個檔案，
+格式參考 HAR），之後透過本機的重播伺服器重跑 crawl_list / crawl_article，
+不需連線到新聞網站即可量測解析效能並檢查解析結果。
+
+重播時所有 requests session（含 cloudscraper）與 AsyncFetcher 的請求都會改送到
+重播伺服器，原本的網址以 X-Replay-Origin 標頭傳遞；找不到的網址回應 404。
+只能以瀏覽器抓取的頁面（Selenium / undetected chromedriver）不在重播範圍內。
+
+使用方式：
+    # 錄製（需連線），預設存到 app/benchmarks/fixtures/<source>.json.gz
+    python -m app.benchmarks.replay record --source ltn --pages 2
+
+    # 重播並輸出每個來源的 articles/sec 與記憶體配置
+    python -m app.benchmarks.replay bench --iterations 5
+"""
+import argparse
+import asyncio
+import gzip
+import inspect
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.services.crawl_runner import SOURCES, get_crawler
+from app.services.crawler.async_fetcher import AsyncFetcher
+from app.services.crawler.base import BaseCrawler, HttpFetcher
+from app.services.crawler.http_cache import normalize_url
+from app.services.crawler.rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures'
+ORIGIN_HEADER = 'X-Replay-Origin'
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class FixtureStore:
+    """單一來源錄製的回應
+
+    檔案格式：
+        {"source": "ltn", "recorded_at": "...", "pages": 2,
+         "entries": [{"kind": "list|article|json",
+                      "request": {"method": "GET", "url": "..."},
+                      "response": {"status": 200, "content_type": "...", "body": "..."}}]}
+    """
+
+    def __init__(self, source: str, pages: int = 1, recorded_at: Optional[str] = None):
+        self.source = source
+        self.pages = pages
+        self.recorded_at = recorded_at
+        self.entries: List[Dict[str, Any]] = []
+        self._by_url: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, url: str, status: int, content_type: str, body: str, kind: str):
+        """加入回應，同一網址（忽略 VOLATILE_PARAMS）只保留第一次錄到的結果"""
+        key = normalize_url(url)
+        if key in self._by_url:
+            return
+        if 'json' in (content_type or ''):
+            kind = 'json'
+        entry = {
+            'kind': kind,
+            'request': {'method': 'GET', 'url': url},
+            'response': {'status': status, 'content_type': content_type, 'body': body},
+        }
+        self.entries.append(entry)
+        self._by_url[key] = entry
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        return self._by_url.get(normalize_url(url))
+
+    def count(self, kind: str) -> int:
+        return sum(1 for entry in self.entries if entry['kind'] == kind)
+
+    @staticmethod
+    def path_for(source: str, directory: Path = FIXTURE_DIR) -> Path:
+        return directory / f"{source}.json.gz"
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        path = Path(path or self.path_for(self.source))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({
+            'source': self.source,
+            'recorded_at': self.recorded_at,
+            'pages': self.pages,
+            'entries': self.entries,
+        }, ensure_ascii=False, indent=1)
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'wt', encoding='utf-8') as f:
+            f.write(data)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "FixtureStore":
+        path = Path(path)
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        store = cls(data['source'], pages=data.get('pages', 1), recorded_at=data.get('recorded_at'))
+        for entry in data['entries']:
+            response = entry['response']
+            store.add(
+                entry['request']['url'], response['status'], response.get('content_type', ''),
+                response['body'], entry.get('kind', 'article')
+            )
+        return store
+
+
+def fixture_paths(directory: Path = FIXTURE_DIR) -> Dict[str, Path]:
+    """目錄中所有來源的 fixture 檔"""
+    if not directory.is_dir():
+        return {}
+    paths = sorted(directory.glob('*.json.gz')) + sorted(directory.glob('*.json'))
+    return {path.name.split('.')[0]: path for path in paths}
+
+
+class ReplayServer:
+    """在本機回應錄製內容的 HTTP 伺服器
+
+    使用方式：
+        with ReplayServer(store) as server:
+            ...  # server.origin 為 http://127.0.0.1:<port>
+    """
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+        self.hits = 0
+        self.misses: List[str] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def origin(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = f"{self.headers.get(ORIGIN_HEADER, '')}{self.path}"
+                entry = replay.store.lookup(url)
+                if entry is None:
+                    replay.misses.append(url)
+                    status, content_type, body = 404, 'text/plain', 'not recorded'
+                else:
+                    replay.hits += 1
+                    response = entry['response']
+                    status, content_type, body = response['status'], response['content_type'], response['body']
+
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type or 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "ReplayServer":
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """將 requests 的請求改送到重播伺服器"""
+
+    def __init__(self, server_origin: str):
+        super().__init__()
+        self.server_netloc = urlsplit(server_origin).netloc
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.headers[ORIGIN_HEADER] = _origin(request.url)
+        request.url = urlunsplit(('http', self.server_netloc, parts.path, parts.query, ''))
+        return super().send(request, **kwargs)
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """將 AsyncFetcher 的請求改送到重播伺服器"""
+
+    def __init__(self, server_origin: str):
+        parts = urlsplit(server_origin)
+        self.host, self.port = parts.hostname, parts.port
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # 每個 AsyncClient 關閉時會一併關閉 transport，下次使用時重新建立
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport()
+        request.headers[ORIGIN_HEADER] = _origin(str(request.url))
+        request.url = request.url.copy_with(scheme='http', host=self.host, port=self.port)
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+
+class Recorder:
+    """錄製爬蟲收到的回應"""
+
+    def __init__(self, source: str, pages: int):
+        self.store = FixtureStore(source, pages=pages, recorded_at=datetime.now().isoformat(timespec='seconds'))
+        self.kind = 'list'  # 目前階段錄到的頁面種類
+
+    def record(self, url: str, status: int, content_type: str, body: str):
+        if status == 200:
+            self.store.add(url, status, content_type, body, self.kind)
+
+
+class RecordingAdapter(HTTPAdapter):
+    def __init__(self, recorder: Recorder):
+        super().__init__()
+        self.recorder = recorder
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.recorder.record(request.url, response.status_code, response.headers.get('Content-Type', ''), response.text)
+        return response
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, recorder: Recorder):
+        self.recorder = recorder
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport()
+        response = await self._transport.handle_async_request(request)
+        response.request = request
+        body = await response.aread()  # 已解壓縮
+        headers = httpx.Headers(response.headers)
+        for name in ('Content-Encoding', 'Content-Length', 'Transfer-Encoding'):
+            headers.pop(name, None)
+        recorded = httpx.Response(response.status_code, headers=headers, content=body, request=request)
+        self.recorder.record(str(request.url), response.status_code, headers.get('Content-Type', ''), recorded.text)
+        return recorded
+
+    async def aclose(self):
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+
+@contextmanager
+def route_requests(adapter: HTTPAdapter, transport: httpx.AsyncBaseTransport) -> Iterator[None]:
+    """讓所有 requests session 與 AsyncFetcher 改用指定的 adapter / transport，並停用速率限制"""
+    original_get_adapter = requests.Session.get_adapter
+    original_transport = AsyncFetcher.transport
+    rate_limit_enabled = rate_limiter.enabled
+
+    requests.Session.get_adapter = lambda session, url: adapter
+    AsyncFetcher.transport = transport
+    rate_limiter.enabled = False
+    try:
+        yield
+    finally:
+        requests.Session.get_adapter = original_get_adapter
+        AsyncFetcher.transport = original_transport
+        rate_limiter.enabled = rate_limit_enabled
+
+
+def _prepare(crawler):
+    """重播與錄製都只走 HTTP，不租用瀏覽器"""
+    if isinstance(crawler, BaseCrawler):
+        crawler.fetchers = [HttpFetcher()]
+    crawler.known_urls = None
+
+
+async def crawl_pages(crawler, pages: int, recorder: Optional[Recorder] = None) -> Tuple[int, List[Any]]:
+    """依序爬取列表頁與其中的文章
+
+    Returns:
+        (列表中的文章數, 解析出的文章)
+    """
+    def stage(kind: str):
+        if recorder:
+            recorder.kind = kind
+
+    if not hasattr(crawler, 'crawl_list'):
+        # NextApple：列表 API 與文章內容在同一個流程取得
+        articles = []
+        for page in range(1, pages + 1):
+            stage('list')
+            articles.extend(await crawler.get_news_list(page))
+        return len(articles), articles
+
+    infos: List[Dict[str, Any]] = []
+    for page in range(1, pages + 1):
+        stage('list')
+        infos.extend(info for info in await crawler.crawl_list(page) or [] if info and info.get('url'))
+
+    stage('article')
+    if crawler.supports_async_fetch:
+        # 與正式爬取相同，以 AsyncFetcher 並行抓取後解析
+        return len(infos), [article for article in await crawler.crawl_articles(infos) if article]
+
+    # crawl_article 的參數有些是網址、有些是列表中的文章資訊
+    takes_url = next(iter(inspect.signature(crawler.crawl_article).parameters)) == 'url'
+    articles = []
+    for info in infos:
+        article = await crawler.crawl_article(info['url'] if takes_url else info)
+        if article:
+            articles.append(article)
+    return len(infos), articles
+
+
+def record(source: str, pages: int, path: Optional[Path] = None) -> Path:
+    """連線到實際網站，錄製一次爬取收到的回應"""
+    crawler = get_crawler(source)
+    if crawler is None:
+        raise ValueError(f"未知的爬蟲類型: {source}")
+    _prepare(crawler)
+
+    recorder = Recorder(source, pages)
+    with route_requests(RecordingAdapter(recorder), RecordingTransport(recorder)):
+        try:
+            listed, articles = asyncio.run(crawl_pages(crawler, pages, recorder))
+        finally:
+            if hasattr(crawler, 'cleanup'):
+                crawler.cleanup()
+
+    saved = recorder.store.save(path)
+    logger.warning(
+        f"{source}: 錄製 {len(recorder.store.entries)} 個回應"
+        f"（列表 {recorder.store.count('list')}、文章 {recorder.store.count('article')}、"
+        f"JSON {recorder.store.count('json')}），解析出 {len(articles)}/{listed} 篇文章 -> {saved}"
+    )
+    return saved
+
+
+def _field(article: Any, name: str) -> Any:
+    return article.get(name) if isinstance(article, dict) else getattr(article, name, None)
+
+
+def replay(store: FixtureStore, iterations: int = 1, measure_memory: bool = True) -> Dict[str, Any]:
+    """以重播伺服器重跑爬蟲並量測
+
+    Returns:
+        listed: 列表中的文章數
+        articles: 每次解析出的文章數
+        complete: 標題與內文皆有值的文章數
+        seconds: 每次平均耗時
+        articles_per_sec: 每秒解析文章數
+        peak_kib / kib_per_article / blocks_per_article: 一次執行的記憶體配置（tracemalloc）
+        misses: 未錄製而回應 404 的網址
+        sample: 第一篇文章（檢查用）
+    """
+    with ReplayServer(store) as server, \
+            route_requests(ReplayAdapter(server.origin), ReplayTransport(server.origin)):
+
+        def run_once():
+            crawler = get_crawler(store.source)
+            _prepare(crawler)
+            try:
+                return asyncio.run(crawl_pages(crawler, store.pages))
+            finally:
+                if hasattr(crawler, 'cleanup'):
+                    crawler.cleanup()
+
+        # 第一次執行不計時，暖機並取得解析結果
+        listed, articles = run_once()
+
+        elapsed = 0.0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            run_once()
+            elapsed += time.perf_counter() - start
+
+        memory: Dict[str, float] = {}
+        if measure_memory:
+            tracemalloc.start()
+            try:
+                before = tracemalloc.take_snapshot()
+                run_once()
+                after = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            diff = [stat for stat in after.compare_to(before, 'filename') if stat.size_diff > 0]
+            count = max(len(articles), 1)
+            memory = {
+                'peak_kib': peak / 1024,
+                'kib_per_article': sum(stat.size_diff for stat in diff) / 1024 / count,
+                'blocks_per_article': sum(stat.count_diff for stat in diff) / count,
+            }
+
+        seconds = elapsed / iterations if iterations else 0.0
+        return {
+            'listed': listed,
+            'articles': len(articles),
+            'complete': sum(1 for a in articles if _field(a, 'title') and _field(a, 'content')),
+            'seconds': seconds,
+            'articles_per_sec': len(articles) / seconds if seconds else 0.0,
+            **memory,
+            'misses': sorted(set(server.misses)),
+            'sample': articles[0] if articles else None,
+        }
+
+
+def bench(sources: List[str], iterations: int, directory: Path = FIXTURE_DIR):
+    paths = fixture_paths(directory)
+    print(f"{'source':<20}{'listed':>8}{'parsed':>8}{'complete':>10}{'art/s':>10}"
+          f"{'ms/art':>9}{'peak KiB':>10}{'KiB/art':>9}{'blk/art':>9}")
+    for source in sources:
+        if source not in paths:
+            print(f"{source:<20}{'no fixture':>8}")
+            continue
+        result = replay(FixtureStore.load(paths[source]), iterations)
+        ms = result['seconds'] * 1000 / max(result['articles'], 1)
+        print(
+            f"{source:<20}{result['listed']:>8}{result['articles']:>8}{result['complete']:>10}"
+            f"{result['articles_per_sec']:>10.1f}{ms:>9.2f}{result['peak_kib']:>10.0f}"
+            f"{result['kib_per_article']:>9.1f}{result['blocks_per_article']:>9.0f}"
+        )
+        for url in result['misses']:
+            print(f"    not recorded: {url}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='錄製與重播爬蟲回應，量測解析效能')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='連線到網站錄製 fixture')
+    record_parser.add_argument('--source', action='append', choices=SOURCES, help='來源，可重複指定，預設全部')
+    record_parser.add_argument('--pages', type=int, default=1, help='錄製的列表頁數')
+    record_parser.add_argument('--dir', type=Path, default=FIXTURE_DIR, help='fixture 目錄')
+
+    bench_parser = subparsers.add_parser('bench', help='重播 fixture 並量測')
+    bench_parser.add_argument('--source', action='append', help='來源，可重複指定，預設為所有 fixture')
+    bench_parser.add_argument('--iterations', type=int, default=5, help='計時的重複次數')
+    bench_parser.add_argument('--dir', type=Path, default=FIXTURE_DIR, help='fixture 目錄')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.command == 'record':
+        for source in args.source or SOURCES:
+            try:
+                record(source, args.pages, FixtureStore.path_for(source, args.dir))
+            except Exception as e:
+                logger.error(f"{source} 錄製失敗: {str(e)}")
+    else:
+        bench(args.source or list(fixture_paths(args.dir)), args.iterations, args.dir)
@@ -0,0 +1,58 @@
+"""
+記憶體快取
+用於計算成本高但允許短暫過時的結果，例如文章總數。
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """具有存活時間的簡易快取（執行緒安全）"""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # 先清除過期項目，仍然太多時清除最舊的一半
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+                if len(self._entries) >= self.max_entries:
+                    oldest = sorted(self._entries, key=lambda k: self._entries[k][0])
+                    for k in oldest[:max(1, len(oldest) // 2)]:
+                        del self._entries[k]
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """取得快取值，不存在或已過期時呼叫 factory 計算"""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# 文章總數快取，key 為資料版本（app.services.facets）與查詢條件
+count_cache = TTLCache(ttl=settings.COUNT_CACHE_TTL)
@@ -1,7 +1,15 @@
 import os
 from typing import Optional, Dict, Any, List
 from pydantic_settings import BaseSettings
-from pydantic import validator
+import warnings
+
+from pydantic import root_validator, validator
+
+# 已移除的設定，仍出現在舊的 .env 時忽略並提示改用的設定
+DEPRECATED_SETTINGS = {
+    'CRAWLER_DELAY_MIN': 'CRAWLER_RATE_LIMIT_RPS',
+    'CRAWLER_DELAY_MAX': 'CRAWLER_RATE_LIMIT_RPS',
+}
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "News API"
@@ -29,6 +37,12 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "newsdb"
     DB_PORT: int = 5432  # 外部 port，僅用於 docker-compose
     DATABASE_URL: Optional[str] = None
+    DB_COPY_THRESHOLD: int = 500  # 單次寫入達此筆數時改用 COPY 匯入
+    COUNT_CACHE_TTL: int = 60  # 文章總數快取秒數
+    FACET_CACHE_TTL: int = 300  # 來源、分類等篩選面向快取秒數
+    FACET_MAX_CATEGORIES: int = 50
+    EXPORT_CHUNK_SIZE: int = 500  # 匯出時每批讀取與輸出的筆數
+    EXPORT_ROW_GROUP_SIZE: int = 10000  # Parquet / Arrow 每個 row group（batch）的筆數
 
     # Chrome 設定
     CHROME_BIN: str = "/usr/bin/chromium"
@@ -37,15 +51,73 @@ class Settings(BaseSettings):
     # 爬蟲設定
     CRAWLER_MAX_RETRIES: int = 3
     CRAWLER_TIMEOUT: int = 30
-    CRAWLER_DELAY_MIN: int = 1
-    CRAWLER_DELAY_MAX: int = 3
     CRAWLER_PAGE_LOAD_TIMEOUT: int = 40
     CRAWLER_SCRIPT_TIMEOUT: int = 40
     CRAWLER_WAIT_TIMEOUT: int = 15
 
+    # HTTP 抓取設定
+    CRAWLER_HTTP_FIRST: bool = True  # 先以 HTTP 抓取，必要時才使用瀏覽器
+    CRAWLER_HTTP_MISS_LIMIT: int = 3  # HTTP 連續幾次缺少內容後改用瀏覽器
+    CRAWLER_HTTP_POOL_CONNECTIONS: int = 20
+    CRAWLER_HTTP_POOL_MAXSIZE: int = 20
+    CRAWLER_HTTP2: bool = True  # 非同步抓取使用 HTTP/2（需安裝 h2）
+    CRAWLER_MAX_CONCURRENCY_PER_DOMAIN: int = 4  # 每個網域同時抓取的文章數
+
+    # 增量爬取設定
+    CRAWLER_SKIP_KNOWN_URLS: bool = True  # 跳過資料庫中已存在的文章
+    CRAWLER_STOP_ON_KNOWN_PAGE: bool = True  # 整頁文章皆已收錄時停止翻頁
+
+    # HTTP 回應快取（ETag / Last-Modified 條件式請求，跨行程共用）
+    CRAWLER_HTTP_CACHE_ENABLED: bool = True
+    CRAWLER_HTTP_CACHE_DIR: str = "/tmp/reas-http-cache"
+    CRAWLER_HTTP_CACHE_MAX_MB: int = 256  # 超過時淘汰最久未使用的項目
+
+    # 將網站 origin 改送到其他位址，例如 {"https://house.udn.com": "http://127.0.0.1:8900/udn"}
+    # （本機模擬站、測試環境；只影響實際請求，文章網址不變）
+    CRAWLER_ORIGIN_OVERRIDES: Dict[str, str] = {}
+
+    # 速率限制設定（每個網域一個 token bucket，跨行程共用）
+    CRAWLER_RATE_LIMIT_ENABLED: bool = True
+    CRAWLER_RATE_LIMIT_RPS: float = 1.0  # 每個網域每秒請求數
+    CRAWLER_RATE_LIMIT_BURST: float = 3  # 閒置後可連續發出的請求數
+    CRAWLER_RATE_LIMIT_HOSTS: Dict[str, Dict[str, float]] = {
+        "www.edgeprop.my": {"rps": 0.5, "burst": 1}
+    }
+    CRAWLER_RATE_LIMIT_DIR: str = "/tmp/reas-rate-limit"
+
+    # Cloudflare clearance（cookie + User-Agent）保存位置與有效秒數，跨行程共用
+    CRAWLER_CLEARANCE_DIR: str = "/tmp/reas-clearance"
+    CRAWLER_CLEARANCE_TTL: int = 1800
+
+    # 爬取任務佇列設定（python -m app.worker）
+    CRAWL_WORKER_CONCURRENCY: int = 2  # 每個 worker 容器的行程數
+    CRAWL_WORKER_POLL_INTERVAL: float = 5  # 佇列為空時的輪詢間隔（秒）
+    CRAWL_QUEUE_MAX_PER_SOURCE: int = 1  # 每個來源同時執行的任務數
+    CRAWL_QUEUE_SOURCE_LIMITS: Dict[str, int] = {}  # 個別來源的上限，覆寫 CRAWL_QUEUE_MAX_PER_SOURCE
+    CRAWL_JOB_HEARTBEAT_INTERVAL: int = 30  # 執行中任務更新 heartbeat 的間隔（秒）
+    CRAWL_JOB_STALE_SECONDS: int = 600  # heartbeat 逾時多久視為 worker 中斷
+    CRAWL_JOB_MAX_ATTEMPTS: int = 3  # worker 中斷後最多重新執行的次數
+
+    # 指標設定（/metrics，多行程時另需設定 PROMETHEUS_MULTIPROC_DIR 環境變數）
+    METRICS_ENABLED: bool = True
+    CRAWL_WORKER_METRICS_PORT: int = 9101  # worker 匯出指標的埠號，0 表示不啟動
+
+    # Driver 池設定
+    CRAWLER_DRIVER_POOL_SIZE: int = 2  # 同時存在的瀏覽器上限
+    CRAWLER_DRIVER_MAX_PAGE_LOADS: int = 200  # 載入多少頁後回收瀏覽器
+    CRAWLER_DRIVER_ACQUIRE_TIMEOUT: int = 600  # 等待可用 driver 的秒數
+
     # 日誌設定
     LOG_LEVEL: str = "INFO"
 
+    @root_validator(pre=True)
+    def drop_deprecated_settings(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        for name, replacement in DEPRECATED_SETTINGS.items():
+            if name in values:
+                values.pop(name)
+                warnings.warn(f"{name} 已不再使用，請改用 {replacement} 設定爬取速率", DeprecationWarning)
+        return values
+
     @validator("DATABASE_URL", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> str:
         if isinstance(v, str):
@@ -2,15 +2,68 @@
 資料庫工具函數
 提供批次操作和優化的資料庫操作方法
 """
-from typing import List, Dict, Any
+import io
+from datetime import datetime
+from typing import List, Dict, Any, Tuple
+from sqlalchemy import literal_column
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 from app.models.article import Article
+from app.core.metrics import DB_UPSERT_SECONDS, observe
+from app.core.search import with_search_vector
+from app.core.timing import timed
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _group_by_columns(rows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    依欄位組合分組，同一組的資料可組成同一個多筆 VALUES 語句
+
+    缺少的欄位不能補 None：明確的 NULL 會取代 server_default（created_at、updated_at），
+    衝突時 updated_at 也會被更新為 NULL。
+    """
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return list(groups.values())
+
+
+def _upsert_statement(rows: List[Dict[str, Any]]):
+    """
+    建立多筆 VALUES 的 upsert 語句，各筆資料的欄位須一致（參見 _group_by_columns）
+
+    RETURNING (xmax = 0) 可精確區分插入（新列的 xmax 為 0）與更新。
+    """
+    values = [with_search_vector(row) for row in rows]
+
+    stmt = insert(Article).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['url'],  # 使用 url 作為唯一鍵
+        set_={
+            'title': stmt.excluded.title,
+            'content': stmt.excluded.content,
+            'description': stmt.excluded.description,
+            'published_at': stmt.excluded.published_at,
+            'image_url': stmt.excluded.image_url,
+            'category': stmt.excluded.category,
+            'reporter': stmt.excluded.reporter,
+            'updated_at': stmt.excluded.updated_at,
+            'search_vector': stmt.excluded.search_vector,
+        }
+    )
+    return stmt.returning(literal_column('xmax = 0').label('inserted'))
+
+
+def _count_upserted(result) -> Tuple[int, int]:
+    """從 RETURNING 結果統計 (新增數量, 更新數量)"""
+    flags = result.scalars().all()
+    inserted = sum(1 for flag in flags if flag)
+    return inserted, len(flags) - inserted
+
+
+@timed('db_upsert')
 def batch_upsert_articles(
     session: Session,
     articles: List[Dict[str, Any]],
@@ -19,6 +72,9 @@ def batch_upsert_articles(
     """
     批次插入或更新文章
 
+    每批次依欄位組合各以一個 INSERT ... ON CONFLICT DO UPDATE 完成（通常只有一組），
+    批次失敗時才逐筆重試，找出有問題的文章。
+
     Args:
         session: 資料庫 session
         articles: 文章資料列表
@@ -30,52 +86,134 @@ def batch_upsert_articles(
     inserted_count = 0
     updated_count = 0
 
+    # 同一語句不能更新同一列兩次，相同 url 只保留最後一筆
+    articles = list({article.get('url'): article for article in articles}.values())
+
     for i in range(0, len(articles), batch_size):
         batch = articles[i:i + batch_size]
 
-        for article_data in batch:
-            try:
-                # 使用 PostgreSQL 的 ON CONFLICT 語法進行 upsert
-                stmt = insert(Article).values(**article_data)
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['url'],  # 使用 url 作為唯一鍵
-                    set_={
-                        'title': stmt.excluded.title,
-                        'content': stmt.excluded.content,
-                        'description': stmt.excluded.description,
-                        'published_at': stmt.excluded.published_at,
-                        'image_url': stmt.excluded.image_url,
-                        'category': stmt.excluded.category,
-                        'reporter': stmt.excluded.reporter,
-                        'updated_at': stmt.excluded.updated_at,
-                    }
-                )
+        try:
+            with observe(DB_UPSERT_SECONDS, method='batch'):
+                inserted = updated = 0
+                for group in _group_by_columns(batch):
+                    group_inserted, group_updated = _count_upserted(session.execute(_upsert_statement(group)))
+                    inserted += group_inserted
+                    updated += group_updated
+                session.commit()
+            inserted_count += inserted
+            updated_count += updated
+        except Exception as e:
+            logger.error(f"Error in batch upsert, retrying one by one: {str(e)}")
+            session.rollback()
+            for article_data in batch:
+                try:
+                    inserted, updated = _count_upserted(session.execute(_upsert_statement([article_data])))
+                    session.commit()
+                    inserted_count += inserted
+                    updated_count += updated
+                except Exception as e:
+                    logger.error(f"Error upserting article {article_data.get('url', 'unknown')}: {str(e)}")
+                    session.rollback()
+                    continue
 
-                result = session.execute(stmt)
-
-                # 判斷是插入還是更新
-                # 注意：這個方法可能不夠準確，但足夠用於日誌記錄
-                if result.rowcount > 0:
-                    # 檢查是否為更新（通過查詢檢查記錄是否已存在）
-                    existing = session.query(Article).filter(
-                        Article.url == article_data['url']
-                    ).first()
-                    if existing and existing.created_at != existing.updated_at:
-                        updated_count += 1
-                    else:
-                        inserted_count += 1
-
-            except Exception as e:
-                logger.error(f"Error upserting article {article_data.get('url', 'unknown')}: {str(e)}")
-                continue
-
-        # 每批次提交一次
-        session.commit()
         logger.info(f"Batch {i//batch_size + 1}: Processed {len(batch)} articles")
 
     return inserted_count, updated_count
 
 
+# COPY 寫入暫存表的欄位（其餘欄位使用資料表預設值）
+COPY_COLUMNS = [
+    'url', 'source', 'category', 'reporter', 'title',
+    'description', 'image_url', 'content', 'published_at', 'search_vector',
+]
+
+
+def _copy_value(value: Any) -> str:
+    """轉換為 COPY text 格式的欄位值"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def _copy_buffer(articles: List[Dict[str, Any]]) -> io.StringIO:
+    """將文章轉為 COPY FROM STDIN 的輸入"""
+    buffer = io.StringIO()
+    for article in articles:
+        article = with_search_vector(article)
+        buffer.write('\t'.join(_copy_value(article.get(column)) for column in COPY_COLUMNS))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+
+@timed('db_upsert')
+def copy_upsert_articles(
+    session: Session,
+    articles: List[Dict[str, Any]]
+) -> Tuple[int, int]:
+    """
+    以 COPY 批次匯入文章（適用於大量回補）
+
+    先以 COPY FROM STDIN 寫入暫存表，再以單一 INSERT ... SELECT 合併到 articles，
+    整批只需數次往返。任何錯誤都會讓整批回滾。
+
+    Args:
+        session: 資料庫 session
+        articles: 文章資料列表
+
+    Returns:
+        tuple: (新增數量, 更新數量)
+    """
+    if not articles:
+        return 0, 0
+
+    # 同一語句不能更新同一列兩次，相同 url 只保留最後一筆
+    articles = list({article.get('url'): article for article in articles}.values())
+    column_list = ', '.join(COPY_COLUMNS)
+    update_list = ', '.join(
+        f"{column} = EXCLUDED.{column}" for column in COPY_COLUMNS if column not in ('url', 'source')
+    )
+
+    try:
+        with observe(DB_UPSERT_SECONDS, method='copy'):
+            cursor = session.connection().connection.cursor()
+            try:
+                cursor.execute(
+                    "CREATE TEMP TABLE articles_staging "
+                    f"ON COMMIT DROP AS SELECT {column_list} FROM articles WITH NO DATA"
+                )
+                cursor.copy_expert(
+                    f"COPY articles_staging ({column_list}) FROM STDIN",
+                    _copy_buffer(articles)
+                )
+                cursor.execute(
+                    f"INSERT INTO articles ({column_list}) "
+                    f"SELECT {column_list} FROM articles_staging "
+                    f"ON CONFLICT (url) DO UPDATE SET {update_list}, updated_at = now() "
+                    "RETURNING (xmax = 0)"
+                )
+                flags = [row[0] for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+            session.commit()
+    except Exception as e:
+        logger.error(f"Error in COPY upsert: {str(e)}")
+        session.rollback()
+        raise
+
+    inserted_count = sum(1 for flag in flags if flag)
+    logger.info(f"COPY upsert: Processed {len(articles)} articles")
+    return inserted_count, len(flags) - inserted_count
+
+
 def bulk_insert_articles(
     session: Session,
     articles: List[Dict[str, Any]],
@@ -100,7 +238,7 @@ def bulk_insert_articles(
 
         try:
             # 使用 bulk_insert_mappings 進行批次插入
-            session.bulk_insert_mappings(Article, batch)
+            session.bulk_insert_mappings(Article, [with_search_vector(article) for article in batch])
             session.commit()
             inserted_count += len(batch)
             logger.info(f"Batch {i//batch_size + 1}: Inserted {len(batch)} articles")
@@ -28,6 +28,10 @@ class StructuredFormatter(logging.Formatter):
             log_data['url'] = record.url
         if hasattr(record, 'duration'):
             log_data['duration'] = record.duration
+        if hasattr(record, 'stage'):
+            log_data['stage'] = record.stage
+        if hasattr(record, 'calls'):
+            log_data['calls'] = record.calls
 
         # 添加異常信息
         if record.exc_info:
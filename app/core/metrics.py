@@ -0,0 +1,153 @@
+"""
+Prometheus 指標
+記錄爬蟲抓取、解析、資料庫寫入與 API 請求的耗時，由 /metrics 匯出。
+
+web 與 worker 都是多行程執行時，需設定 PROMETHEUS_MULTIPROC_DIR 環境變數
+（必須在匯入 prometheus_client 前設定），各行程的指標會寫入該目錄，
+匯出時再彙總。worker 的指標由主行程在 CRAWL_WORKER_METRICS_PORT 提供。
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Histogram,
+        generate_latest,
+        start_http_server,
+    )
+    from prometheus_client import multiprocess
+    HAS_PROMETHEUS = True
+except ImportError:
+    HAS_PROMETHEUS = False
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 頁面抓取多在數百毫秒到數十秒之間（瀏覽器含等待元素）
+FETCH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60)
+PARSE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+DB_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+API_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class _NoopMetric:
+    """未安裝 prometheus_client 或停用指標時的替代品"""
+
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def observe(self, amount: float):
+        pass
+
+    def inc(self, amount: float = 1):
+        pass
+
+
+def _histogram(name: str, documentation: str, labelnames, buckets):
+    if not (HAS_PROMETHEUS and settings.METRICS_ENABLED):
+        return _NoopMetric()
+    return Histogram(name, documentation, labelnames, buckets=buckets)
+
+
+def _counter(name: str, documentation: str, labelnames):
+    if not (HAS_PROMETHEUS and settings.METRICS_ENABLED):
+        return _NoopMetric()
+    return Counter(name, documentation, labelnames)
+
+
+# method: requests / async / cloudscraper / undetected / selenium
+FETCH_SECONDS = _histogram(
+    'reas_crawler_fetch_seconds', '頁面抓取耗時', ['source', 'method'], FETCH_BUCKETS
+)
+FETCH_RETRIES = _counter(
+    'reas_crawler_fetch_retries_total', '頁面抓取重試次數', ['source', 'method']
+)
+# result: hit（304，使用快取內容）/ miss
+HTTP_CACHE_REQUESTS = _counter(
+    'reas_crawler_http_cache_requests_total', 'HTTP 快取查詢次數', ['result']
+)
+PARSE_SECONDS = _histogram(
+    'reas_crawler_parse_seconds', 'HTML 解析耗時', ['source'], PARSE_BUCKETS
+)
+# method: batch / copy
+DB_UPSERT_SECONDS = _histogram(
+    'reas_db_upsert_batch_seconds', '文章 upsert 每批耗時', ['method'], DB_BUCKETS
+)
+API_REQUEST_SECONDS = _histogram(
+    'reas_api_request_seconds', 'API 請求耗時', ['method', 'route', 'status'], API_BUCKETS
+)
+
+
+@contextmanager
+def observe(metric, **labels):
+    """量測區塊耗時並記錄到 Histogram（例外時也會記錄）"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric.labels(**labels).observe(time.perf_counter() - start)
+
+
+def multiprocess_dir() -> Optional[str]:
+    return os.environ.get('PROMETHEUS_MULTIPROC_DIR') or None
+
+
+def _collect_registry():
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """匯出目前的指標
+
+    Returns:
+        (內容, Content-Type)
+    """
+    if not HAS_PROMETHEUS:
+        return b"# prometheus_client is not installed\n", "text/plain; charset=utf-8"
+    return generate_latest(_collect_registry()), CONTENT_TYPE_LATEST
+
+
+def reset_multiprocess_dir():
+    """清除上次執行留下的指標檔，應在啟動子行程前呼叫"""
+    path = multiprocess_dir()
+    if not path:
+        return
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith('.db'):
+            os.remove(os.path.join(path, name))
+
+
+def mark_process_dead(pid: int):
+    """子行程結束後移除其 gauge 資料（多行程模式）"""
+    if HAS_PROMETHEUS and multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
+
+
+def start_metrics_server(port: int) -> bool:
+    """以獨立 HTTP 伺服器匯出指標（worker 使用）
+
+    Returns:
+        是否已啟動
+    """
+    if not (HAS_PROMETHEUS and settings.METRICS_ENABLED and port):
+        return False
+    try:
+        start_http_server(port, registry=_collect_registry())
+        logger.info(f"指標伺服器已啟動於 :{port}/metrics")
+        return True
+    except Exception as e:
+        logger.error(f"無法啟動指標伺服器: {str(e)}")
+        return False
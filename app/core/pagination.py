@@ -0,0 +1,132 @@
+"""
+Keyset 分頁
+以 (published_at, id) 作為游標，取代 OFFSET 分頁，深層頁面與第一頁一樣快。
+"""
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from sqlalchemy import and_, or_
+
+from app.models.article import Article
+
+
+def encode_cursor(article: Article) -> str:
+    """以文章的 (published_at, id) 建立游標"""
+    raw = f"{article.published_at.isoformat()}|{article.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """解析游標
+
+    Raises:
+        ValueError: 游標格式錯誤
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        published_at, article_id = base64.urlsafe_b64decode(padded).decode().split('|')
+        return datetime.fromisoformat(published_at), int(article_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}") from None
+
+
+def keyset_condition(cursor: str, before: bool = False) -> Any:
+    """建立游標之後（或之前）的條件，排序為 published_at DESC, id DESC
+
+    額外的 published_at 範圍條件讓查詢可以使用 published_at 開頭的索引。
+
+    Args:
+        cursor: encode_cursor 產生的游標
+        before: True 時取游標之前（較新）的文章，用於上一頁
+    """
+    published_at, article_id = decode_cursor(cursor)
+    if before:
+        return and_(
+            Article.published_at >= published_at,
+            or_(
+                Article.published_at > published_at,
+                Article.id > article_id
+            )
+        )
+    return and_(
+        Article.published_at <= published_at,
+        or_(
+            Article.published_at < published_at,
+            Article.id < article_id
+        )
+    )
+
+
+def next_cursor(articles: list, limit: int) -> Optional[str]:
+    """取得下一頁的游標，本頁未滿時表示沒有下一頁"""
+    if len(articles) < limit or not articles:
+        return None
+    return encode_cursor(articles[-1])
+
+
+# 頁碼連結只列出目前頁前後各幾頁，由游標往前／後略過整頁取得（最多略過 PAGE_LINK_RADIUS - 1 頁）
+PAGE_LINK_RADIUS = 2
+
+
+def page_links(
+    current_page: int,
+    total_pages: int,
+    prev_cursor: Optional[str],
+    next_cursor: Optional[str],
+    keyset: bool = True,
+    radius: int = PAGE_LINK_RADIUS
+) -> Dict[str, Any]:
+    """產生分頁導覽的查詢字串
+
+    keyset 分頁時每個連結都帶有游標：上一頁／下一頁直接使用本頁的游標，
+    其餘頁碼以 skip 略過少量整頁；最後一頁以 last=1 從另一端取得，都不使用 OFFSET 與總數。
+    total_pages 只用於顯示頁碼與限制頁碼範圍。
+
+    Args:
+        current_page: 目前頁碼（僅用於顯示）
+        total_pages: 總頁數（取自快取，可能短暫過時）
+        prev_cursor: 上一頁的游標，沒有上一頁時為 None
+        next_cursor: 下一頁的游標，沒有下一頁時為 None
+        keyset: False 時（依相關度排序的搜尋結果）改用 page 參數
+        radius: 目前頁前後列出的頁數
+
+    Returns:
+        dict: first、prev、next、last 為查詢字串，沒有該方向時為 None；
+            pages 為 [(頁碼, 查詢字串)]，目前頁的查詢字串為 None
+    """
+    if not keyset:
+        has_prev, has_next = current_page > 1, current_page < total_pages
+
+        def link(page: int) -> str:
+            return urlencode({'page': page})
+
+        pages = [
+            (page, None if page == current_page else link(page))
+            for page in range(max(1, current_page - radius), min(total_pages, current_page + radius) + 1)
+        ]
+        return {
+            'first': link(1) if has_prev else None,
+            'prev': link(current_page - 1) if has_prev else None,
+            'next': link(current_page + 1) if has_next else None,
+            'last': link(total_pages) if has_next else None,
+            'pages': pages,
+        }
+
+    pages: List[Tuple[int, Optional[str]]] = []
+    if prev_cursor:
+        for page in range(max(1, current_page - radius), current_page):
+            pages.append((page, urlencode({'page': page, 'before': prev_cursor, 'skip': current_page - 1 - page})))
+    pages.append((current_page, None))
+    if next_cursor:
+        for page in range(current_page + 1, min(total_pages, current_page + radius) + 1):
+            pages.append((page, urlencode({'page': page, 'cursor': next_cursor, 'skip': page - current_page - 1})))
+
+    return {
+        'first': urlencode({'page': 1}) if prev_cursor else None,
+        'prev': urlencode({'page': max(1, current_page - 1), 'before': prev_cursor}) if prev_cursor else None,
+        'next': urlencode({'page': current_page + 1, 'cursor': next_cursor}) if next_cursor else None,
+        'last': urlencode({'page': max(total_pages, current_page + 1), 'last': 1}) if next_cursor else None,
+        'pages': pages,
+    }
@@ -0,0 +1,185 @@
+"""
+全文搜尋
+PostgreSQL 內建的斷詞器無法切分中文，因此在寫入時以 Python 斷詞：
+中日韓文字切成二元組（bigram），拉丁字母與數字（英文、馬來文）以單字為單位，
+再組成帶權重的 tsvector 存入 articles.search_vector（GIN 索引）。
+查詢時以相同方式斷詞並組成 tsquery，結果依 ts_rank 排序。
+"""
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, cast, event, func, literal, text
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+
+logger = logging.getLogger(__name__)
+
+CJK_CHARS = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'  # 中日韓統一表意文字
+LATIN_CHARS = '0-9A-Za-z\u00c0-\u024f'  # 含馬來文、歐語的重音字母
+TOKEN_PATTERN = re.compile(f'([{CJK_CHARS}]+)|([{LATIN_CHARS}]+)')
+CJK_CHAR = re.compile(f'^[{CJK_CHARS}]$')
+
+MAX_WORD_LENGTH = 64  # 過長的字串（網址、雜湊值）不列入索引
+MAX_POSITION = 16383  # tsvector 位置上限
+MAX_POSITIONS_PER_LEXEME = 255  # 單一詞彙最多記錄的位置數
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """斷詞
+
+    Args:
+        text: 原始文字
+
+    Returns:
+        詞彙列表，中日韓文字為二元組，其餘為小寫單字
+    """
+    tokens = []
+    for cjk, word in TOKEN_PATTERN.findall(text or ''):
+        if cjk:
+            if len(cjk) == 1:
+                tokens.append(cjk)
+            else:
+                tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+        elif len(word) <= MAX_WORD_LENGTH:
+            tokens.append(word.lower())
+    return tokens
+
+
+def _quote(lexeme: str) -> str:
+    """tsvector / tsquery 文字格式的詞彙跳脫"""
+    return "'" + lexeme.replace('\\', '\\\\').replace("'", "''") + "'"
+
+
+def build_search_vector(
+    title: Optional[str],
+    description: Optional[str] = None,
+    content: Optional[str] = None
+) -> str:
+    """建立 tsvector 文字格式
+
+    標題權重為 A、描述為 B、內文為 C。
+
+    Returns:
+        可直接寫入 tsvector 欄位的字串
+    """
+    positions: Dict[str, List[str]] = {}
+    position = 0
+    for value, weight in ((title, 'A'), (description, 'B'), (content, 'C')):
+        for token in tokenize(value):
+            if position >= MAX_POSITION:
+                break
+            position += 1
+            entries = positions.setdefault(token, [])
+            if len(entries) < MAX_POSITIONS_PER_LEXEME:
+                entries.append(f"{position}{weight}")
+
+    return ' '.join(f"{_quote(lexeme)}:{','.join(entries)}" for lexeme, entries in positions.items())
+
+
+def with_search_vector(article: Dict[str, Any]) -> Dict[str, Any]:
+    """為文章資料加上 search_vector 欄位"""
+    return dict(
+        article,
+        search_vector=build_search_vector(
+            article.get('title'), article.get('description'), article.get('content')
+        )
+    )
+
+
+def build_search_query(keyword: str, title_only: bool = False) -> Optional[str]:
+    """將關鍵字轉為 tsquery 文字格式
+
+    所有詞彙皆須出現（AND）。單一中文字不列入：前綴比對只能命中以該字開頭的二元組，
+    會漏掉該字在第二個字的文章（例如以「房」搜尋「買房」），由 search_filter 改用 ILIKE 比對。
+
+    Args:
+        keyword: 使用者輸入的關鍵字
+        title_only: 只比對標題（權重 A）
+
+    Returns:
+        tsquery 字串，關鍵字無可用詞彙時回傳 None
+    """
+    weight = 'A' if title_only else ''
+    terms = []
+    for token in dict.fromkeys(tokenize(keyword)):
+        if CJK_CHAR.match(token):
+            continue
+        suffix = f":{weight}" if weight else ''
+        terms.append(f"{_quote(token)}{suffix}")
+    return ' & '.join(terms) or None
+
+
+def _ilike(term: str, title_only: bool) -> Any:
+    condition = Article.title.ilike(f"%{term}%")
+    if not title_only:
+        condition = condition | Article.content.ilike(f"%{term}%")
+    return condition
+
+
+def search_filter(keyword: str, title_only: bool = False) -> Tuple[Any, Any]:
+    """建立全文搜尋條件
+
+    Args:
+        keyword: 使用者輸入的關鍵字
+        title_only: 只比對標題
+
+    Returns:
+        (where 條件, 排序用的 rank 運算式)；關鍵字只有單一中文字或無可用詞彙時退回 ILIKE，rank 為 None
+    """
+    query = build_search_query(keyword, title_only=title_only)
+    # 單一中文字以 ILIKE 比對（參見 build_search_query）
+    chars = [token for token in dict.fromkeys(tokenize(keyword)) if CJK_CHAR.match(token)]
+    if query is None:
+        return and_(*(_ilike(term, title_only) for term in chars or [keyword])), None
+
+    tsquery = cast(literal(query), TSQUERY)
+    condition = and_(Article.search_vector.op('@@')(tsquery), *(_ilike(char, title_only) for char in chars))
+    return condition, func.ts_rank(Article.search_vector, tsquery)
+
+
+def ensure_search_schema(engine: Engine):
+    """為既有資料庫補上 search_vector 欄位與 GIN 索引"""
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_articles_search ON articles USING gin (search_vector)"
+        ))
+
+
+def backfill_search_vectors(session: Session, batch_size: int = 500) -> int:
+    """為尚未建立索引的文章補上 search_vector
+
+    Returns:
+        int: 更新的文章數量
+    """
+    updated = 0
+    while True:
+        rows = (
+            session.query(Article.id, Article.title, Article.description, Article.content)
+            .filter(Article.search_vector.is_(None))
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        session.bulk_update_mappings(Article, [
+            {'id': row.id, 'search_vector': build_search_vector(row.title, row.description, row.content)}
+            for row in rows
+        ])
+        session.commit()
+        updated += len(rows)
+        logger.info(f"Search index backfill: {updated} articles updated")
+
+    return updated
+
+
+@event.listens_for(Article, 'before_insert')
+@event.listens_for(Article, 'before_update')
+def _update_search_vector(mapper, connection, target):
+    """透過 ORM 寫入的文章自動更新 search_vector"""
+    target.search_vector = build_search_vector(target.title, target.description, target.content)
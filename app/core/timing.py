@@ -0,0 +1,170 @@
+"""
+階段計時
+以 span（context manager）或 timed（decorator）量測爬取流程各階段的耗時，
+每個 span 以 DEBUG 輸出結構化欄位（stage / duration / url / crawler_type），
+並累計到目前執行中的 TimingSummary，於爬取結束時輸出各階段彙總。
+
+使用方式：
+    with timing_run('ltn') as timings:
+        with span('crawl_list', url=url):
+            ...
+    # timing_run 結束時輸出彙總，也可讀取 timings.stages
+
+span 可以巢狀，彙總的各階段耗時會重疊（例如 wait_and_get 包含 rate_limit）。
+"""
+import asyncio
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StageStats:
+    """單一階段的累計資料"""
+    __slots__ = ('calls', 'total', 'max')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float):
+        self.calls += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+
+class TimingSummary:
+    """一次爬取的各階段耗時（執行緒安全，to_thread 與 asyncio 任務可共用）"""
+
+    def __init__(self, crawler_type: str = ""):
+        self.crawler_type = crawler_type
+        self.stages: Dict[str, StageStats] = {}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, duration: float):
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.add(duration)
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                stage: {'calls': stats.calls, 'total': round(stats.total, 4), 'max': round(stats.max, 4)}
+                for stage, stats in self.stages.items()
+            }
+
+    def log(self):
+        """依總耗時由高到低輸出各階段彙總"""
+        elapsed = time.perf_counter() - self.started
+        summary = sorted(self.as_dict().items(), key=lambda item: item[1]['total'], reverse=True)
+        for stage, stats in summary:
+            logger.info(
+                f"{self.crawler_type} 階段 {stage}: {stats['calls']} 次，共 {stats['total']:.2f} 秒，"
+                f"最長 {stats['max']:.2f} 秒",
+                extra={
+                    'crawler_type': self.crawler_type,
+                    'stage': stage,
+                    'duration': stats['total'],
+                    'calls': stats['calls'],
+                }
+            )
+        logger.info(
+            f"{self.crawler_type} 總耗時 {elapsed:.2f} 秒",
+            extra={'crawler_type': self.crawler_type, 'stage': 'total', 'duration': round(elapsed, 4)}
+        )
+
+
+_current: ContextVar[Optional[TimingSummary]] = ContextVar('timing_summary', default=None)
+
+
+def current_summary() -> Optional[TimingSummary]:
+    return _current.get()
+
+
+@contextmanager
+def timing_run(crawler_type: str, log: bool = True) -> Iterator[TimingSummary]:
+    """開始一次爬取的計時，區塊內的 span 都會累計到回傳的 TimingSummary
+
+    Args:
+        crawler_type: 來源代碼，會帶入每筆日誌的 crawler_type 欄位
+        log: 結束時是否輸出彙總
+    """
+    summary = TimingSummary(crawler_type)
+    token = _current.set(summary)
+    try:
+        yield summary
+    finally:
+        _current.reset(token)
+        if log:
+            summary.log()
+
+
+@contextmanager
+def span(stage: str, url: Optional[str] = None):
+    """量測區塊耗時（例外時也會記錄）
+
+    Args:
+        stage: 階段名稱
+        url: 相關網址，會帶入日誌的 url 欄位
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        summary = _current.get()
+        if summary is not None:
+            summary.add(stage, duration)
+        if logger.isEnabledFor(logging.DEBUG):
+            extra: Dict[str, Any] = {'stage': stage, 'duration': round(duration, 4)}
+            if url:
+                extra['url'] = url
+            if summary is not None:
+                extra['crawler_type'] = summary.crawler_type
+            logger.debug(f"{stage} 耗時 {duration:.3f} 秒", extra=extra)
+
+
+def timed(stage: str, url_arg: Optional[str] = None) -> Callable:
+    """以 span 包裝函式（支援 async 函式）
+
+    Args:
+        stage: 階段名稱
+        url_arg: 作為 url 欄位的參數名稱；參數為 dict 時取其 'url'
+    """
+    def decorator(func: Callable) -> Callable:
+        def _url(args, kwargs) -> Optional[str]:
+            if not url_arg:
+                return None
+            value = kwargs.get(url_arg)
+            if value is None:
+                names = func.__code__.co_varnames[:func.__code__.co_argcount]
+                if url_arg in names and names.index(url_arg) < len(args):
+                    value = args[names.index(url_arg)]
+            if isinstance(value, dict):
+                value = value.get('url')
+            return value if isinstance(value, str) else None
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage, url=_url(args, kwargs)):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage, url=_url(args, kwargs)):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
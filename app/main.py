@@ -1,38 +1,40 @@
 from fastapi import FastAPI, Request, Depends, HTTPException, BackgroundTasks, APIRouter, Form
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from app.core.database import engine, Base, get_db
+from app.core.database import engine, Base, get_db, SessionLocal
+from app.core.search import ensure_search_schema, backfill_search_vectors, search_filter
+from app.core.pagination import PAGE_LINK_RADIUS, encode_cursor, keyset_condition, page_links
+from app.core.cache import count_cache
+from app.core.metrics import API_REQUEST_SECONDS, render_metrics
+from app.services.facets import get_facets
+from app.services.exporter import (
+    build_export_query, build_latest_query, has_rows, stream_csv,
+    write_xlsx, format_latest_row, LATEST_HEADER,
+    write_parquet, stream_arrow, HAS_PYARROW
+)
+from starlette.background import BackgroundTask
 from app.api.v1.api import api_router
 from app.models.article import Article
 import logging
-from sqlalchemy import text, desc, or_, select
+from sqlalchemy import text, desc, select
 from app.core.config import settings
 from math import ceil
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-import subprocess
-from fastapi.responses import RedirectResponse, JSONResponse, FileResponse, StreamingResponse
+from fastapi.responses import RedirectResponse, JSONResponse, FileResponse, StreamingResponse, Response
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from typing import Optional
 import asyncio
-from app.tests.test_crawler import test_crawler
-import multiprocessing
+import time
+from app.services.crawl_queue import enqueue_many
+from app.services.crawl_runner import SOURCES, run_crawl
 from pytz import timezone
-import pandas as pd
 from tempfile import NamedTemporaryFile
 import os
 import shutil
-import io
-import csv
-from app.services.crawler.ltn_crawler import LTNCrawler
-from app.services.crawler.udn_crawler import UDNCrawler
-from app.services.crawler.nextapple_crawler import NextAppleCrawler
-from app.services.crawler.ettoday_crawler import EttodayCrawler
-from app.services.crawler.edgeprop_crawler import EdgePropCrawler
-from app.services.crawler.starproperty_crawler import StarPropertyCrawler
-from app.services.crawler.freemalaysiatoday_crawler import FreeMalaysiaTodayCrawler
-from app.services.crawler.hk852house_crawler import House852Crawler
+from app.services.crawler.driver_pool import driver_pool
+from app.services.crawler.http_client import http_client
 
 # 設定日誌
 from app.core.logging_config import setup_logging
@@ -53,38 +55,60 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 # 註冊 API 路由
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+def route_template(scope) -> str:
+    """將請求路徑還原為路由樣板，例如 /api/v1/articles/123 -> /api/v1/articles/{article_id}"""
+    if 'route' not in scope:
+        return 'unmatched'
+    params = {str(value): f"{{{name}}}" for name, value in scope.get('path_params', {}).items()}
+    if not params:
+        return scope['path']
+    return '/'.join(params.get(segment, segment) for segment in scope['path'].split('/'))
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """記錄各路由的請求耗時；以路由樣板作為標籤，避免路徑參數造成標籤爆量"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        API_REQUEST_SECONDS.labels(
+            method=request.method,
+            route=route_template(request.scope),
+            status=str(status)
+        ).observe(time.perf_counter() - start)
+
 # 建立排程器
 scheduler = AsyncIOScheduler(timezone=timezone('Asia/Taipei'))
 
+def enqueue_crawl(sources, start_date: str = None, end_date: str = None,
+                  stop_on_known_page: bool = None, trigger: str = "api"):
+    """將爬取任務排入佇列，由 worker 行程（python -m app.worker）執行
+
+    Returns:
+        (CrawlRun ID, [(來源, 任務, 是否為新建立), ...])，可由 /api/v1/crawls/{id} 查詢進度
+    """
+    db = SessionLocal()
+    try:
+        return enqueue_many(db, sources, start_date, end_date, stop_on_known_page, trigger=trigger)
+    finally:
+        db.close()
+
 async def run_crawler_in_background(crawler_type: str = "all", start_date: str = None, end_date: str = None):
-    """在背景執行爬蟲"""
+    """排入爬取任務"""
     try:
         # 如果沒有指定日期，使用今天
         if not start_date or not end_date:
             start_date = end_date = datetime.now().strftime("%Y-%m-%d")
             
         # 定義要爬取的新聞來源
-        sources = ["udn", "ltn", "nextapple", "ettoday", "edgeprop", "starproperty", "freemalaysiatoday", "hk852house"] if crawler_type == "all" else [crawler_type]
-        
-        for source in sources:
-            try:
-                # 執行爬蟲指令
-                subprocess.run([
-                    "python", 
-                    "-m", 
-                    "app.tests.test_crawler",
-                    source,
-                    "--start_date", 
-                    start_date,
-                    "--end_date",
-                    end_date
-                ], check=True)
-                logger.info(f"{source} 爬蟲完成: {datetime.now()}")
-            except subprocess.CalledProcessError as e:
-                logger.error(f"{source} 爬蟲執行失敗: {str(e)}")
+        sources = SOURCES if crawler_type == "all" else [crawler_type]
+        await asyncio.to_thread(enqueue_crawl, sources, start_date, end_date, None, "web")
                 
     except Exception as e:
-        logger.error(f"爬蟲執行失敗: {str(e)}")
+        logger.error(f"排入爬取任務失敗: {str(e)}")
 
 async def crawl_yesterday():
     """排程爬蟲任務 - 爬取前一天的文章"""
@@ -95,18 +119,30 @@ async def crawl_yesterday():
 
         logger.info(f"準備爬取前一天 ({yesterday}) 的文章")
 
-        # 建立新的 Process 來執行爬蟲
-        process = multiprocessing.Process(
-            target=run_crawler_process,
-            args=(yesterday, yesterday)
-        )
-        process.start()
+        # 排入佇列，已有相同日期的任務時不會重複排入
+        await asyncio.to_thread(enqueue_crawl, SOURCES, yesterday, yesterday, None, "schedule")
 
-        logger.info(f"排程爬蟲任務已啟動: {datetime.now()}")
+        logger.info(f"排程爬蟲任務已排入佇列: {datetime.now()}")
 
     except Exception as e:
         logger.error(f"排程爬蟲任務失敗: {str(e)}")
 
+async def backfill_search_index():
+    """為既有文章補建全文搜尋索引"""
+    def run():
+        db = SessionLocal()
+        try:
+            return backfill_search_vectors(db)
+        finally:
+            db.close()
+
+    try:
+        updated = await asyncio.to_thread(run)
+        if updated:
+            logger.info(f"全文搜尋索引補建完成，共 {updated} 篇文章")
+    except Exception as e:
+        logger.error(f"補建全文搜尋索引失敗: {str(e)}")
+
 # 設定排程任務
 def setup_scheduler():
     try:
@@ -118,6 +154,13 @@ def setup_scheduler():
             replace_existing=True
         )
 
+        # 啟動後立即補建尚未建立的全文搜尋索引
+        scheduler.add_job(
+            backfill_search_index,
+            id='backfill_search_index',
+            replace_existing=True
+        )
+
         # 啟動排程器
         scheduler.start()
         logger.info(f"排程器已啟動: {datetime.now(timezone('Asia/Taipei'))}")
@@ -139,6 +182,10 @@ async def index(
     end_date: str = None,
     keyword: str = None,
     error: str = None,
+    cursor: str = None,
+    before: str = None,
+    skip: int = 0,
+    last: bool = False,
     db: Session = Depends(get_db)
 ):
     # 設定每頁顯示數量
@@ -147,32 +194,71 @@ async def index(
     # 建立基本查詢
     query = db.query(Article)
     
-    # 加入搜尋條件
+    # 加入搜尋條件（全文搜尋，依相關度排序）
+    rank = None
     if keyword:
-        query = query.filter(
-            or_(
-                Article.title.ilike(f"%{keyword}%"),
-                Article.content.ilike(f"%{keyword}%")
-            )
-        )
+        condition, rank = search_filter(keyword)
+        query = query.filter(condition)
     
     if source:
         query = query.filter(Article.source == source)
     
-    # 計算總數和頁數
-    total = query.count()
+    # 計算總數和頁數（總數取自快取，避免每次瀏覽都 count 整張表；資料版本變動時快取失效）
+    facets = get_facets(db)
+    if keyword:
+        total = count_cache.get_or_set(('articles', facets['version'], source, keyword), query.count)
+    elif source:
+        total = facets['source_counts'].get(source, 0)
+    else:
+        total = facets['total']
     total_pages = ceil(total / per_page)
     
-    # 取得分頁資料
-    articles = query\
-        .order_by(desc(Article.published_at))\
-        .offset((page - 1) * per_page)\
-        .limit(per_page)\
-        .all()
-    
-    # 取得所有來源選項
-    sources = db.query(Article.source).distinct().all()
-    sources = [source[0] for source in sources]
+    # 取得分頁資料（多取一筆判斷該方向是否還有資料，不依賴快取的總數）
+    if rank is not None:
+        # 依相關度排序的搜尋結果無法使用游標，結果集通常不大，仍使用 OFFSET
+        articles = query\
+            .order_by(desc(rank), desc(Article.published_at))\
+            .offset((page - 1) * per_page)\
+            .limit(per_page)\
+            .all()
+        prev_cursor = next_cursor = None
+    else:
+        newest_first = [desc(Article.published_at), desc(Article.id)]
+        oldest_first = [Article.published_at, Article.id]
+        # 頁碼連結由游標略過少量整頁
+        offset = min(max(skip, 0), PAGE_LINK_RADIUS - 1) * per_page
+        try:
+            if last:
+                # 最後一頁：從最舊的一端取
+                rows = query.order_by(*oldest_first).limit(per_page + 1).all()
+                has_prev, has_next = len(rows) > per_page, False
+                articles = rows[:per_page][::-1]
+            elif before:
+                # 上一頁：從游標往較新的方向取，再反轉
+                rows = query.filter(keyset_condition(before, before=True))\
+                    .order_by(*oldest_first).offset(offset).limit(per_page + 1).all()
+                has_prev, has_next = len(rows) > per_page, True
+                articles = rows[:per_page][::-1]
+            elif cursor:
+                # 下一頁：從游標往較舊的方向取
+                rows = query.filter(keyset_condition(cursor))\
+                    .order_by(*newest_first).offset(offset).limit(per_page + 1).all()
+                has_prev, has_next = True, len(rows) > per_page
+                articles = rows[:per_page]
+            else:
+                # 沒有游標時一律為第一頁，不以 page 計算 OFFSET
+                rows = query.order_by(*newest_first).limit(per_page + 1).all()
+                has_prev, has_next = False, len(rows) > per_page
+                articles = rows[:per_page]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="無效的分頁游標")
+
+        # 頁碼只用於顯示，已沒有較新的文章時即為第一頁
+        if not has_prev:
+            page = 1
+        prev_cursor = encode_cursor(articles[0]) if articles and has_prev else None
+        next_cursor = encode_cursor(articles[-1]) if articles and has_next else None
+    links = page_links(page, total_pages, prev_cursor, next_cursor, keyset=rank is None)
     
     # 建立查詢參數字典
     params = {}
@@ -194,10 +280,12 @@ async def index(
             "articles": articles,
             "current_page": page,
             "total_pages": total_pages,
+            "links": links,
             "total": total,
             "keyword": keyword,
             "source": source,
-            "sources": sources,
+            "sources": facets['sources'],
+            "facets": facets,
             "params": params,
             "error": error
         }
@@ -239,6 +327,8 @@ async def startup_event():
     try:
         # 嘗試創建所有資料表
         Base.metadata.create_all(bind=engine)
+        # 既有資料表補上全文搜尋欄位
+        ensure_search_schema(engine)
         # 測試資料庫連接
         with engine.connect() as conn:
             result = conn.execute(text("SELECT 1"))
@@ -255,6 +345,12 @@ async def shutdown_event():
     scheduler.shutdown()
     logger.info("排程器已關閉")
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 指標"""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
 @app.get("/health")
 def health_check():
     """
@@ -305,26 +401,39 @@ async def crawl_last_week(background_tasks: BackgroundTasks):
         logger.error(f"爬蟲執行失敗: {str(e)}")
         return RedirectResponse(url="/?error=crawl_failed", status_code=303)
 
-# 建立一個新的 Process 來執行爬蟲
-def run_crawler_process(start_date, end_date, parallel=True):
-    """在新的 Process 中執行爬蟲（支援並行爬取）"""
+def run_crawler_process(start_date, end_date, parallel=True, sources=None):
+    """不經由佇列，直接在目前行程執行爬蟲（支援並行爬取），供除錯與效能測試使用
+
+    Args:
+        sources: 要爬取的來源，預設為全部
+
+    Returns:
+        {來源: {'status': 'success' | 'failed', 'count' | 'error': ...}}
+    """
     async def run_single_crawler(source: str):
         """執行單個爬蟲（帶異常處理）"""
         try:
             logger.info(f"開始爬取 {source} 文章...")
-            count = await test_crawler(
-                crawler_type=source,
+            crawl = run_crawl(
+                source,
                 start_date=start_date,
                 end_date=end_date
             )
+            if parallel:
+                # 爬蟲內部多為阻塞呼叫，各自在獨立執行緒的事件迴圈中執行才會真正並行，
+                # 瀏覽器數量則由共用的 Driver 池限制
+                count = await asyncio.to_thread(asyncio.run, crawl)
+            else:
+                count = await crawl
             logger.info(f"✅ {source} 爬蟲完成，共爬取 {count} 篇文章")
             return {source: {'status': 'success', 'count': count}}
         except Exception as e:
             logger.error(f"❌ {source} 爬蟲失敗: {str(e)}", exc_info=True)
             return {source: {'status': 'failed', 'error': str(e)}}
 
+    sources = list(sources or SOURCES)
+
     async def run():
-        sources = ["ltn", "udn", "nextapple", "ettoday", "edgeprop", "starproperty", "freemalaysiatoday", "hk852house"]
 
         if parallel:
             # 並行爬取
@@ -346,7 +455,6 @@ def run_crawler_process(start_date, end_date, parallel=True):
             for source in sources:
                 result = await run_single_crawler(source)
                 results.update(result)
-                await asyncio.sleep(2)  # 串行模式下添加延遲
 
         # 記錄總結
         success_count = sum(1 for r in results.values() if r.get('status') == 'success')
@@ -357,7 +465,11 @@ def run_crawler_process(start_date, end_date, parallel=True):
 
         return results
 
-    asyncio.run(run())
+    try:
+        return asyncio.run(run())
+    finally:
+        driver_pool.shutdown()
+        http_client.close()
 
 @app.post("/api/crawl")
 async def crawl_articles(
@@ -365,27 +477,30 @@ async def crawl_articles(
     end_date: Optional[str] = None,
     crawler_type: Optional[str] = None
 ):
-    """啟動爬蟲（使用新的 Process）"""
+    """排入爬取任務，由 worker 行程執行"""
     try:
-        # 建立新的 Process 來執行爬蟲
-        process = multiprocessing.Process(
-            target=run_crawler_process,
-            args=(start_date, end_date)
-        )
-        process.start()
+        sources = [crawler_type] if crawler_type and crawler_type != 'all' else SOURCES
+        if any(source not in SOURCES for source in sources):
+            raise HTTPException(status_code=400, detail=f"未知的爬蟲類型: {crawler_type}")
+
+        run_id, jobs = await asyncio.to_thread(enqueue_crawl, sources, start_date, end_date)
         
         return {
             "status": "success",
-            "message": "爬蟲已在背景開始執行",
+            "message": "爬取任務已排入佇列",
+            "run_id": run_id,
             "results": [{
                 "source": source,
-                "status": "started",
-                "message": "開始執行爬蟲"
-            } for source in ["ltn", "udn", "nextapple", "ettoday", "edgeprop", "starproperty", "freemalaysiatoday", "hk852house"]]
+                "job_id": job.id if job else None,
+                "status": "queued" if created else "already_queued",
+                "message": "已排入佇列" if created else "已有相同的任務排隊或執行中"
+            } for source, job, created in jobs]
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"啟動爬蟲失敗: {str(e)}")
+        logger.error(f"排入爬取任務失敗: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=str(e)
@@ -436,61 +551,24 @@ async def test_scheduler():
         )
 
 @app.get("/export/latest")
-async def export_latest(source: str = None, db: Session = Depends(get_db)):
-	"""匯出最新1000筆文章為Excel，可以指定來源"""
+async def export_latest(source: str = None, limit: Optional[int] = None):
+	"""匯出最新文章為Excel，可以指定來源與筆數上限（預設不限制）"""
 	try:
-		# 建立查詢
-		query = db.query(Article).order_by(desc(Article.published_at))
-		
-		# 如果指定了來源且不是 'all'，則進行過濾
-		if source and source != 'all':
-			query = query.filter(Article.source == source)
-		
-		# 限制最多1000筆
-		articles = query.limit(1000).all()
+		query = build_latest_query(source, limit)
 		
-		# 準備資料
-		data = []
-		for article in articles:
-			data.append({
-				'ID': article.id,
-				'標題': article.title,
-				'來源': article.source,
-				'網址': article.url,
-				'發布時間': article.published_at,
-				'建立時間': article.created_at,
-				'更新時間': article.updated_at,
-				'內容': article.content,
-				'描述': article.description or ''
-			})
-		
-		# 建立 DataFrame
-		df = pd.DataFrame(data)
-		
-		# 建立 BytesIO 物件
-		output = io.BytesIO()
-		
-		# 寫入 Excel
-		with pd.ExcelWriter(output, engine='openpyxl') as writer:
-			df.to_excel(writer, index=False, sheet_name='文章列表')
-		
-		# 將指針移到開頭
-		output.seek(0)
+		# 以 write-only 模式寫入暫存檔，記憶體用量不隨筆數增加
+		path = await asyncio.to_thread(write_xlsx, query, LATEST_HEADER, format_latest_row)
 		
 		# 建立檔案名稱，如果有指定來源，則加入來源名稱
 		source_text = f"_{source}" if source and source != 'all' else ""
 		filename = f"articles_export{source_text}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
 		
-		# 回傳串流響應
-		headers = {
-			'Content-Disposition': f'attachment; filename="{filename}"',
-			'Content-Type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-		}
-		
-		return StreamingResponse(
-			output,
-			headers=headers,
-			media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+		# 傳送完成後刪除暫存檔
+		return FileResponse(
+			path,
+			filename=filename,
+			media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+			background=BackgroundTask(os.remove, path)
 		)
 			
 	except Exception as e:
@@ -501,22 +579,28 @@ async def export_latest(source: str = None, db: Session = Depends(get_db)):
 		)
 
 @app.get("/export")
-async def export_page(request: Request, source: str = None):
+async def export_page(request: Request, source: str = None, db: Session = Depends(get_db)):
 	"""匯出資料頁面，可以預設指定來源"""
-	# 取得所有可用的新聞來源
-	db = next(get_db())
-	sources = db.query(Article.source).distinct().all()
-	sources = [s[0] for s in sources]
+	# 取得所有可用的新聞來源（快取）
+	facets = get_facets(db)
 	
 	return templates.TemplateResponse(
 		"export.html",
 		{
 			"request": request,
 			"selected_source": source,  # 傳遞預選的來源
-			"sources": sources  # 傳遞所有可用的來源
+			"sources": facets['sources'],  # 傳遞所有可用的來源
+			"facets": facets
 		}
 	)
 
+# 匯出格式與副檔名
+EXPORT_EXTENSIONS = {
+	"csv": "csv",
+	"parquet": "parquet",
+	"arrow": "arrows",
+}
+
 @app.post("/export/articles")
 async def export_articles(
 	request: Request,
@@ -526,74 +610,47 @@ async def export_articles(
 	source: str = Form(None),  # 添加來源參數
 	file_format: str = Form("csv")
 ):
-	"""匯出文章資料"""
+	"""匯出文章資料（串流輸出，不將結果全部載入記憶體）"""
 	try:
-		db = next(get_db())
-		
-		# 建立查詢
-		query = select(Article).order_by(Article.published_at.desc())
+		if file_format not in EXPORT_EXTENSIONS:
+			raise HTTPException(status_code=400, detail=f"不支援的檔案格式: {file_format}")
+		if file_format in ("parquet", "arrow") and not HAS_PYARROW:
+			raise HTTPException(status_code=400, detail="伺服器未安裝 pyarrow，無法匯出此格式")
 		
-		# 如果有日期範圍
-		if start_date and end_date:
-			start = datetime.strptime(f"{start_date} 00:00:00", '%Y-%m-%d %H:%M:%S')
-			end = datetime.strptime(f"{end_date} 23:59:59", '%Y-%m-%d %H:%M:%S')
-			query = query.where(Article.published_at.between(start, end))
-		
-		# 如果有關鍵字
-		if keyword:
-			query = query.where(Article.title.ilike(f'%{keyword}%'))
+		query = build_export_query(start_date, end_date, keyword, source)
 		
-		# 如果有指定來源且不是 'all'
-		if source and source != 'all':
-			query = query.where(Article.source == source)
-		
-		# 執行查詢
-		result = db.execute(query)
-		articles = result.scalars().all()
-		
-		if not articles:
+		if not has_rows(query):
 			raise HTTPException(status_code=404, detail="找不到符合條件的文章")
 		
-		# 準備 CSV 資料
-		output = io.StringIO()
-		writer = csv.writer(output)
-		
-		# 寫入標題列
-		writer.writerow([
-			'ID', '標題', '來源', '分類', '記者', 
-			'發布時間', '內容', '連結', '圖片連結'
-		])
-		
-		# 寫入資料列
-		for article in articles:
-			writer.writerow([
-				str(article.id),
-				str(article.title or ''),
-				str(article.source or ''),
-				str(article.category or ''),
-				str(article.reporter or ''),
-				article.published_at.strftime('%Y-%m-%d %H:%M:%S'),
-				str(article.content or ''),
-				str(article.url or ''),
-				str(article.image_url or '')
-			])
-		
 		# 設定檔案名稱 - 加入來源資訊
 		timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 		source_text = f"_{source}" if source and source != 'all' else ""
+		extension = EXPORT_EXTENSIONS[file_format]
 		
 		if keyword:
-			filename = f"news_search{source_text}_{timestamp}.csv"
+			filename = f"news_search{source_text}_{timestamp}.{extension}"
 		else:
-			filename = f"news{source_text}_{start_date}_to_{end_date}_{timestamp}.csv"
+			filename = f"news{source_text}_{start_date}_to_{end_date}_{timestamp}.{extension}"
 		
-		# 準備回應
-		output.seek(0)
-		output_str = output.getvalue()
-		output_bytes = output_str.encode('utf-8-sig')
+		if file_format == "parquet":
+			# Parquet 的 metadata 位於檔尾，先寫入暫存檔
+			path = await asyncio.to_thread(write_parquet, query)
+			return FileResponse(
+				path,
+				filename=filename,
+				media_type="application/vnd.apache.parquet",
+				background=BackgroundTask(os.remove, path)
+			)
+		
+		if file_format == "arrow":
+			return StreamingResponse(
+				stream_arrow(query),
+				media_type="application/vnd.apache.arrow.stream",
+				headers={"Content-Disposition": f"attachment; filename={filename}"}
+			)
 		
 		return StreamingResponse(
-			io.BytesIO(output_bytes),
+			stream_csv(query),
 			media_type="text/csv",
 			headers={
 				"Content-Disposition": f"attachment; filename={filename}",
@@ -624,35 +681,24 @@ async def rescrape_articles(
 ):
     """執行回補爬蟲"""
     try:
-        all_results = []
-        messages = [f"開始爬取新聞，日期範圍：{start_date} 到 {end_date}"]
+        messages = [f"排入回補任務，日期範圍：{start_date} 到 {end_date}"]
         
         # 決定要爬取的來源
-        sources = ["ltn", "udn", "nextapple", "ettoday", "edgeprop", "starproperty", "freemalaysiatoday", "hk852house"]
-        crawlers_to_run = sources if source == 'all' else [source]
+        crawlers_to_run = SOURCES if source == 'all' else [source]
         
-        # 執行每個爬蟲
-        for source_name in crawlers_to_run:
-            try:
-                messages.append(f"\n開始爬取 {source_name} 新聞...")
-                
-                # 使用 test_crawler 執行爬蟲
-                count = await test_crawler(
-                    crawler_type=source_name,
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                
-                messages.append(f"成功爬取 {count} 篇文章")
-                
-            except Exception as e:
-                error_msg = f"爬取 {source_name} 時發生錯誤: {str(e)}"
-                messages.append(error_msg)
-                logger.error(error_msg)
-                continue  # 繼續執行其他爬蟲
+        # 回補時不因整頁已收錄而停止翻頁
+        run_id, jobs = await asyncio.to_thread(
+            enqueue_crawl, crawlers_to_run, start_date, end_date, False, "rescrape"
+        )
+        for source_name, job, created in jobs:
+            if created:
+                messages.append(f"{source_name}: 已排入佇列（任務 #{job.id}）")
+            else:
+                messages.append(f"{source_name}: 已有相同的任務排隊或執行中")
         
-        # 加入總結資訊
-        messages.append(f"\n爬取完成")
+        messages.append(f"\n任務將由 worker 依序執行")
+        if run_id:
+            messages.append(f"進度請見 /api/v1/crawls/{run_id}")
         
         return {
             "status": "success",
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -18,6 +19,8 @@ class Article(Base):
     published_at = Column(DateTime, nullable=False, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # 全文搜尋用，由 app.core.search 在寫入時建立
+    search_vector = Column(TSVECTOR)
 
     # 複合索引
     __table_args__ = (
@@ -29,6 +32,8 @@ class Article(Base):
         Index('idx_category', 'category'),
         # 創建時間索引，用於管理和清理
         Index('idx_created_at', 'created_at'),
+        # 全文搜尋索引
+        Index('idx_articles_search', 'search_vector', postgresql_using='gin'),
     )
 
     def __repr__(self):
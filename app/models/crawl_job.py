@@ -0,0 +1,133 @@
+from typing import Optional
+
+from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# 任務狀態
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+def _duration(started_at, finished_at) -> Optional[float]:
+    if started_at and finished_at:
+        return (finished_at - started_at).total_seconds()
+    return None
+
+
+class CrawlRun(Base):
+    """一次爬取請求（排程、API、回補），底下每個來源一個 CrawlJob"""
+    __tablename__ = "crawl_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    trigger = Column(String(20), nullable=False)  # schedule / api / web / rescrape
+    start_date = Column(Date)
+    end_date = Column(Date)
+    created_at = Column(DateTime, server_default=func.now())
+
+    jobs = relationship("CrawlJob", back_populates="run", lazy="selectin", order_by="CrawlJob.id")
+
+    @property
+    def status(self) -> str:
+        """由各來源任務彙總：仍有任務未完成為 queued/running，否則有失敗即為 failed"""
+        statuses = {job.status for job in self.jobs}
+        if JOB_RUNNING in statuses:
+            return JOB_RUNNING
+        if JOB_QUEUED in statuses:
+            return JOB_RUNNING if statuses - {JOB_QUEUED} else JOB_QUEUED
+        return JOB_FAILED if JOB_FAILED in statuses else JOB_SUCCEEDED
+
+    def _total(self, field: str) -> int:
+        return sum(getattr(job, field) or 0 for job in self.jobs)
+
+    @property
+    def articles_found(self) -> int:
+        return self._total('articles_found')
+
+    @property
+    def saved_count(self) -> int:
+        return self._total('saved_count')
+
+    @property
+    def updated_count(self) -> int:
+        return self._total('updated_count')
+
+    @property
+    def pages_visited(self) -> int:
+        return self._total('pages_visited')
+
+    @property
+    def started_at(self):
+        started = [job.started_at for job in self.jobs if job.started_at]
+        return min(started) if started else None
+
+    @property
+    def finished_at(self):
+        if self.status in ACTIVE_STATUSES:
+            return None
+        finished = [job.finished_at for job in self.jobs if job.finished_at]
+        return max(finished) if finished else None
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        return _duration(self.started_at, self.finished_at)
+
+    def __repr__(self):
+        return f"<CrawlRun {self.id} {self.trigger}>"
+
+
+class CrawlJob(Base):
+    """爬取任務佇列，由 app.worker 以 FOR UPDATE SKIP LOCKED 取出執行"""
+    __tablename__ = "crawl_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("crawl_runs.id", ondelete="CASCADE"), index=True)
+    source = Column(String(50), nullable=False)
+    start_date = Column(Date)
+    end_date = Column(Date)
+    stop_on_known_page = Column(Boolean)  # None 時依 CRAWLER_STOP_ON_KNOWN_PAGE 設定
+    status = Column(String(20), nullable=False, default=JOB_QUEUED, server_default=JOB_QUEUED)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # 進度
+    stage = Column(String(20))  # crawling / saving / done
+    articles_found = Column(Integer)
+    pages_visited = Column(Integer)
+    saved_count = Column(Integer)
+    updated_count = Column(Integer)
+    error = Column(Text)
+
+    worker = Column(String(100))  # 執行中的 worker（主機名稱:pid）
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        # 依來源查詢歷史任務（各來源吞吐量）
+        Index('idx_crawl_jobs_source_created', 'source', 'created_at'),
+        # 取出任務時依狀態與建立時間掃描
+        Index('idx_crawl_jobs_status_created', 'status', 'created_at'),
+        # 同一來源、同一日期範圍只能有一個排隊中或執行中的任務
+        Index(
+            'uq_crawl_jobs_active',
+            'source',
+            text("coalesce(start_date, '-infinity'::date)"),
+            text("coalesce(end_date, '-infinity'::date)"),
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    run = relationship("CrawlRun", back_populates="jobs")
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        return _duration(self.started_at, self.finished_at)
+
+    def __repr__(self):
+        return f"<CrawlJob {self.id} {self.source} {self.status}>"
@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class DataVersion(Base):
+    """資料版本計數，寫入端每次變動資料後遞增，供其他行程判斷快取是否過時"""
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<DataVersion {self.name}={self.version}>"
@@ -0,0 +1,44 @@
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+
+class CrawlJobInfo(BaseModel):
+    id: int
+    source: str
+    status: str
+    stage: Optional[str] = None
+    attempts: int
+    articles_found: Optional[int] = None
+    pages_visited: Optional[int] = None
+    saved_count: Optional[int] = None
+    updated_count: Optional[int] = None
+    error: Optional[str] = None
+    worker: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CrawlRunInfo(BaseModel):
+    id: int
+    trigger: str
+    status: str
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    articles_found: int
+    pages_visited: int
+    saved_count: int
+    updated_count: int
+    jobs: List[CrawlJobInfo]
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CrawlRunList(BaseModel):
+    items: List[CrawlRunInfo]
+    next_before: Optional[int] = None  # 下一頁請帶入 before 參數
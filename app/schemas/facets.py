@@ -0,0 +1,11 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+class Facets(BaseModel):
+    sources: List[str]
+    source_counts: Dict[str, int]
+    categories: List[str]
+    earliest: Optional[datetime] = None
+    latest: Optional[datetime] = None
+    total: int
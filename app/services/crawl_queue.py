@@ -0,0 +1,278 @@
+"""
+爬取任務佇列
+任務存放在 crawl_jobs 資料表，web 行程只負責排入，由 app.worker 的 worker 行程取出執行。
+
+- 去重：同一來源、同一日期範圍只能有一個排隊中或執行中的任務（部分唯一索引）
+- 取出：以 FOR UPDATE SKIP LOCKED 選取，並以 advisory lock 序列化取出流程，
+  讓每個來源同時執行的任務數不超過上限
+- 進度：執行中的任務定期更新 heartbeat_at 與階段；heartbeat 逾時的任務視為
+  worker 已中斷，重新排入佇列（超過嘗試次數則標記失敗）
+- 紀錄：同一次請求排入的任務歸屬同一個 CrawlRun，保留各來源的數量、頁數與耗時
+"""
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.crawl_job import (
+    ACTIVE_STATUSES, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, CrawlJob, CrawlRun
+)
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock 的鍵值，僅用於序列化取出任務
+CLAIM_LOCK_KEY = 0x72656173
+
+
+def _to_date(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(value) if value else None
+
+
+def source_limit(source: str) -> int:
+    """來源同時執行的任務上限"""
+    return settings.CRAWL_QUEUE_SOURCE_LIMITS.get(source, settings.CRAWL_QUEUE_MAX_PER_SOURCE)
+
+
+def enqueue(
+    db: Session,
+    source: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    stop_on_known_page: Optional[bool] = None,
+    run_id: Optional[int] = None
+) -> Tuple[Optional[CrawlJob], bool]:
+    """排入爬取任務
+
+    Args:
+        db: 資料庫 session
+        source: 來源代碼
+        start_date: 起始日期 (YYYY-MM-DD)
+        end_date: 結束日期 (YYYY-MM-DD)
+        stop_on_known_page: 整頁已收錄時是否停止翻頁，None 時依設定
+        run_id: 所屬的 CrawlRun
+
+    Returns:
+        (任務, 是否為新建立)；已有相同的排隊中或執行中任務時回傳該任務與 False
+    """
+    start, end = _to_date(start_date), _to_date(end_date)
+    stmt = (
+        pg_insert(CrawlJob)
+        .values(
+            run_id=run_id, source=source, start_date=start, end_date=end,
+            stop_on_known_page=stop_on_known_page
+        )
+        .on_conflict_do_nothing()
+        .returning(CrawlJob.id)
+    )
+    job_id = db.execute(stmt).scalar()
+    db.commit()
+
+    if job_id is not None:
+        logger.info(f"已排入爬取任務 #{job_id}: {source} ({start_date} ~ {end_date})")
+        return _detached(db, db.get(CrawlJob, job_id)), True
+
+    existing = db.execute(
+        select(CrawlJob).where(
+            CrawlJob.source == source,
+            CrawlJob.start_date.is_not_distinct_from(start),
+            CrawlJob.end_date.is_not_distinct_from(end),
+            CrawlJob.status.in_(ACTIVE_STATUSES),
+        )
+    ).scalar_one_or_none()
+    logger.info(f"{source} ({start_date} ~ {end_date}) 已有進行中的任務，略過排入")
+    return _detached(db, existing), False
+
+
+def _detached(db: Session, job: Optional[CrawlJob]) -> Optional[CrawlJob]:
+    """移出 session，讓呼叫者在後續 commit 或關閉 session 後仍可讀取欄位"""
+    if job is not None:
+        db.expunge(job)
+    return job
+
+
+def enqueue_many(
+    db: Session,
+    sources: Iterable[str],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    stop_on_known_page: Optional[bool] = None,
+    trigger: str = "api"
+) -> Tuple[Optional[int], List[Tuple[str, Optional[CrawlJob], bool]]]:
+    """建立 CrawlRun 並為多個來源排入相同日期範圍的任務
+
+    Args:
+        trigger: 觸發來源（schedule / api / web / rescrape）
+
+    Returns:
+        (CrawlRun ID, [(來源, 任務, 是否為新建立), ...])；
+        所有來源都已有進行中的任務時不保留 CrawlRun，ID 為 None
+    """
+    run = CrawlRun(trigger=trigger, start_date=_to_date(start_date), end_date=_to_date(end_date))
+    db.add(run)
+    db.commit()
+    run_id = run.id
+
+    results = [
+        (source, *enqueue(db, source, start_date, end_date, stop_on_known_page, run_id=run_id))
+        for source in sources
+    ]
+    if not any(created for _, _, created in results):
+        db.delete(run)
+        db.commit()
+        run_id = None
+    return run_id, results
+
+
+def list_runs(
+    db: Session,
+    limit: int = 20,
+    before: Optional[int] = None,
+    source: Optional[str] = None
+) -> List[CrawlRun]:
+    """依建立順序由新到舊列出 CrawlRun（含各來源任務）
+
+    Args:
+        limit: 筆數上限
+        before: 只列出 ID 小於此值的紀錄，用於翻頁
+        source: 只列出包含此來源的紀錄
+    """
+    query = select(CrawlRun).order_by(CrawlRun.id.desc()).limit(limit)
+    if before:
+        query = query.where(CrawlRun.id < before)
+    if source:
+        query = query.where(CrawlRun.jobs.any(CrawlJob.source == source))
+    return list(db.execute(query).scalars())
+
+
+def requeue_stale(db: Session) -> int:
+    """將 heartbeat 逾時的執行中任務重新排入佇列，超過嘗試次數者標記失敗
+
+    Returns:
+        int: 處理的任務數量
+    """
+    deadline = func.now() - timedelta(seconds=settings.CRAWL_JOB_STALE_SECONDS)
+    exhausted = CrawlJob.attempts >= settings.CRAWL_JOB_MAX_ATTEMPTS
+    result = db.execute(
+        update(CrawlJob)
+        .where(CrawlJob.status == JOB_RUNNING, CrawlJob.heartbeat_at < deadline)
+        .values(
+            status=case((exhausted, JOB_FAILED), else_=JOB_QUEUED),
+            finished_at=case((exhausted, func.now()), else_=None),
+            error="worker 無回應",
+            worker=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        logger.warning(f"{result.rowcount} 個爬取任務的 worker 無回應，已重新排入或標記失敗")
+    return result.rowcount
+
+
+def claim_job(db: Session, worker_id: str) -> Optional[CrawlJob]:
+    """取出下一個可執行的任務並標記為執行中
+
+    Args:
+        db: 資料庫 session
+        worker_id: worker 識別名稱
+
+    Returns:
+        取出的任務，沒有可執行的任務時回傳 None
+    """
+    try:
+        # 序列化取出流程，確保計算中的執行數量不會被其他 worker 同時改變
+        db.execute(select(func.pg_advisory_xact_lock(CLAIM_LOCK_KEY)))
+        requeue_stale(db)
+
+        running: Dict[str, int] = dict(db.execute(
+            select(CrawlJob.source, func.count())
+            .where(CrawlJob.status == JOB_RUNNING)
+            .group_by(CrawlJob.source)
+        ).all())
+        full_sources = [source for source, count in running.items() if count >= source_limit(source)]
+
+        query = (
+            select(CrawlJob)
+            .where(CrawlJob.status == JOB_QUEUED)
+            .order_by(CrawlJob.created_at, CrawlJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if full_sources:
+            query = query.where(CrawlJob.source.notin_(full_sources))
+
+        job = db.execute(query).scalar_one_or_none()
+        if job is not None:
+            job.status = JOB_RUNNING
+            job.attempts += 1
+            job.worker = worker_id
+            job.error = None
+            job.stage = None
+            job.started_at = func.now()
+            job.heartbeat_at = func.now()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if job is not None:
+        db.refresh(job)
+        logger.info(f"{worker_id} 取出爬取任務 #{job.id}: {job.source}")
+    return job
+
+
+def heartbeat(job_id: int, stage: Optional[str] = None, **counts: int):
+    """更新任務的 heartbeat，並可同時記錄進度
+
+    Args:
+        job_id: 任務 ID
+        stage: 目前階段
+        counts: articles_found / pages_visited / saved / updated
+    """
+    values = {'heartbeat_at': func.now()}
+    if stage:
+        values['stage'] = stage
+    for key, column in (
+        ('articles_found', 'articles_found'),
+        ('pages_visited', 'pages_visited'),
+        ('saved', 'saved_count'),
+        ('updated', 'updated_count'),
+    ):
+        if key in counts:
+            values[column] = counts[key]
+
+    db = SessionLocal()
+    try:
+        db.execute(update(CrawlJob).where(CrawlJob.id == job_id).values(**values))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"更新爬取任務 #{job_id} 進度失敗: {str(e)}")
+    finally:
+        db.close()
+
+
+def finish_job(job_id: int, error: Optional[str] = None):
+    """標記任務完成或失敗"""
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(CrawlJob)
+            .where(CrawlJob.id == job_id)
+            .values(
+                status=JOB_FAILED if error else JOB_SUCCEEDED,
+                error=error,
+                finished_at=func.now(),
+                heartbeat_at=func.now(),
+            )
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"更新爬取任務 #{job_id} 狀態失敗: {str(e)}")
+    finally:
+        db.close()
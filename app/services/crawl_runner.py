@@ -0,0 +1,154 @@
+"""
+單一來源的爬取流程
+建立爬蟲、載入已收錄網址、爬取並寫入資料庫，最後清除統計快取。
+由佇列 worker（app.worker）、回補與命令列共用。
+"""
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.db_utils import batch_upsert_articles, copy_upsert_articles
+from app.core.timing import timing_run
+from app.services.crawler.edgeprop_crawler import EdgePropCrawler
+from app.services.crawler.ettoday_crawler import EttodayCrawler
+from app.services.crawler.freemalaysiatoday_crawler import FreeMalaysiaTodayCrawler
+from app.services.crawler.hk852house_crawler import House852Crawler
+from app.services.crawler.ltn_crawler import LTNCrawler
+from app.services.crawler.nextapple_crawler import NextAppleCrawler
+from app.services.crawler.starproperty_crawler import StarPropertyCrawler
+from app.services.crawler.udn_crawler import UDNCrawler
+from app.services.crawler.url_index import KnownUrlIndex
+from app.services.facets import invalidate_facets
+
+logger = logging.getLogger(__name__)
+
+CRAWLERS = {
+    'ltn': LTNCrawler,
+    'udn': UDNCrawler,
+    'nextapple': NextAppleCrawler,
+    'ettoday': EttodayCrawler,
+    'edgeprop': EdgePropCrawler,
+    'starproperty': StarPropertyCrawler,
+    'freemalaysiatoday': FreeMalaysiaTodayCrawler,
+    'hk852house': House852Crawler,
+}
+SOURCES = list(CRAWLERS)
+
+# 進度回報：progress(stage, **counts)
+ProgressCallback = Callable[..., None]
+
+
+def get_crawler(source: str):
+    """根據名稱建立對應的爬蟲實例，未知來源回傳 None"""
+    crawler_class = CRAWLERS.get(source)
+    return crawler_class() if crawler_class else None
+
+
+def article_to_row(article: Any, source: str) -> Dict[str, Any]:
+    """將爬蟲回傳的文章（dict 或 Article）轉為寫入資料庫的欄位"""
+    if isinstance(article, dict):
+        get = article.get
+    else:
+        get = lambda key: getattr(article, key, None)
+    return {
+        'url': get('url'),
+        'title': get('title'),
+        'content': get('content'),
+        'published_at': get('published_at'),
+        'source': source,
+        'image_url': get('image_url'),
+        'description': get('description'),
+        'category': get('category'),
+        'reporter': get('reporter'),
+    }
+
+
+def save_articles(source: str, articles: List[Any]) -> Dict[str, int]:
+    """寫入文章並遞增資料版本（各行程的統計快取隨之失效）
+
+    Returns:
+        {'saved': 新增數量, 'updated': 更新數量}
+    """
+    rows = [article_to_row(article, source) for article in articles]
+
+    db = SessionLocal()
+    try:
+        # 大量回補時改用 COPY 匯入，否則批次 upsert
+        if len(rows) >= settings.DB_COPY_THRESHOLD:
+            saved_count, updated_count = copy_upsert_articles(db, rows)
+        else:
+            saved_count, updated_count = batch_upsert_articles(db, rows, batch_size=50)
+        # 文章已變動，遞增資料版本，網頁行程的統計快取隨之失效
+        if saved_count or updated_count:
+            invalidate_facets(db)
+    except Exception as e:
+        logger.error(f"資料庫操作失敗: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    logger.info(f"完成！新增: {saved_count} 篇，更新: {updated_count} 篇")
+    return {'saved': saved_count, 'updated': updated_count}
+
+
+async def run_crawl(
+    source: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    stop_on_known_page: Optional[bool] = None,
+    progress: Optional[ProgressCallback] = None
+) -> int:
+    """爬取單一來源並寫入資料庫
+
+    Args:
+        source: 來源代碼，參見 SOURCES
+        start_date: 起始日期 (YYYY-MM-DD)
+        end_date: 結束日期 (YYYY-MM-DD)
+        stop_on_known_page: None 時依 CRAWLER_STOP_ON_KNOWN_PAGE 設定；
+            回補缺漏文章時應傳入 False，避免遇到已收錄的頁面就停止
+        progress: 進度回報函式，會以 'crawling'、'saving'、'done' 階段呼叫
+
+    Returns:
+        爬取到的文章數量
+    """
+    report = progress or (lambda stage, **counts: None)
+
+    crawler = get_crawler(source)
+    if not crawler:
+        raise ValueError(f"未知的爬蟲類型: {source}")
+
+    logger.info(f"開始爬取 {source} 文章 (日期範圍: {start_date} ~ {end_date})...")
+
+    # 載入已收錄網址，只抓取新文章
+    if settings.CRAWLER_SKIP_KNOWN_URLS:
+        index_db = SessionLocal()
+        try:
+            crawler.known_urls = KnownUrlIndex.load(index_db, source)
+        except Exception as e:
+            logger.warning(f"無法載入已收錄網址，改為完整爬取: {str(e)}")
+        finally:
+            index_db.close()
+        if stop_on_known_page is not None:
+            crawler.stop_on_known_page = stop_on_known_page
+
+    try:
+        # 各階段耗時（網路、渲染、解析、清理、寫入）於結束時彙總輸出
+        with timing_run(source):
+            report('crawling')
+            articles = await crawler.crawl(start_date=start_date, end_date=end_date)
+            logger.info(f"爬取到 {len(articles)} 篇文章")
+
+            pages_visited = getattr(crawler, 'pages_visited', 0)
+            report('saving', articles_found=len(articles), pages_visited=pages_visited)
+            counts = save_articles(source, articles)
+            report(
+                'done', articles_found=len(articles), pages_visited=pages_visited,
+                saved=counts['saved'], updated=counts['updated']
+            )
+        return len(articles)
+    finally:
+        # 如果爬蟲有 cleanup 方法，就呼叫它
+        if hasattr(crawler, 'cleanup'):
+            crawler.cleanup()
@@ -0,0 +1,91 @@
+"""
+非同步頁面抓取
+以 httpx.AsyncClient 並行抓取多個頁面，並依網域限制同時連線數與請求速率（安裝 h2 時使用 HTTP/2）
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import FETCH_SECONDS, observe
+from app.services.crawler.base import DEFAULT_HEADERS, resolve_url
+from app.services.crawler.http_cache import CachingTransport, http_cache
+from app.services.crawler.http_client import http_client
+from app.services.crawler.rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFetcher:
+    """並行抓取頁面
+
+    使用方式：
+        async with AsyncFetcher() as fetcher:
+            pages = await fetcher.fetch_all(urls)
+    """
+
+    # 替換底層連線（離線重播、錄製 fixture 時使用），None 時使用 httpx 預設
+    transport: Optional[httpx.AsyncBaseTransport] = None
+
+    def __init__(
+        self,
+        max_per_domain: Optional[int] = None,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+        source: str = ""
+    ):
+        self.max_per_domain = max_per_domain or settings.CRAWLER_MAX_CONCURRENCY_PER_DOMAIN
+        self.timeout = timeout or settings.CRAWLER_TIMEOUT
+        self.headers = headers or DEFAULT_HEADERS
+        self.source = source  # 指標的來源標籤
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        if self.transport is not None:
+            # 錄製與重播需要看到實際回應，不套用快取（條件式請求的 304 不會被錄製）
+            transport = self.transport
+        elif http_cache.enabled:
+            transport = CachingTransport(http_client.async_transport(), http_cache)
+        else:
+            transport = http_client.async_transport()
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            transport=transport
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._client.aclose()
+        self._client = None
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_per_domain)
+        return self._semaphores[host]
+
+    async def fetch(self, url: str) -> Optional[str]:
+        """抓取單一頁面，失敗時回傳 None"""
+        async with self._semaphore(url):
+            await rate_limiter.acquire_async(url)
+            try:
+                with observe(FETCH_SECONDS, source=self.source or 'unknown', method='async'):
+                    response = await self._client.get(resolve_url(url))
+            except httpx.HTTPError as e:
+                logger.warning(f"Async fetch failed for {url}: {str(e)}")
+                return None
+
+        if response.status_code != 200:
+            logger.info(f"Async fetch got status {response.status_code} for {url}")
+            return None
+        return response.text
+
+    async def fetch_all(self, urls: List[str]) -> List[Optional[str]]:
+        """並行抓取多個頁面，回傳順序與 urls 相同"""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
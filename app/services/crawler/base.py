@@ -1,153 +1,251 @@
 from abc import ABC, abstractmethod
-import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from app.core.config import settings
+from app.core.metrics import FETCH_RETRIES, FETCH_SECONDS, PARSE_SECONDS, observe
+from app.core.timing import span, timed
+from app.services.crawler.content_cleaner import get_cleaner
+from app.services.crawler.date_parser import DateParser, get_date_parser
+from app.services.crawler.driver_pool import driver_pool, PooledDriver
+from app.services.crawler.http_client import DEFAULT_HEADERS, HttpClientFactory, http_client
+from app.services.crawler.rate_limiter import rate_limiter
+from app.services.crawler.url_index import KnownUrlIndex
 import logging
-import time
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 from selenium.common.exceptions import TimeoutException
-import random
+import requests
+from bs4 import BeautifulSoup, Tag
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
     retry_if_exception_type,
-    before_sleep_log
+    before_sleep_log,
+    RetryError
 )
 
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
 logger = logging.getLogger(__name__)
 
+
+def resolve_url(url: str) -> str:
+    """依 CRAWLER_ORIGIN_OVERRIDES 將網址改送到替代的位址（本機模擬站、測試環境）
+
+    只影響實際發出的請求，文章網址與速率限制仍以原網址為準。
+    """
+    overrides = settings.CRAWLER_ORIGIN_OVERRIDES
+    if overrides:
+        for origin, target in overrides.items():
+            if url.startswith(origin) and url[len(origin):len(origin) + 1] in ('', '/', '?'):
+                return target.rstrip('/') + url[len(origin):]
+    return url
+
+
+_log_retry = before_sleep_log(logger, logging.WARNING)
+
+
+def _before_retry_sleep(retry_state):
+    """wait_and_get 重試前記錄警告與重試次數"""
+    crawler = retry_state.args[0] if retry_state.args else None
+    FETCH_RETRIES.labels(source=getattr(crawler, 'source_name', '') or 'unknown', method='selenium').inc()
+    _log_retry(retry_state)
+
+
+class HtmlParser:
+    """HTML 解析後端
+
+    安裝 lxml 時以 lxml 建立 BeautifulSoup，速度約為 html.parser 的數倍；
+    指定 container 時先以 lxml 解析並用預先編譯的 CSS selector 找出容器，
+    只將該子樹交給 BeautifulSoup，其餘部分不會建立 Python 物件。
+    每個爬蟲各自持有一個實例，selector 編譯結果依來源快取。
+    """
+
+    def __init__(self):
+        self.features = 'lxml' if HAS_LXML else 'html.parser'
+        self._selectors: Dict[str, "CSSSelector"] = {}
+
+    def selector(self, css: str) -> "CSSSelector":
+        """取得已編譯的 CSS selector"""
+        compiled = self._selectors.get(css)
+        if compiled is None:
+            compiled = self._selectors[css] = CSSSelector(css)
+        return compiled
+
+    def parse(self, html: str, container: Optional[str] = None) -> Optional[Tag]:
+        """
+        解析 HTML
+
+        Args:
+            html: 頁面原始碼
+            container: 只解析第一個符合此 CSS selector 的元素
+
+        Returns:
+            未指定 container 時為整頁的 BeautifulSoup；指定時為容器元素（Tag），
+            找不到容器或 html 為空時回傳 None
+        """
+        if not html:
+            return None
+        if not container:
+            return BeautifulSoup(html, self.features)
+        if not HAS_LXML:
+            return BeautifulSoup(html, self.features).select_one(container)
+
+        try:
+            tree = lxml.html.document_fromstring(html)
+        except Exception as e:
+            logger.warning(f"lxml 無法解析頁面: {str(e)}")
+            return None
+        nodes = self.selector(container)(tree)
+        if not nodes:
+            return None
+
+        node = nodes[0]
+        fragment = BeautifulSoup(
+            lxml.html.tostring(node, encoding='unicode', with_tail=False), self.features
+        )
+        # lxml 會補上 html/body 外層，容器即為第一個同名元素
+        return fragment.find(node.tag)
+
+
+class PageFetcher(ABC):
+    """頁面抓取策略
+
+    BaseCrawler.fetch_page 會依序嘗試 crawler.fetchers，
+    第一個取得有效頁面的策略勝出。
+    """
+    name = ""
+
+    @abstractmethod
+    def fetch(
+        self,
+        crawler: "BaseCrawler",
+        url: str,
+        validate_selector: Optional[str] = None,
+        wait_timeout: Optional[int] = None
+    ) -> Optional[str]:
+        """取得頁面 HTML，失敗時回傳 None"""
+        pass
+
+
+class HttpFetcher(PageFetcher):
+    """以共用的 HTTP 連線池抓取靜態 HTML"""
+    name = "requests"
+
+    def fetch(self, crawler, url, validate_selector=None, wait_timeout=None):
+        try:
+            response = crawler.http_get(url)
+        except requests.RequestException as e:
+            logger.warning(f"HTTP request failed for {url}: {str(e)}")
+            return None
+
+        if response.status_code != 200:
+            logger.info(f"HTTP fetch got status {response.status_code} for {url}")
+            return None
+        return response.text
+
+
+class BrowserFetcher(PageFetcher):
+    """以 Selenium 渲染頁面，用於需要 JavaScript 的網站"""
+    name = "selenium"
+
+    def fetch(self, crawler, url, validate_selector=None, wait_timeout=None):
+        try:
+            # 只有真正需要瀏覽器時才向 Driver 池租用
+            if not crawler.driver:
+                crawler.setup_driver()
+            crawler.wait_and_get(
+                url,
+                wait_selector=validate_selector,
+                wait_timeout=wait_timeout
+            )
+            return crawler.driver.page_source
+        except TimeoutException:
+            logger.error(f"等待頁面載入逾時: {url}")
+        except RetryError as retry_err:
+            last_exc = retry_err.last_attempt.exception() if retry_err.last_attempt else retry_err
+            logger.error(f"多次嘗試仍無法載入: {url} ({last_exc})")
+        except Exception as e:
+            logger.error(f"瀏覽器載入頁面時發生錯誤 {url}: {str(e)}")
+        return None
+
+
+def default_fetchers() -> List[PageFetcher]:
+    """預設先嘗試 HTTP，必要時才升級為瀏覽器"""
+    if settings.CRAWLER_HTTP_FIRST:
+        return [HttpFetcher(), BrowserFetcher()]
+    return [BrowserFetcher()]
+
+
 class BaseCrawler(ABC):
+    ad_texts: List[str] = []  # 來源專屬的廣告文字，子類可以覆寫
+
+    def __init_subclass__(cls, **kwargs):
+        """子類實作的 crawl_list / crawl_article 自動計入階段耗時"""
+        super().__init_subclass__(**kwargs)
+        for stage in ('crawl_list', 'crawl_article'):
+            method = cls.__dict__.get(stage)
+            if method is None or getattr(method, '__wrapped__', None):
+                continue
+            url_arg = method.__code__.co_varnames[1] if stage == 'crawl_article' else None
+            setattr(cls, stage, timed(stage, url_arg=url_arg)(method))
+
     def __init__(self):
         self.driver = None
         self.source_name = ""
         self.needs_javascript = True  # 預設需要 JavaScript，子類可以覆寫
+        self.fetchers = default_fetchers()
+        self.http_client: HttpClientFactory = http_client  # 依網域重用連線與 cookie
+        self.article_selector: Optional[str] = None  # 文章頁有效內容的 CSS selector
+        self._http_misses = 0  # HTTP 抓取連續未通過驗證的次數
+        self.known_urls: Optional[KnownUrlIndex] = None  # 已收錄網址，設定後會跳過這些文章
+        self.stop_on_known_page = settings.CRAWLER_STOP_ON_KNOWN_PAGE
+        self.content_cleaner = get_cleaner(self.ad_texts)  # 廣告文字預先編譯成單一正規表示式
+        self.html_parser = HtmlParser()
+        self.pages_visited = 0  # 本次執行發出的頁面請求數（含重試）
     
     def setup_driver(self, stealth_mode: bool = False):
-        """設置 Chrome Driver
+        """從共用的 Driver 池租用 Chrome Driver
 
         Args:
             stealth_mode: 是否啟用隱身模式（用於繞過 Cloudflare 等反爬蟲機制）
         """
         try:
-            chrome_options = webdriver.ChromeOptions()
-
-            # 基本設定
-            chrome_options.add_argument('--headless=new')  # 使用新版 headless 模式
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-
-            # 防偵測設定（用於繞過 Cloudflare）
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-
-            # 設定真實的 User-Agent
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-            # 效能優化
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-infobars')
-            chrome_options.add_argument('--disable-notifications')
-            chrome_options.add_argument('--disable-logging')
-            chrome_options.add_argument('--disable-software-rasterizer')
-            # 只在不需要 JavaScript 時才禁用
-            if not self.needs_javascript:
-                chrome_options.add_argument('--disable-javascript')
-
-            # 在隱身模式下不禁用圖片（有些網站會檢測）
-            if not stealth_mode:
-                chrome_options.add_argument('--blink-settings=imagesEnabled=false')  # 不載入圖片
-
-            # 記憶體優化
-            chrome_options.add_argument('--disable-features=site-per-process')
-            chrome_options.add_argument('--disable-features=TranslateUI')
-            chrome_options.add_argument('--disable-features=BlinkGenPropertyTrees')
-            
-            # 設定頁面載入策略，在慢速連線上更穩定
-            chrome_options.set_capability('pageLoadStrategy', 'eager')
-            
-            # 記錄設定
-            logger.info(f"Setting up Chrome driver with options: {chrome_options.arguments}")
-            
-            # 設定 Chrome 二進制檔案位置（若存在）
-            chrome_binary_location = settings.CHROME_BIN
-            if chrome_binary_location and os.path.exists(chrome_binary_location):
-                chrome_options.binary_location = chrome_binary_location
-                logger.info(f"Chrome binary location: {chrome_binary_location}")
-            else:
-                logger.warning(
-                    "Chrome binary not found at %s, falling back to system default",
-                    chrome_binary_location
-                )
-            
-            # 設定 ChromeDriver 路徑（若存在）
-            chromedriver_path = settings.CHROMEDRIVER_PATH
-            service = None
-            if chromedriver_path and os.path.exists(chromedriver_path):
-                logger.info(f"ChromeDriver path: {chromedriver_path}")
-                service = Service(executable_path=chromedriver_path)
-            else:
-                logger.warning(
-                    "ChromeDriver not found at %s, Selenium will try system PATH",
-                    chromedriver_path
-                )
-            
-            # 建立 WebDriver
-            if service:
-                self.driver = webdriver.Chrome(
-                    service=service,
-                    options=chrome_options
-                )
-            else:
-                self.driver = webdriver.Chrome(options=chrome_options)
-
-            # 隱藏 webdriver 屬性，繞過 Cloudflare 偵測
-            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                'source': '''
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    });
-                    Object.defineProperty(navigator, 'plugins', {
-                        get: () => [1, 2, 3, 4, 5]
-                    });
-                    Object.defineProperty(navigator, 'languages', {
-                        get: () => ['en-US', 'en']
-                    });
-                    window.chrome = {
-                        runtime: {}
-                    };
-                '''
-            })
-
-            # 設定較長的超時時間，提高在慢速環境的穩定性
-            self.driver.set_page_load_timeout(settings.CRAWLER_PAGE_LOAD_TIMEOUT)
-            self.driver.set_script_timeout(settings.CRAWLER_SCRIPT_TIMEOUT)
+            # 已持有 driver 時先歸還，避免重複呼叫時佔用多個瀏覽器
+            if self.driver:
+                driver_pool.release(self.driver)
+                self.driver = None
 
+            self.driver = driver_pool.acquire(
+                needs_javascript=self.needs_javascript,
+                stealth_mode=stealth_mode
+            )
             logger.info(f"{self.source_name} crawler driver setup completed")
-            
+
         except Exception as e:
             logger.error(f"Error setting up Chrome driver: {str(e)}", exc_info=True)
             raise
-    
+
     def cleanup(self):
-        """清理資源"""
+        """將 driver 歸還給 Driver 池，並記錄日期格式命中率"""
+        self.date_parser.log_stats()
         if self.driver:
             try:
-                self.driver.quit()
+                if isinstance(self.driver, PooledDriver):
+                    driver_pool.release(self.driver, broken=not self.driver.is_healthy())
+                else:
+                    # 子類自行建立的 driver 仍直接關閉
+                    self.driver.quit()
                 logger.info(f"{self.source_name} crawler cleanup completed")
             except Exception as e:
-                # 忽略關閉時的連接錯誤
-                if "Connection refused" not in str(e):
-                    logger.error(f"Error during cleanup: {str(e)}", exc_info=True)
+                logger.error(f"Error during cleanup: {str(e)}", exc_info=True)
             finally:
                 self.driver = None
     
@@ -155,7 +253,7 @@ class BaseCrawler(ABC):
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
         retry=retry_if_exception_type((TimeoutException, ConnectionError)),
-        before_sleep=before_sleep_log(logger, logging.WARNING)
+        before_sleep=_before_retry_sleep
     )
     def wait_and_get(
         self,
@@ -174,25 +272,22 @@ class BaseCrawler(ABC):
             wait_timeout: 自訂等待秒數，預設使用設定檔值
         """
         try:
-            # 加入隨機延遲
-            delay = random.uniform(
-                settings.CRAWLER_DELAY_MIN,
-                settings.CRAWLER_DELAY_MAX
-            )
-            time.sleep(delay)
-
-            self.driver.get(url)
-
+            with span('rate_limit'):
+                rate_limiter.acquire(url)
+            self.pages_visited += 1
             timeout = wait_timeout or settings.CRAWLER_WAIT_TIMEOUT
 
-            if wait_selector:
-                WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((wait_by, wait_selector))
-                )
-            else:
-                WebDriverWait(self.driver, timeout).until(
-                    lambda d: d.execute_script('return document.readyState') in ("complete", "interactive")
-                )
+            with observe(FETCH_SECONDS, source=self.source_name, method='selenium'), span('wait_and_get', url=url):
+                self.driver.get(resolve_url(url))
+
+                if wait_selector:
+                    WebDriverWait(self.driver, timeout).until(
+                        EC.presence_of_element_located((wait_by, wait_selector))
+                    )
+                else:
+                    WebDriverWait(self.driver, timeout).until(
+                        lambda d: d.execute_script('return document.readyState') in ("complete", "interactive")
+                    )
 
         except TimeoutException:
             logger.warning(f"Timeout loading URL: {url}")
@@ -209,6 +304,152 @@ class BaseCrawler(ABC):
             logger.error(f"Error loading page {url}: {str(e)}")
             raise
     
+    def http_get(self, url: str, **kwargs) -> requests.Response:
+        """透過網域共用的 session 發送 GET 請求（未指定 timeout 時使用 CRAWLER_TIMEOUT）"""
+        with span('rate_limit'):
+            rate_limiter.acquire(url)
+        self.pages_visited += 1
+        with observe(FETCH_SECONDS, source=self.source_name, method='requests'), span('http_get', url=url):
+            return self.http_client.session(url).get(resolve_url(url), **kwargs)
+
+    def fetch_page(
+        self,
+        url: str,
+        validate_selector: Optional[str] = None,
+        wait_timeout: Optional[int] = None
+    ) -> Optional[BeautifulSoup]:
+        """
+        依序嘗試各抓取策略取得頁面
+
+        HTTP 抓回的頁面若找不到 validate_selector，代表內容需要 JavaScript 渲染，
+        此時才升級為瀏覽器。同一爬蟲連續多次 HTTP 未通過驗證後，
+        本次執行會直接使用瀏覽器，避免每篇文章都多打一次請求。
+
+        Args:
+            url: 目標網址
+            validate_selector: 有效頁面必須包含的 CSS selector
+            wait_timeout: 瀏覽器等待元素出現的秒數
+
+        Returns:
+            解析後的 BeautifulSoup，全部策略失敗時回傳 None
+        """
+        for fetcher in self.fetchers:
+            is_http = isinstance(fetcher, HttpFetcher)
+            if is_http and self._http_misses >= settings.CRAWLER_HTTP_MISS_LIMIT:
+                continue
+
+            html = fetcher.fetch(self, url, validate_selector=validate_selector, wait_timeout=wait_timeout)
+            if not html:
+                continue
+
+            soup = self.parse_html(html)
+            if validate_selector and not soup.select_one(validate_selector):
+                logger.info(f"{fetcher.name} 取得的頁面缺少 {validate_selector}: {url}")
+                if is_http:
+                    self._http_misses += 1
+                    if self._http_misses == settings.CRAWLER_HTTP_MISS_LIMIT:
+                        logger.info(f"{self.source_name} 頁面需要 JavaScript，本次改用瀏覽器抓取")
+                continue
+
+            if is_http:
+                self._http_misses = 0
+            logger.debug(f"使用 {fetcher.name} 取得頁面: {url}")
+            return soup
+
+        logger.warning(f"無法取得頁面: {url}")
+        return None
+
+    def parse_html(self, html: str, container: Optional[str] = None) -> Optional[Tag]:
+        """
+        解析頁面，可只解析容器子樹
+
+        Args:
+            html: 頁面原始碼
+            container: 只需要頁面中這個 CSS selector 的內容時指定
+
+        Returns:
+            BeautifulSoup 或容器元素，參見 HtmlParser.parse
+        """
+        with observe(PARSE_SECONDS, source=self.source_name), span('parse'):
+            return self.html_parser.parse(html, container)
+
+    def parse_article(self, soup: BeautifulSoup, article_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """從已取得的文章頁面解析內容
+
+        子類實作此方法並設定 article_selector 後，crawl_articles 即可並行抓取文章。
+        """
+        raise NotImplementedError
+
+    @property
+    def supports_async_fetch(self) -> bool:
+        """是否可使用非同步並行抓取文章"""
+        return (
+            settings.CRAWLER_HTTP_FIRST
+            and type(self).parse_article is not BaseCrawler.parse_article
+            and self._http_misses < settings.CRAWLER_HTTP_MISS_LIMIT
+        )
+
+    async def crawl_articles(self, article_infos: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        並行爬取多篇文章
+
+        先以 AsyncFetcher 並行抓取所有文章頁，通過 article_selector 驗證的直接交給
+        parse_article 解析；其餘文章改走 crawl_article（可能升級為瀏覽器）。
+
+        Args:
+            article_infos: crawl_list 回傳的文章資訊
+
+        Returns:
+            與 article_infos 順序相同的文章資料，失敗者為 None
+        """
+        if not self.supports_async_fetch:
+            return [await self.crawl_article(info) for info in article_infos]
+
+        from app.services.crawler.async_fetcher import AsyncFetcher
+
+        with span('fetch_all'):
+            async with AsyncFetcher(source=self.source_name) as fetcher:
+                pages = await fetcher.fetch_all([info.get('url') for info in article_infos])
+        self.pages_visited += len(article_infos)
+
+        results = []
+        for info, html in zip(article_infos, pages):
+            soup = self.parse_html(html)
+            if soup and (not self.article_selector or soup.select_one(self.article_selector)):
+                try:
+                    results.append(self.parse_article(soup, info))
+                except Exception as e:
+                    logger.error(f"解析文章失敗 {info.get('url')}: {str(e)}", exc_info=True)
+                    results.append(None)
+            else:
+                results.append(await self.crawl_article(info))
+
+        logger.info(f"{self.source_name} 並行爬取 {len(article_infos)} 篇文章完成")
+        return results
+
+    def skip_known(self, article_infos: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        過濾已收錄的文章
+
+        Args:
+            article_infos: crawl_list 回傳的文章資訊
+
+        Returns:
+            (尚未收錄的文章, 是否應停止翻頁)；整頁皆已收錄且啟用 stop_on_known_page 時停止
+        """
+        if self.known_urls is None or not article_infos:
+            return article_infos, False
+
+        new_infos = [info for info in article_infos if info.get('url') not in self.known_urls]
+        skipped = len(article_infos) - len(new_infos)
+        if skipped:
+            logger.info(f"{self.source_name} 跳過 {skipped} 篇已收錄的文章")
+
+        stop = self.stop_on_known_page and not new_infos
+        if stop:
+            logger.info(f"{self.source_name} 本頁文章皆已收錄，停止翻頁")
+        return new_infos, stop
+
     def parse_date_range(self, start_date: Optional[str], end_date: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
         """解析日期範圍"""
         start_datetime = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
@@ -225,8 +466,12 @@ class BaseCrawler(ABC):
             return False
         return True
 
-    @staticmethod
-    def parse_flexible_date(date_text: str) -> Optional[datetime]:
+    @property
+    def date_parser(self) -> DateParser:
+        """此來源共用的日期解析器（source_name 由子類在建構時設定，因此延後取得）"""
+        return get_date_parser(self.source_name)
+
+    def parse_flexible_date(self, date_text: str) -> Optional[datetime]:
         """
         統一的日期解析邏輯，支援多種日期格式
 
@@ -236,91 +481,20 @@ class BaseCrawler(ABC):
         Returns:
             datetime 物件或 None
         """
-        if not date_text:
-            return None
-
-        # 清理日期文字
-        date_text = date_text.strip()
-
-        # 移除可能的干擾文字
-        for remove_text in ["|", "Updated", "發布", "更新"]:
-            if remove_text in date_text:
-                date_text = date_text.split(remove_text)[0].strip()
-
-        # 嘗試多種日期格式
-        date_formats = [
-            '%Y-%m-%d %H:%M:%S',  # 2025-01-01 12:00:00
-            '%Y-%m-%d %H:%M',     # 2025-01-01 12:00
-            '%Y-%m-%d',           # 2025-01-01
-            '%Y/%m/%d %H:%M:%S',  # 2025/01/01 12:00:00
-            '%Y/%m/%d %H:%M',     # 2025/01/01 12:00
-            '%Y/%m/%d',           # 2025/01/01
-            '%d %b %Y',           # 01 Jan 2025
-            '%B %d, %Y',          # January 01, 2025
-            '%b %d, %Y',          # Jan 01, 2025
-            '%d/%m/%Y',           # 01/01/2025
-            '%m/%d/%Y',           # 01/01/2025
-        ]
-
-        for date_format in date_formats:
-            try:
-                return datetime.strptime(date_text, date_format)
-            except ValueError:
-                continue
+        return self.date_parser.parse(date_text)
 
-        logger.warning(f"無法解析日期: {date_text}")
-        return None
-
-    @staticmethod
-    def clean_content(content: str, ad_texts: List[str] = None) -> str:
+    def clean_content(self, content: str) -> str:
         """
-        統一的內容清理邏輯
+        統一的內容清理邏輯，廣告文字由類別屬性 ad_texts 指定
 
         Args:
             content: 原始內容
-            ad_texts: 要移除的廣告文字列表
 
         Returns:
             清理後的內容
         """
-        import re
-
-        if not content:
-            return ""
-
-        # 預設廣告文字
-        default_ads = [
-            "不用抽 不用搶 現在用APP看新聞 保證天天中獎",
-            "點我下載APP",
-            "按我看活動辦法",
-            "請繼續往下閱讀...",
-            "Subscribe to our Telegram channel",
-            "Click to subscribe",
-            "Follow us on",
-            "For the latest property news",
-        ]
-
-        ad_texts = ad_texts or []
-        all_ads = default_ads + ad_texts
-
-        # 移除廣告文字
-        for ad in all_ads:
-            content = content.replace(ad, "")
-
-        # 移除多餘的空白行
-        lines = [line.strip() for line in content.split('\n')]
-        lines = [line for line in lines if line]
-
-        # 移除重複的行
-        lines = list(dict.fromkeys(lines))
-
-        # 重新組合內容
-        content = '\n'.join(lines)
-
-        # 移除連續的空格
-        content = re.sub(r'\s+', ' ', content).strip()
-
-        return content
+        with span('clean_content'):
+            return self.content_cleaner.clean(content)
     
     @abstractmethod
     async def crawl_list(self, page: int = 1) -> list:
@@ -333,17 +507,13 @@ class BaseCrawler(ABC):
         pass
     
     async def run(self, max_pages=None, start_date=None, end_date=None):
-        """執行爬蟲"""
+        """執行爬蟲（瀏覽器由 BrowserFetcher 在第一次需要時才租用）"""
         try:
-            self.setup_driver()
             articles = []
             page = 1
             
             while True:
-                # 在請求之間加入隨機延遲
-                time.sleep(random.uniform(1, 3))
-                
-                # 爬取當前頁面的文章列表
+                # 爬取當前頁面的文章列表（請求速率由 rate_limiter 控制）
                 page_articles = await self.crawl_list(page)
                 if not page_articles:
                     break
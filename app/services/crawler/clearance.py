@@ -0,0 +1,200 @@
+"""
+Cloudflare clearance 存放
+通過 Cloudflare challenge 後取得的 cookie（cf_clearance 等）與 User-Agent 存放在本機檔案，
+在過期前由 HTTP session（cloudscraper）與瀏覽器共用，同一網域只需要解一次 challenge。
+
+cf_clearance 與 User-Agent 綁定，套用時會一併設定 User-Agent；
+無法變更 User-Agent 的瀏覽器（共用的 Driver 池）只在 User-Agent 相同時套用。
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLEARANCE_COOKIE = 'cf_clearance'
+
+# 仍停留在 challenge 頁面的特徵
+CHALLENGE_MARKERS = ('checking your browser', '<title>just a moment', 'cf_chl_opt')
+
+
+def is_challenge(html: Optional[str]) -> bool:
+    """頁面是否為 Cloudflare challenge"""
+    if not html:
+        return False
+    lowered = html.lower()
+    return any(marker in lowered for marker in CHALLENGE_MARKERS)
+
+
+def _is_cloudflare_cookie(name: str) -> bool:
+    return name.startswith('cf_') or name.startswith('__cf')
+
+
+class ClearanceStore:
+    """每個網域一個 clearance 檔案，跨行程與跨次執行共用直到過期
+
+    clearance 格式：{'host', 'user_agent', 'cookies': [{name, value, domain, path, expires, secure}], 'expires_at'}
+    """
+
+    def __init__(self, state_dir: Optional[str] = None, ttl: Optional[float] = None):
+        self.state_dir = state_dir or settings.CRAWLER_CLEARANCE_DIR
+        self.ttl = ttl or settings.CRAWLER_CLEARANCE_TTL
+        self._lock = threading.Lock()
+        # 無法使用檔案時退回行程內的狀態
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            self._use_files = True
+        except OSError as e:
+            logger.warning(f"Clearance state dir unavailable ({self.state_dir}): {str(e)}, using in-process store")
+            self._use_files = False
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlparse(url).netloc or url
+
+    def _path(self, host: str) -> str:
+        return os.path.join(self.state_dir, f"{host}.json")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """取得未過期的 clearance，不存在或已過期時回傳 None"""
+        host = self.host(url)
+        now = time.time()
+        with self._lock:
+            clearance = self._memory.get(host)
+        if clearance and clearance['expires_at'] > now:
+            return clearance
+
+        # 其他行程可能已取得新的 clearance
+        clearance = None
+        if self._use_files:
+            try:
+                with open(self._path(host), encoding='utf-8') as f:
+                    clearance = json.load(f)
+            except (OSError, ValueError):
+                clearance = None
+        with self._lock:
+            if not clearance or clearance.get('expires_at', 0) <= now:
+                self._memory.pop(host, None)
+                return None
+            self._memory[host] = clearance
+        return clearance
+
+    def save(self, url: str, cookies: List[Dict[str, Any]], user_agent: str) -> Optional[Dict[str, Any]]:
+        """儲存 clearance，cookie 中沒有 cf_clearance 時不儲存
+
+        有效期限取 TTL 與 cf_clearance cookie 到期時間較早者。
+        """
+        cookies = [cookie for cookie in cookies if _is_cloudflare_cookie(cookie['name'])]
+        clearance_cookie = next((c for c in cookies if c['name'] == CLEARANCE_COOKIE), None)
+        if not clearance_cookie or not user_agent:
+            return None
+
+        expires_at = time.time() + self.ttl
+        if clearance_cookie.get('expires'):
+            expires_at = min(expires_at, float(clearance_cookie['expires']))
+        host = self.host(url)
+        clearance = {'host': host, 'user_agent': user_agent, 'cookies': cookies, 'expires_at': expires_at}
+
+        with self._lock:
+            previous = self._memory.get(host)
+            if previous and previous['cookies'] == cookies and previous['user_agent'] == user_agent:
+                # 沒有變動時沿用原本的物件，已套用的 session 不必重新設定
+                return previous
+            self._memory[host] = clearance
+
+        if self._use_files:
+            path = self._path(host)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(clearance, f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"無法寫入 clearance {host}: {str(e)}")
+        logger.info(f"已儲存 {host} 的 Cloudflare clearance，{expires_at - time.time():.0f} 秒後過期")
+        return clearance
+
+    def invalidate(self, url: str):
+        """clearance 失效（仍遇到 challenge 或 403）時移除"""
+        host = self.host(url)
+        with self._lock:
+            self._memory.pop(host, None)
+        if self._use_files:
+            try:
+                os.remove(self._path(host))
+            except OSError:
+                pass
+
+    # 與 session / 瀏覽器之間的轉換
+
+    @staticmethod
+    def session_cookies(session: requests.Session) -> List[Dict[str, Any]]:
+        return [
+            {
+                'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain,
+                'path': cookie.path, 'expires': cookie.expires, 'secure': bool(cookie.secure),
+            }
+            for cookie in session.cookies
+        ]
+
+    @staticmethod
+    def driver_cookies(driver) -> List[Dict[str, Any]]:
+        return [
+            {
+                'name': cookie['name'], 'value': cookie['value'], 'domain': cookie.get('domain', ''),
+                'path': cookie.get('path', '/'), 'expires': cookie.get('expiry'), 'secure': bool(cookie.get('secure')),
+            }
+            for cookie in driver.get_cookies()
+        ]
+
+    @staticmethod
+    def apply_to_session(session: requests.Session, clearance: Dict[str, Any]):
+        """將 clearance 的 cookie 與 User-Agent 設定到 session"""
+        for cookie in clearance['cookies']:
+            session.cookies.set(
+                cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie.get('path') or '/'
+            )
+        session.headers['User-Agent'] = clearance['user_agent']
+
+    @staticmethod
+    def apply_to_driver(driver, clearance: Dict[str, Any], override_user_agent: bool = True) -> bool:
+        """透過 DevTools 將 clearance 設定到瀏覽器（不需先開啟該網域的頁面）
+
+        Args:
+            driver: Chrome WebDriver
+            clearance: 要套用的 clearance
+            override_user_agent: 是否改用 clearance 的 User-Agent；為 False 時
+                只在瀏覽器的 User-Agent 相同時套用
+
+        Returns:
+            是否已套用
+        """
+        try:
+            if override_user_agent:
+                driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': clearance['user_agent']})
+            elif driver.execute_script('return navigator.userAgent') != clearance['user_agent']:
+                return False
+            for cookie in clearance['cookies']:
+                params = {
+                    'name': cookie['name'], 'value': cookie['value'], 'domain': cookie['domain'],
+                    'path': cookie.get('path') or '/', 'secure': cookie.get('secure', False),
+                }
+                if cookie.get('expires'):
+                    params['expires'] = cookie['expires']
+                driver.execute_cdp_cmd('Network.setCookie', params)
+            return True
+        except Exception as e:
+            logger.warning(f"無法將 clearance 設定到瀏覽器: {str(e)}")
+            return False
+
+
+clearance_store = ClearanceStore()
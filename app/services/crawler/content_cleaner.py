@@ -0,0 +1,76 @@
+"""
+文章內容清理
+將各來源的廣告文字編譯成單一的交替式正規表示式，
+清理時只需掃描一次內容即可移除所有廣告，不必對每段廣告文字各做一次 str.replace。
+相同的廣告列表共用同一個已編譯的清理器。
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+# 所有來源共用的廣告文字
+DEFAULT_AD_TEXTS = (
+    "不用抽 不用搶 現在用APP看新聞 保證天天中獎",
+    "點我下載APP",
+    "按我看活動辦法",
+    "請繼續往下閱讀...",
+    "Subscribe to our Telegram channel",
+    "Click to subscribe",
+    "Follow us on",
+    "For the latest property news",
+)
+
+
+class ContentCleaner:
+    """移除廣告文字、空白行、重複行並壓縮空白"""
+
+    def __init__(self, ad_texts: Iterable[str] = ()):
+        # 長字串優先，避免較短的廣告文字先命中而留下殘段
+        ads = sorted({ad for ad in ad_texts if ad}, key=len, reverse=True)
+        self.ad_texts: Tuple[str, ...] = tuple(ads)
+        self._pattern: Optional[re.Pattern] = (
+            re.compile('|'.join(re.escape(ad) for ad in ads)) if ads else None
+        )
+
+    def remove_ads(self, content: Optional[str]) -> str:
+        """只移除廣告文字，保留原有的換行與空白"""
+        if not content:
+            return ""
+        if self._pattern is None:
+            return content
+        return self._pattern.sub('', content)
+
+    def clean(self, content: Optional[str]) -> str:
+        """清理文章內容
+
+        Args:
+            content: 原始內容
+
+        Returns:
+            清理後的內容，所有空白（含換行）壓縮為單一空格
+        """
+        if not content:
+            return ""
+
+        content = self.remove_ads(content)
+
+        # 去除首尾空白後以 dict 保留順序去重，空白行一併移除
+        lines = dict.fromkeys(line.strip() for line in content.split('\n'))
+        lines.pop('', None)
+
+        # 等同於 re.sub(r'\s+', ' ', ...).strip()
+        return ' '.join(' '.join(lines).split())
+
+
+@lru_cache(maxsize=64)
+def _cached_cleaner(ad_texts: Tuple[str, ...]) -> ContentCleaner:
+    return ContentCleaner(ad_texts)
+
+
+def get_cleaner(ad_texts: Iterable[str] = ()) -> ContentCleaner:
+    """取得包含預設廣告文字的清理器，相同的廣告列表只編譯一次
+
+    Args:
+        ad_texts: 來源專屬的廣告文字
+    """
+    return _cached_cleaner(tuple(sorted(set(DEFAULT_AD_TEXTS).union(ad_texts))))
@@ -0,0 +1,215 @@
+"""
+日期解析
+常見格式（ISO、YYYY/MM/DD、英文與馬來文月份名稱）以單一正規表示式比對後直接建立 datetime，
+不需逐一嘗試 strptime 並依賴例外處理；其餘格式才退回 strptime，
+且優先嘗試該來源上次成功的格式。每種格式的命中次數會累計，可用來檢視命中率。
+"""
+import logging
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 月份名稱對應表（英文、馬來文；比對時不分大小寫）
+MONTHS = {
+    'jan': 1, 'january': 1, 'januari': 1,
+    'feb': 2, 'february': 2, 'februari': 2,
+    'mar': 3, 'march': 3, 'mac': 3,
+    'apr': 4, 'april': 4,
+    'may': 5, 'mei': 5,
+    'jun': 6, 'june': 6,
+    'jul': 7, 'july': 7, 'julai': 7,
+    'aug': 8, 'august': 8, 'ogos': 8,
+    'sep': 9, 'sept': 9, 'september': 9,
+    'oct': 10, 'october': 10, 'okt': 10, 'oktober': 10,
+    'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12, 'dis': 12, 'disember': 12,
+}
+
+# strptime 備援格式，順序即未命中快取時的嘗試順序
+DEFAULT_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',  # 2025-01-01 12:00:00
+    '%Y-%m-%d %H:%M',     # 2025-01-01 12:00
+    '%Y-%m-%d',           # 2025-01-01
+    '%Y/%m/%d %H:%M:%S',  # 2025/01/01 12:00:00
+    '%Y/%m/%d %H:%M',     # 2025/01/01 12:00
+    '%Y/%m/%d',           # 2025/01/01
+    '%d %b %Y',           # 01 Jan 2025
+    '%B %d, %Y',          # January 01, 2025
+    '%b %d, %Y',          # Jan 01, 2025
+    '%d/%m/%Y',           # 01/01/2025
+    '%m/%d/%Y',           # 01/01/2025
+)
+
+# 日期後方常見的干擾文字，遇到時只取前半部分
+NOISE_MARKERS = ("|", "Updated", "發布", "更新")
+
+_TIME = r'(?:\s*[@,T]?\s*(\d{1,2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?\s*([AaPp][Mm])?)?'
+# 2025-01-01、2025/1/1、2025-01-01T12:00:00
+NUMERIC_DATE = re.compile(r'(\d{4})[-/](\d{1,2})[-/](\d{1,2})' + _TIME)
+# 5 Mei 2025、01 Jan 2025 17:04 PM
+DAY_MONTH_YEAR = re.compile(r'(\d{1,2})\s+([A-Za-z]+)\.?,?\s+(\d{4})' + _TIME)
+# Mei 5, 2025 @ 3:45pm、January 01, 2025
+MONTH_DAY_YEAR = re.compile(r'([A-Za-z]+)\.?\s+(\d{1,2}),?\s+(\d{4})' + _TIME)
+# 開頭的星期（英文、馬來文），例如 "Monday, "、"Isnin, "
+WEEKDAY_PREFIX = re.compile(
+    r'^(?:[A-Za-z]+day|Isnin|Selasa|Rabu|Khamis|Jumaat|Sabtu|Ahad),\s*', re.IGNORECASE
+)
+
+
+def _build(year: str, month: int, day: str, time_groups: Tuple[Optional[str], ...]) -> Optional[datetime]:
+    """由比對結果建立 datetime，數值不合法時回傳 None"""
+    hour, minute, second, meridiem = time_groups
+    h = int(hour) if hour else 0
+    if meridiem and h <= 12:
+        # 12 小時制；"17:04 PM" 之類已是 24 小時制的寫法維持原值
+        h = h % 12 + (12 if meridiem.lower() == 'pm' else 0)
+    try:
+        return datetime(int(year), month, int(day), h, int(minute or 0), int(second or 0))
+    except ValueError:
+        return None
+
+
+def _parse_numeric(match: re.Match) -> Optional[datetime]:
+    year, month, day = match.group(1, 2, 3)
+    return _build(year, int(month), day, match.group(4, 5, 6, 7))
+
+
+def _parse_day_month(match: re.Match) -> Optional[datetime]:
+    day, month_name, year = match.group(1, 2, 3)
+    month = MONTHS.get(month_name.lower())
+    return _build(year, month, day, match.group(4, 5, 6, 7)) if month else None
+
+
+def _parse_month_day(match: re.Match) -> Optional[datetime]:
+    month_name, day, year = match.group(1, 2, 3)
+    month = MONTHS.get(month_name.lower())
+    return _build(year, month, day, match.group(4, 5, 6, 7)) if month else None
+
+
+# 快速路徑：(統計名稱, 正規表示式, 建立函式)
+FAST_PATHS = (
+    ('iso', NUMERIC_DATE, _parse_numeric),
+    ('day_month_year', DAY_MONTH_YEAR, _parse_day_month),
+    ('month_day_year', MONTH_DAY_YEAR, _parse_month_day),
+)
+
+
+class DateParser:
+    """單一來源的日期解析器
+
+    快速路徑未命中時，strptime 格式會從上次成功的格式開始嘗試；
+    同一來源的日期格式通常固定，列表頁的每一列幾乎都只需一次嘗試。
+    與較前面的格式有歧義的格式不會提前，同一字串的解析結果不受先前輸入影響。
+    """
+
+    def __init__(self, source: str = "", formats: Iterable[str] = DEFAULT_FORMATS):
+        self.source = source
+        self.formats: Tuple[str, ...] = tuple(formats)
+        self.last_format: Optional[str] = None
+        # 與較前面的格式可能比對到同一個字串（例如 %d/%m/%Y 與 %m/%d/%Y）時不提前，
+        # 否則結果會受先前解析過的日期影響
+        self._ambiguous = self._ambiguous_formats(self.formats)
+        self.hits: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(date_text: str) -> str:
+        """移除首尾空白、干擾文字與開頭的星期"""
+        date_text = date_text.strip()
+        for marker in NOISE_MARKERS:
+            if marker in date_text:
+                date_text = date_text.split(marker)[0].strip()
+        return WEEKDAY_PREFIX.sub('', date_text)
+
+    def parse(self, date_text: Optional[str]) -> Optional[datetime]:
+        """解析日期文字
+
+        Args:
+            date_text: 日期文字
+
+        Returns:
+            datetime 物件，無法解析時回傳 None
+        """
+        if not date_text:
+            return None
+
+        text = self.normalize(date_text)
+
+        # 依第一個字元決定要嘗試的快速路徑，避免對每個字串跑所有正規表示式
+        if text[:1].isdigit():
+            paths = FAST_PATHS[:2]
+        else:
+            paths = FAST_PATHS[2:]
+        for name, pattern, build in paths:
+            match = pattern.fullmatch(text)
+            if match:
+                result = build(match)
+                if result is not None:
+                    self._record(name)
+                    return result
+
+        for date_format in self._format_order():
+            try:
+                result = datetime.strptime(text, date_format)
+            except ValueError:
+                continue
+            if date_format not in self._ambiguous:
+                self.last_format = date_format
+            self._record(date_format)
+            return result
+
+        self._record('failed')
+        logger.warning(f"無法解析日期: {date_text}")
+        return None
+
+    @staticmethod
+    def _ambiguous_formats(formats: Tuple[str, ...]) -> frozenset:
+        """日、月欄位互換後與較前面的格式相同的格式"""
+        seen = set()
+        ambiguous = set()
+        for date_format in formats:
+            shape = re.sub(r'%[dm]', '%N', date_format)
+            if shape in seen:
+                ambiguous.add(date_format)
+            seen.add(shape)
+        return frozenset(ambiguous)
+
+    def _format_order(self) -> Tuple[str, ...]:
+        last = self.last_format
+        if last is None or last == self.formats[0]:
+            return self.formats
+        return (last,) + tuple(f for f in self.formats if f != last)
+
+    def _record(self, key: str):
+        with self._lock:
+            self.hits[key] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """各格式的命中率（含 'failed'），依命中次數排序"""
+        with self._lock:
+            total = sum(self.hits.values())
+            return {key: count / total for key, count in self.hits.most_common()} if total else {}
+
+    def log_stats(self):
+        """將命中率寫入日誌"""
+        rates = self.stats()
+        if rates:
+            summary = ', '.join(f"{key}={rate:.1%}" for key, rate in rates.items())
+            logger.info(f"{self.source or 'default'} 日期格式命中率 ({sum(self.hits.values())} 筆): {summary}")
+
+
+_parsers: Dict[str, DateParser] = {}
+_parsers_lock = threading.Lock()
+
+
+def get_date_parser(source: str = "") -> DateParser:
+    """取得來源共用的日期解析器，格式快取與統計在同一行程內跨爬取保留"""
+    with _parsers_lock:
+        parser = _parsers.get(source)
+        if parser is None:
+            parser = _parsers[source] = DateParser(source)
+        return parser
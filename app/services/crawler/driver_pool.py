@@ -0,0 +1,317 @@
+"""
+WebDriver 池
+讓所有爬蟲共用一組 Chrome Driver，避免每個爬蟲各自冷啟動瀏覽器
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (needs_javascript, stealth_mode)，不同設定的 driver 不可混用
+DriverKey = Tuple[bool, bool]
+
+
+def create_chrome_driver(needs_javascript: bool = True, stealth_mode: bool = False):
+    """建立 Chrome Driver
+
+    Args:
+        needs_javascript: 是否需要 JavaScript
+        stealth_mode: 是否啟用隱身模式（用於繞過 Cloudflare 等反爬蟲機制）
+    """
+    chrome_options = webdriver.ChromeOptions()
+
+    # 基本設定
+    chrome_options.add_argument('--headless=new')  # 使用新版 headless 模式
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+
+    # 防偵測設定（用於繞過 Cloudflare）
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    # 設定真實的 User-Agent
+    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+    # 效能優化
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-infobars')
+    chrome_options.add_argument('--disable-notifications')
+    chrome_options.add_argument('--disable-logging')
+    chrome_options.add_argument('--disable-software-rasterizer')
+    # 只在不需要 JavaScript 時才禁用
+    if not needs_javascript:
+        chrome_options.add_argument('--disable-javascript')
+
+    # 在隱身模式下不禁用圖片（有些網站會檢測）
+    if not stealth_mode:
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')  # 不載入圖片
+
+    # 記憶體優化
+    chrome_options.add_argument('--disable-features=site-per-process')
+    chrome_options.add_argument('--disable-features=TranslateUI')
+    chrome_options.add_argument('--disable-features=BlinkGenPropertyTrees')
+
+    # 設定頁面載入策略，在慢速連線上更穩定
+    chrome_options.set_capability('pageLoadStrategy', 'eager')
+
+    # 記錄設定
+    logger.info(f"Setting up Chrome driver with options: {chrome_options.arguments}")
+
+    # 設定 Chrome 二進制檔案位置（若存在）
+    chrome_binary_location = settings.CHROME_BIN
+    if chrome_binary_location and os.path.exists(chrome_binary_location):
+        chrome_options.binary_location = chrome_binary_location
+        logger.info(f"Chrome binary location: {chrome_binary_location}")
+    else:
+        logger.warning(
+            "Chrome binary not found at %s, falling back to system default",
+            chrome_binary_location
+        )
+
+    # 設定 ChromeDriver 路徑（若存在）
+    chromedriver_path = settings.CHROMEDRIVER_PATH
+    service = None
+    if chromedriver_path and os.path.exists(chromedriver_path):
+        logger.info(f"ChromeDriver path: {chromedriver_path}")
+        service = Service(executable_path=chromedriver_path)
+    else:
+        logger.warning(
+            "ChromeDriver not found at %s, Selenium will try system PATH",
+            chromedriver_path
+        )
+
+    # 建立 WebDriver
+    if service:
+        driver = webdriver.Chrome(
+            service=service,
+            options=chrome_options
+        )
+    else:
+        driver = webdriver.Chrome(options=chrome_options)
+
+    # 隱藏 webdriver 屬性，繞過 Cloudflare 偵測
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+        'source': '''
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            });
+            Object.defineProperty(navigator, 'plugins', {
+                get: () => [1, 2, 3, 4, 5]
+            });
+            Object.defineProperty(navigator, 'languages', {
+                get: () => ['en-US', 'en']
+            });
+            window.chrome = {
+                runtime: {}
+            };
+        '''
+    })
+
+    # 設定較長的超時時間，提高在慢速環境的穩定性
+    driver.set_page_load_timeout(settings.CRAWLER_PAGE_LOAD_TIMEOUT)
+    driver.set_script_timeout(settings.CRAWLER_SCRIPT_TIMEOUT)
+
+    return driver
+
+
+class PooledDriver:
+    """池化的 WebDriver 代理
+
+    行為與原本的 WebDriver 相同，額外記錄頁面載入次數，
+    讓池在達到上限時回收瀏覽器。
+    """
+
+    def __init__(self, driver, key: DriverKey):
+        self._driver = driver
+        self.key = key
+        self.page_loads = 0
+
+    def get(self, url: str):
+        self.page_loads += 1
+        return self._driver.get(url)
+
+    @property
+    def raw_driver(self):
+        """取得底層的 WebDriver"""
+        return self._driver
+
+    def is_healthy(self) -> bool:
+        """檢查瀏覽器是否仍可回應"""
+        try:
+            self._driver.execute_script('return 1')
+            return True
+        except Exception:
+            return False
+
+    def close_browser(self):
+        """關閉瀏覽器（僅供池內部使用）"""
+        try:
+            self._driver.quit()
+        except Exception as e:
+            # 忽略關閉時的連接錯誤
+            if "Connection refused" not in str(e):
+                logger.error(f"Error quitting pooled driver: {str(e)}")
+
+    def quit(self):
+        # 租用者不應直接關閉共用的瀏覽器，交由池處理
+        driver_pool.release(self)
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+class DriverPool:
+    """共用的 Chrome Driver 池
+
+    - 最多同時存在 max_size 個瀏覽器，限制記憶體峰值
+    - 租出前進行健康檢查，失效的瀏覽器會被替換
+    - 頁面載入次數達到 max_page_loads 或回報故障時回收
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        max_page_loads: Optional[int] = None,
+        acquire_timeout: Optional[int] = None,
+        driver_factory: Callable[..., object] = create_chrome_driver
+    ):
+        self.max_size = max_size or settings.CRAWLER_DRIVER_POOL_SIZE
+        self.max_page_loads = max_page_loads or settings.CRAWLER_DRIVER_MAX_PAGE_LOADS
+        self.acquire_timeout = acquire_timeout or settings.CRAWLER_DRIVER_ACQUIRE_TIMEOUT
+        self.driver_factory = driver_factory
+
+        self._condition = threading.Condition()
+        self._idle: Dict[DriverKey, List[PooledDriver]] = {}
+        self._leased: List[PooledDriver] = []
+
+    @property
+    def size(self) -> int:
+        """目前存在的瀏覽器數量"""
+        return len(self._leased) + sum(len(drivers) for drivers in self._idle.values())
+
+    def acquire(self, needs_javascript: bool = True, stealth_mode: bool = False) -> PooledDriver:
+        """租用一個 driver，池已滿時等待其他爬蟲歸還
+
+        Raises:
+            TimeoutError: 超過 acquire_timeout 仍無可用的 driver
+        """
+        key = (needs_javascript, stealth_mode)
+        deadline = time.monotonic() + self.acquire_timeout
+
+        while True:
+            to_close = None
+            with self._condition:
+                idle = self._idle.get(key)
+                if idle:
+                    driver = idle.pop()
+                    self._leased.append(driver)
+                    break
+
+                if self.size < self.max_size:
+                    # 預留位置，在鎖外啟動瀏覽器
+                    driver = None
+                    self._leased.append(None)
+                    break
+
+                # 池已滿但有其他設定的閒置 driver，關閉一個騰出位置
+                other_key = next((k for k, v in self._idle.items() if v), None)
+                if other_key is not None:
+                    to_close = self._idle[other_key].pop()
+                    driver = None
+                    self._leased.append(None)
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No WebDriver available after {self.acquire_timeout}s "
+                        f"(pool size: {self.max_size})"
+                    )
+                self._condition.wait(remaining)
+
+        if to_close:
+            to_close.close_browser()
+
+        if driver is not None:
+            if driver.is_healthy():
+                logger.debug(f"Reusing pooled driver (page loads: {driver.page_loads})")
+                return driver
+            logger.warning("Pooled driver failed health check, replacing it")
+            driver.close_browser()
+            with self._condition:
+                self._leased[self._leased.index(driver)] = None
+
+        return self._launch(key)
+
+    def _launch(self, key: DriverKey) -> PooledDriver:
+        """在已預留的位置上啟動新的瀏覽器"""
+        try:
+            raw_driver = self.driver_factory(needs_javascript=key[0], stealth_mode=key[1])
+        except Exception:
+            with self._condition:
+                self._leased.remove(None)
+                self._condition.notify()
+            raise
+
+        driver = PooledDriver(raw_driver, key)
+        with self._condition:
+            self._leased[self._leased.index(None)] = driver
+        logger.info(f"Launched pooled Chrome driver ({self.size}/{self.max_size})")
+        return driver
+
+    def release(self, driver: PooledDriver, broken: bool = False):
+        """歸還 driver
+
+        Args:
+            driver: 先前租用的 driver
+            broken: 租用者是否發現瀏覽器已故障
+        """
+        with self._condition:
+            if driver not in self._leased:
+                return
+            self._leased.remove(driver)
+
+            recycle = broken or driver.page_loads >= self.max_page_loads
+            if not recycle:
+                self._idle.setdefault(driver.key, []).append(driver)
+            self._condition.notify()
+
+        if recycle:
+            logger.info(f"Recycling pooled driver after {driver.page_loads} page loads")
+            driver.close_browser()
+
+    def shutdown(self):
+        """關閉所有閒置的瀏覽器"""
+        with self._condition:
+            idle = [driver for drivers in self._idle.values() for driver in drivers]
+            self._idle.clear()
+            self._condition.notify_all()
+
+        for driver in idle:
+            driver.close_browser()
+        if idle:
+            logger.info(f"Driver pool shut down, closed {len(idle)} idle drivers")
+
+    def _reset_after_fork(self):
+        """子行程不可沿用父行程的瀏覽器，清空狀態但不關閉它們"""
+        self._condition = threading.Condition()
+        self._idle = {}
+        self._leased = []
+
+
+driver_pool = DriverPool()
+atexit.register(driver_pool.shutdown)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=driver_pool._reset_after_fork)
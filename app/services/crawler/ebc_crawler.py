@@ -1,10 +1,11 @@
 from datetime import datetime
 from bs4 import BeautifulSoup
 import logging
+from app.core.metrics import FETCH_SECONDS, observe
 from .base import BaseCrawler
+from .rate_limiter import rate_limiter
 import time
 import asyncio
-import random
 from selenium import webdriver
 
 logger = logging.getLogger(__name__)
@@ -44,12 +45,14 @@ class EbcCrawler(BaseCrawler):
     async def get_page_source(self, url):
         """取得網頁原始碼"""
         try:
-            # 加入延遲，避免被偵測為爬蟲
-            await asyncio.sleep(random.uniform(2, 5))
+            # 依網域速率等待，避免被偵測為爬蟲
+            await rate_limiter.acquire_async(url)
+            self.pages_visited += 1
             
             # 使用 selenium 取得頁面
             async with self.get_driver() as driver:
-                await driver.get(url)
+                with observe(FETCH_SECONDS, source=self.source_name, method='selenium'):
+                    await driver.get(url)
                 
                 # 等待頁面載入
                 await asyncio.sleep(3)
@@ -71,7 +74,7 @@ class EbcCrawler(BaseCrawler):
             if not html:
                 return []
                 
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = self.parse_html(html)
             articles = []
             
             # 處理輪播區塊
@@ -99,7 +102,7 @@ class EbcCrawler(BaseCrawler):
             if not html:
                 return None
                 
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = self.parse_html(html)
             
             # 找文章內容
             content_block = soup.select_one('.article-content')
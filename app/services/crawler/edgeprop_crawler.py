@@ -2,16 +2,12 @@ from datetime import datetime
 from bs4 import BeautifulSoup
 import logging
 import time
-import re
-import random
 from typing import List, Optional, Dict, Any
-from .base import BaseCrawler
-
-try:
-    import cloudscraper
-    HAS_CLOUDSCRAPER = True
-except ImportError:
-    HAS_CLOUDSCRAPER = False
+from app.core.metrics import FETCH_SECONDS, observe
+from .base import BaseCrawler, resolve_url
+from .clearance import clearance_store, is_challenge
+from .http_client import HAS_CLOUDSCRAPER
+from .rate_limiter import rate_limiter
 
 try:
     import undetected_chromedriver as uc
@@ -22,6 +18,14 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 class EdgePropCrawler(BaseCrawler):
+    # 來源專屬的廣告文字，由 BaseCrawler 預先編譯
+    ad_texts = [
+        "Subscribe to our Telegram channel",
+        "Click to subscribe",
+        "Follow us on",
+        "For the latest property news",
+    ]
+
     def __init__(self):
         super().__init__()
         self.source_name = "EdgeProp Malaysia"
@@ -29,6 +33,8 @@ class EdgePropCrawler(BaseCrawler):
         self.news_url = f"{self.base_url}/news"
         self.needs_javascript = True  # 需要 JavaScript 來處理 Cloudflare
         self.uc_driver = None  # undetected chromedriver
+        self._browser_ready = False  # 已啟動瀏覽器（HTTP 取不到頁面時才啟動）
+        self._applied: Dict[str, Any] = {}  # 各 session / 瀏覽器最近套用的 clearance
 
     def setup_undetected_driver(self):
         """設置 undetected chromedriver 來繞過 Cloudflare"""
@@ -52,6 +58,15 @@ class EdgePropCrawler(BaseCrawler):
             logger.error(f"設定 undetected chromedriver 失敗: {str(e)}")
             return False
 
+    def setup_browser(self):
+        """啟動瀏覽器：優先使用 undetected chromedriver，失敗時使用 Driver 池"""
+        if self._browser_ready:
+            return
+        self._browser_ready = True
+        if not self.setup_undetected_driver():
+            self.setup_driver()
+        logger.info("Chrome Driver 設定完成")
+
     def cleanup(self):
         """清理資源"""
         super().cleanup()
@@ -61,17 +76,13 @@ class EdgePropCrawler(BaseCrawler):
             except:
                 pass
             self.uc_driver = None
+        self._browser_ready = False
+        self._applied.clear()
 
     async def crawl(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
         """執行爬蟲主程序"""
         try:
-            # 優先嘗試 undetected chromedriver
-            use_undetected = self.setup_undetected_driver()
-            if not use_undetected:
-                # 回退到普通 driver
-                self.setup_driver()
-            logger.info("Chrome Driver 設定完成")
-            
+            # 瀏覽器延後到 cloudscraper 取不到頁面時才啟動
             # 確保 start_date 和 end_date 是 datetime.date 物件
             if isinstance(start_date, str):
                 start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
@@ -92,6 +103,7 @@ class EdgePropCrawler(BaseCrawler):
                     break
                 
                 logger.info(f"從第 {page} 頁找到 {len(articles_list)} 篇文章")
+                articles_list, should_stop = self.skip_known(articles_list)
                 
                 # 處理每篇文章
                 for article_info in articles_list:
@@ -140,23 +152,26 @@ class EdgePropCrawler(BaseCrawler):
         finally:
             self.cleanup()
     
-    def _wait_for_cloudflare(self, max_wait: int = 15) -> bool:
+    def _wait_for_cloudflare(self, driver=None, max_wait: int = 15) -> bool:
         """等待 Cloudflare challenge 完成
 
         Args:
+            driver: 要檢查的瀏覽器，預設為 self.driver
             max_wait: 最大等待時間（秒）
 
         Returns:
             是否成功通過 Cloudflare
         """
+        driver = driver or self.driver
         start_time = time.time()
         while time.time() - start_time < max_wait:
-            page_source = self.driver.page_source.lower()
+            page_source = driver.page_source
             # 檢查是否還在 Cloudflare challenge 頁面
-            if 'checking your browser' in page_source or 'cloudflare' in page_source:
+            if is_challenge(page_source):
                 logger.info("等待 Cloudflare challenge 完成...")
-                time.sleep(2)
+                time.sleep(1)
                 continue
+            page_source = page_source.lower()
             # 檢查是否被封鎖
             if 'access denied' in page_source or '403 forbidden' in page_source:
                 logger.warning("被 Cloudflare 封鎖")
@@ -165,10 +180,95 @@ class EdgePropCrawler(BaseCrawler):
             if 'edgeprop' in page_source:
                 logger.info("成功通過 Cloudflare")
                 return True
-            time.sleep(1)
+            time.sleep(0.5)
         logger.warning(f"等待 Cloudflare 超時 ({max_wait}秒)")
         return False
 
+    def _apply_clearance(self, target: str, clearance: Optional[Dict[str, Any]], apply) -> None:
+        """clearance 有更新時才重新套用"""
+        if clearance and self._applied.get(target) is not clearance:
+            if apply(clearance) is not False:
+                self._applied[target] = clearance
+
+    def _fetch_with_scraper(self, url: str, clearance: Optional[Dict[str, Any]]) -> Optional[str]:
+        """以共用的 cloudscraper session 取得頁面，成功時保存 clearance"""
+        scraper = self.http_client.scraper(url)
+        self._apply_clearance('scraper', clearance, lambda c: clearance_store.apply_to_session(scraper, c))
+        try:
+            with observe(FETCH_SECONDS, source=self.source_name, method='cloudscraper'):
+                response = scraper.get(resolve_url(url), timeout=30)
+        except Exception as e:
+            logger.warning(f"cloudscraper 失敗: {str(e)}")
+            return None
+
+        if response.status_code == 200 and not is_challenge(response.text):
+            clearance_store.save(url, clearance_store.session_cookies(scraper), scraper.headers.get('User-Agent', ''))
+            return response.text
+        logger.warning(f"cloudscraper 請求失敗，狀態碼: {response.status_code}: {url}")
+        return None
+
+    def _fetch_with_browser(self, url: str, clearance: Optional[Dict[str, Any]]) -> Optional[str]:
+        """以瀏覽器取得頁面；先套用已保存的 clearance，通過 challenge 後保存新的 clearance"""
+        self.setup_browser()
+        if self.uc_driver:
+            driver, method = self.uc_driver, 'undetected'
+            # Driver 池的瀏覽器由其他爬蟲共用，不變更其 User-Agent
+            self._apply_clearance(method, clearance, lambda c: clearance_store.apply_to_driver(driver, c))
+        elif self.driver:
+            driver, method = self.driver, 'selenium'
+            self._apply_clearance(
+                method, clearance, lambda c: clearance_store.apply_to_driver(driver, c, override_user_agent=False)
+            )
+        else:
+            return None
+
+        try:
+            logger.info(f"使用 {method} 瀏覽器取得頁面")
+            # fetch_html 已做過速率等待與計數；不經過 wait_and_get，逾時時也不會清除剛設定的 clearance cookie
+            with observe(FETCH_SECONDS, source=self.source_name, method=method):
+                driver.get(resolve_url(url))
+
+            if not self._wait_for_cloudflare(driver):
+                logger.warning(f"無法通過 Cloudflare 保護: {url}")
+                return None
+
+            html_content = driver.page_source
+            clearance_store.save(
+                url, clearance_store.driver_cookies(driver), driver.execute_script('return navigator.userAgent')
+            )
+            return html_content
+        except Exception as e:
+            logger.warning(f"{method} 瀏覽器取得頁面失敗: {str(e)}")
+            return None
+
+    def fetch_html(self, url: str) -> Optional[str]:
+        """取得頁面 HTML
+
+        依序使用 cloudscraper 與瀏覽器。通過 Cloudflare 取得的 clearance 會保存到
+        clearance_store，在過期前由 cloudscraper 與瀏覽器共用，不必每頁重新解 challenge。
+
+        Returns:
+            頁面 HTML，全部失敗時回傳 None
+        """
+        # 依網域速率等待（cloudscraper 不經過 http_get）
+        rate_limiter.acquire(url)
+        self.pages_visited += 1
+
+        clearance = clearance_store.get(url)
+        if HAS_CLOUDSCRAPER:
+            html_content = self._fetch_with_scraper(url, clearance)
+            if html_content:
+                return html_content
+            if clearance:
+                # 帶著 clearance 仍被擋下，代表已失效
+                clearance_store.invalidate(url)
+                clearance = None
+
+        html_content = self._fetch_with_browser(url, clearance)
+        if not html_content and clearance:
+            clearance_store.invalidate(url)
+        return html_content
+
     async def crawl_list(self, page: int = 1) -> List[Dict[str, Any]]:
         """爬取文章列表頁 - 使用 cloudscraper 繞過 Cloudflare"""
         try:
@@ -182,69 +282,14 @@ class EdgePropCrawler(BaseCrawler):
 
             logger.info(f"正在訪問列表頁: {url}")
 
-            # 添加隨機延遲
-            time.sleep(random.uniform(1, 3))
-
-            # 優先使用 cloudscraper 繞過 Cloudflare
-            html_content = None
-            if HAS_CLOUDSCRAPER:
-                try:
-                    scraper = cloudscraper.create_scraper(
-                        browser={
-                            'browser': 'chrome',
-                            'platform': 'windows',
-                            'mobile': False
-                        }
-                    )
-                    response = scraper.get(url, timeout=30)
-                    if response.status_code == 200:
-                        html_content = response.text
-                        logger.info("使用 cloudscraper 成功獲取頁面")
-                    else:
-                        logger.warning(f"cloudscraper 請求失敗，狀態碼: {response.status_code}")
-                except Exception as e:
-                    logger.warning(f"cloudscraper 失敗: {str(e)}")
-
-            # 如果 cloudscraper 失敗，嘗試 undetected chromedriver
-            if not html_content and self.uc_driver:
-                try:
-                    logger.info("嘗試使用 undetected chromedriver")
-                    self.uc_driver.get(url)
-                    time.sleep(random.uniform(5, 8))  # 等待 Cloudflare challenge
-
-                    # 檢查是否通過
-                    page_source = self.uc_driver.page_source.lower()
-                    if 'edgeprop' in page_source and 'checking your browser' not in page_source:
-                        html_content = self.uc_driver.page_source
-                        logger.info("使用 undetected chromedriver 成功獲取頁面")
-                    else:
-                        logger.warning("undetected chromedriver 未能通過 Cloudflare")
-                except Exception as e:
-                    logger.warning(f"undetected chromedriver 失敗: {str(e)}")
-
-            # 如果以上都失敗，回退到普通 Selenium
+            html_content = self.fetch_html(url)
             if not html_content:
-                logger.info("回退到普通 Selenium 方式")
-                self.wait_and_get(url)
-
-                # 等待 Cloudflare challenge 完成
-                if not self._wait_for_cloudflare():
-                    logger.error("無法通過 Cloudflare 保護")
-                    return []
-
-                time.sleep(random.uniform(3, 5))
-                html_content = self.driver.page_source
+                logger.error("無法通過 Cloudflare 保護")
+                return []
 
-            # 解析頁面
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 找到文章列表容器 - 根據頁面類型選擇不同的選擇器
-            container = None
-            if page == 1:
-                container = soup.select_one('div.secondary')
-            else:
-                # 分頁頁面使用不同的容器選擇器
-                container = soup.select_one('div.wrap.news-page div.main-content')
+            # 只解析文章列表容器 - 分頁頁面使用不同的容器選擇器
+            container_selector = 'div.secondary' if page == 1 else 'div.wrap.news-page div.main-content'
+            container = self.parse_html(html_content, container_selector)
                 
             if not container:
                 logger.warning(f"找不到文章列表容器")
@@ -325,57 +370,12 @@ class EdgePropCrawler(BaseCrawler):
 
             logger.info(f"正在爬取文章: {url}")
 
-            # 添加隨機延遲
-            time.sleep(random.uniform(1, 3))
-
-            # 優先使用 cloudscraper
-            html_content = None
-            if HAS_CLOUDSCRAPER:
-                try:
-                    scraper = cloudscraper.create_scraper(
-                        browser={
-                            'browser': 'chrome',
-                            'platform': 'windows',
-                            'mobile': False
-                        }
-                    )
-                    response = scraper.get(url, timeout=30)
-                    if response.status_code == 200:
-                        html_content = response.text
-                        logger.info("使用 cloudscraper 成功獲取文章頁面")
-                    else:
-                        logger.warning(f"cloudscraper 請求文章失敗，狀態碼: {response.status_code}")
-                except Exception as e:
-                    logger.warning(f"cloudscraper 獲取文章失敗: {str(e)}")
-
-            # 如果 cloudscraper 失敗，嘗試 undetected chromedriver
-            if not html_content and self.uc_driver:
-                try:
-                    logger.info("嘗試使用 undetected chromedriver 獲取文章")
-                    self.uc_driver.get(url)
-                    time.sleep(random.uniform(3, 5))
-
-                    page_source = self.uc_driver.page_source.lower()
-                    if 'edgeprop' in page_source and 'checking your browser' not in page_source:
-                        html_content = self.uc_driver.page_source
-                        logger.info("使用 undetected chromedriver 成功獲取文章")
-                except Exception as e:
-                    logger.warning(f"undetected chromedriver 獲取文章失敗: {str(e)}")
-
-            # 如果以上都失敗，回退到普通 Selenium
+            html_content = self.fetch_html(url)
             if not html_content:
-                logger.info("回退到普通 Selenium 方式獲取文章")
-                self.wait_and_get(url)
-
-                # 等待 Cloudflare challenge 完成
-                if not self._wait_for_cloudflare():
-                    logger.warning(f"無法通過 Cloudflare 保護，跳過文章: {url}")
-                    return None
-
-                time.sleep(random.uniform(2, 4))
-                html_content = self.driver.page_source
+                logger.warning(f"無法取得文章，跳過: {url}")
+                return None
 
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.parse_html(html_content)
             
             # 提取標題
             title_element = soup.select_one('div#content-top h1')
@@ -388,37 +388,8 @@ class EdgePropCrawler(BaseCrawler):
                 date_text = date_element.text.strip()
                 logger.info(f"原始日期文本: {date_text}")
                 
-                # 如果日期包含 "|" 或 "Updated"，只取前半部分
-                if "|" in date_text:
-                    date_text = date_text.split("|")[0].strip()
-                
-                # 移除可能的 "Updated X days ago" 部分
-                if "Updated" in date_text:
-                    date_text = date_text.split("Updated")[0].strip()
-                
-                logger.info(f"處理後的日期文本: {date_text}")
-                
-                # 嘗試多種日期格式
-                date_formats = [
-                    '%d %b %Y',     # 01 Jan 2025
-                    '%B %d, %Y',    # January 01, 2025
-                    '%b %d, %Y',    # Jan 01, 2025
-                    '%Y-%m-%d',     # 2025-01-01
-                    '%d/%m/%Y',     # 01/01/2025
-                    '%m/%d/%Y'      # 01/01/2025
-                ]
-                
-                for date_format in date_formats:
-                    try:
-                        published_at = datetime.strptime(date_text, date_format)
-                        logger.info(f"成功解析日期: {published_at}, 使用格式: {date_format}")
-                        break
-                    except ValueError:
-                        continue
-                
-                if not published_at:
-                    logger.warning(f"無法解析日期: {date_text}")
-                    published_at = datetime.now()
+                # 移除 "|"、"Updated X days ago" 等干擾文字後解析
+                published_at = self.parse_flexible_date(date_text) or datetime.now()
             else:
                 logger.warning(f"找不到日期元素")
                 published_at = datetime.now()
@@ -462,7 +433,7 @@ class EdgePropCrawler(BaseCrawler):
                 # 提取文本內容
                 content = content_element.text.strip()
                 # 清理內容
-                content = self._clean_content(content)
+                content = self.clean_content(content)
                 logger.info(f"成功提取文章內容，長度: {len(content)} 字符")
             else:
                 logger.warning("無法找到文章內容元素")
@@ -474,7 +445,7 @@ class EdgePropCrawler(BaseCrawler):
                 
                 if paragraphs:
                     content = '\n\n'.join(paragraphs)
-                    content = self._clean_content(content)
+                    content = self.clean_content(content)
                     logger.info(f"使用備用方法提取段落，共 {len(paragraphs)} 段，長度: {len(content)} 字符")
                 # 如果仍然沒有內容，嘗試更通用的方法
                 if not content:
@@ -494,7 +465,7 @@ class EdgePropCrawler(BaseCrawler):
                     
                     if all_text_blocks:
                         content = '\n\n'.join(all_text_blocks)
-                        content = self._clean_content(content)
+                        content = self.clean_content(content)
                         logger.info(f"使用通用方法提取內容，長度: {len(content)} 字符")
             
             # 提取描述（如果有meta描述，否則使用內容的前200字）
@@ -521,31 +492,3 @@ class EdgePropCrawler(BaseCrawler):
             import traceback
             logger.error(traceback.format_exc())
             return None
-    
-    def _clean_content(self, content: str) -> str:
-        """清理文章內容"""
-        # 移除多餘的空白行
-        lines = [line.strip() for line in content.split('\n')]
-        lines = [line for line in lines if line]
-        
-        # 移除重複的行
-        lines = list(dict.fromkeys(lines))
-        
-        # 重新組合內容
-        content = '\n'.join(lines)
-        
-        # 移除連續的空格
-        content = re.sub(r'\s+', ' ', content).strip()
-        
-        # 移除常見的廣告文字或不需要的內容（根據實際情況調整）
-        ad_texts = [
-            "Subscribe to our Telegram channel",
-            "Click to subscribe",
-            "Follow us on",
-            "For the latest property news"
-        ]
-        
-        for ad in ad_texts:
-            content = content.replace(ad, "")
-        
-        return content
\ No newline at end of file
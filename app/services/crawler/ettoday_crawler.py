@@ -2,8 +2,6 @@ from datetime import datetime
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import logging
-from selenium.common.exceptions import TimeoutException
-from tenacity import RetryError
 from .base import BaseCrawler
 import time
 
@@ -31,41 +29,17 @@ class EttodayCrawler(BaseCrawler):
 
         return not parsed.netloc.endswith(self.allowed_domain)
 
-    async def get_page_source(self, url, wait_selector=None, wait_timeout=None):
-        """使用 Selenium 獲取頁面內容"""
-        try:
-            logger.debug(f"正在訪問頁面: {url}")
-            self.wait_and_get(
-                url,
-                wait_selector=wait_selector,
-                wait_timeout=wait_timeout
-            )
-            # 再稍微等待，確保動態內容渲染完畢
-            time.sleep(1)
-            return self.driver.page_source
-        except TimeoutException:
-            logger.error(f"等待頁面載入逾時: {url}")
-            return None
-        except RetryError as retry_err:
-            last_exc = retry_err.last_attempt.exception() if retry_err.last_attempt else retry_err
-            logger.error(f"多次嘗試仍無法載入: {url} ({last_exc})")
-            return None
-        except Exception as e:
-            logger.error(f"獲取頁面內容時發生錯誤: {str(e)}")
-            return None
-
     async def crawl_list(self, page=1):
         """爬取文章列表"""
         try:
-            html = await self.get_page_source(
+            soup = self.fetch_page(
                 self.base_url,
-                wait_selector=".part_txt_1, .block_1 .gallery_3 .piece",
+                validate_selector=".part_txt_1, .block_1 .gallery_3 .piece",
                 wait_timeout=20
             )
-            if not html:
+            if not soup:
                 return []
             
-            soup = BeautifulSoup(html, 'html.parser')
             articles = []
 
             # 1. 爬取房產焦點區塊
@@ -178,15 +152,13 @@ class EttodayCrawler(BaseCrawler):
                 logger.debug(f"跳過非文章連結（文章階段）: {url}")
                 return None
 
-            html = await self.get_page_source(
+            soup = self.fetch_page(
                 url,
-                wait_selector=".story, .story-content, article",
+                validate_selector=".story, .story-content, article",
                 wait_timeout=25
             )
-            if not html:
+            if not soup:
                 return None
-                
-            soup = BeautifulSoup(html, 'html.parser')
             
             # 嘗試不同的內文區塊�擇器
             story = soup.select_one('.story, .story-content, article')
@@ -286,10 +258,6 @@ class EttodayCrawler(BaseCrawler):
     async def crawl(self, start_date=None, end_date=None):
         """執行爬蟲"""
         try:
-            # 設定 Chrome Driver
-            self.setup_driver()
-            logger.debug("Chrome Driver 設定完成")
-            
             # 確保 start_date 和 end_date 是 datetime.date 物件
             if isinstance(start_date, str):
                 start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
@@ -298,6 +266,7 @@ class EttodayCrawler(BaseCrawler):
             
             articles_list = await self.crawl_list()
             logger.debug(f"從列表頁找到 {len(articles_list)} 篇文章")
+            articles_list, _ = self.skip_known(articles_list)
             
             articles = []
             for article in articles_list:
@@ -336,5 +305,4 @@ class EttodayCrawler(BaseCrawler):
             return []
             
         finally:
-            if hasattr(self, 'driver'):
-                self.driver.quit() 
+            self.cleanup()
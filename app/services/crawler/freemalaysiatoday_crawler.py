@@ -2,15 +2,23 @@ from datetime import datetime
 from bs4 import BeautifulSoup
 import logging
 import time
-import re
 import json
-import requests
 from typing import List, Optional, Dict, Any
 from .base import BaseCrawler
 
 logger = logging.getLogger(__name__)
 
 class FreeMalaysiaTodayCrawler(BaseCrawler):
+    # 來源專屬的廣告文字，由 BaseCrawler 預先編譯
+    ad_texts = [
+        "Subscribe to our Telegram channel",
+        "Click to subscribe",
+        "Follow us on",
+        "For the latest property news",
+        "Click here for more property stories",
+        "SUBSCRIBE TO OUR NEWSLETTER",
+    ]
+
     def __init__(self):
         super().__init__()
         self.source_name = "Free Malaysia Today Property"
@@ -21,10 +29,6 @@ class FreeMalaysiaTodayCrawler(BaseCrawler):
     async def crawl(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
         """執行爬蟲主程序 - 使用 Next.js __NEXT_DATA__ 解析"""
         try:
-            # 設定 Chrome Driver（用於爬取文章內容）
-            self.setup_driver()
-            logger.info("Chrome Driver 設定完成")
-
             # 確保 start_date 和 end_date 是 datetime.date 物件
             if isinstance(start_date, str):
                 start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
@@ -42,6 +46,7 @@ class FreeMalaysiaTodayCrawler(BaseCrawler):
                 return []
 
             logger.info(f"從 __NEXT_DATA__ 找到 {len(article_list)} 篇文章")
+            article_list, _ = self.skip_known(article_list)
 
             # 處理每篇文章
             for article_info in article_list:
@@ -91,22 +96,15 @@ class FreeMalaysiaTodayCrawler(BaseCrawler):
     async def crawl_list(self, page: int = 1) -> List[Dict[str, Any]]:
         """從 __NEXT_DATA__ 爬取文章列表"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            }
-
             logger.info(f"正在訪問: {self.property_url}")
-            response = requests.get(self.property_url, headers=headers, timeout=15)
+            response = self.http_get(self.property_url, timeout=15)
 
             if response.status_code != 200:
                 logger.error(f"請求失敗，狀態碼: {response.status_code}")
                 return []
 
-            # 解析 HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # 找到 __NEXT_DATA__ script 標籤
-            script = soup.find('script', {'id': '__NEXT_DATA__'})
+            # 只解析 __NEXT_DATA__ script 標籤
+            script = self.parse_html(response.text, 'script#__NEXT_DATA__')
             if not script:
                 logger.warning("找不到 __NEXT_DATA__")
                 return []
@@ -189,10 +187,9 @@ class FreeMalaysiaTodayCrawler(BaseCrawler):
                 return None
 
             logger.info(f"正在爬取文章: {url}")
-            self.wait_and_get(url)
-            time.sleep(2)  # 等待頁面加載
-
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = self.fetch_page(url, validate_selector='script#__NEXT_DATA__, article[itemscope]')
+            if not soup:
+                return None
 
             # 嘗試從 __NEXT_DATA__ 獲取文章內容
             script = soup.find('script', {'id': '__NEXT_DATA__'})
@@ -216,19 +213,19 @@ class FreeMalaysiaTodayCrawler(BaseCrawler):
                         # 提取內容
                         content_html = post.get('content', '')
                         if content_html:
-                            content_soup = BeautifulSoup(content_html, 'html.parser')
+                            content_soup = self.parse_html(content_html)
                             # 移除不需要的元素
                             for unwanted in content_soup.select('script, style, iframe'):
                                 unwanted.decompose()
                             content = content_soup.get_text(separator='\n', strip=True)
-                            content = self._clean_content(content)
+                            content = self.clean_content(content)
                         else:
                             content = ''
 
                         # 提取摘要
                         excerpt = post.get('excerpt', '')
                         if excerpt:
-                            excerpt_soup = BeautifulSoup(excerpt, 'html.parser')
+                            excerpt_soup = self.parse_html(excerpt)
                             description = excerpt_soup.get_text(strip=True)
                         else:
                             description = content[:200] if content else ''
@@ -289,10 +286,10 @@ class FreeMalaysiaTodayCrawler(BaseCrawler):
 
                 if paragraphs:
                     content = '\n\n'.join(paragraphs)
-                    content = self._clean_content(content)
+                    content = self.clean_content(content)
                 else:
                     content = content_element.text.strip()
-                    content = self._clean_content(content)
+                    content = self.clean_content(content)
 
                 logger.info(f"使用備用方法提取內容，長度: {len(content)} 字符")
 
@@ -316,33 +313,3 @@ class FreeMalaysiaTodayCrawler(BaseCrawler):
             import traceback
             logger.error(traceback.format_exc())
             return None
-
-    def _clean_content(self, content: str) -> str:
-        """清理文章內容"""
-        # 移除多餘的空白行
-        lines = [line.strip() for line in content.split('\n')]
-        lines = [line for line in lines if line]
-
-        # 移除重複的行
-        lines = list(dict.fromkeys(lines))
-
-        # 重新組合內容
-        content = '\n'.join(lines)
-
-        # 移除連續的空格
-        content = re.sub(r'\s+', ' ', content).strip()
-
-        # 移除常見的廣告文字或不需要的內容
-        ad_texts = [
-            "Subscribe to our Telegram channel",
-            "Click to subscribe",
-            "Follow us on",
-            "For the latest property news",
-            "Click here for more property stories",
-            "SUBSCRIBE TO OUR NEWSLETTER"
-        ]
-
-        for ad in ad_texts:
-            content = content.replace(ad, "")
-
-        return content
@@ -2,13 +2,19 @@ from datetime import datetime
 from bs4 import BeautifulSoup
 import logging
 import time
-import re
 from typing import List, Optional, Dict, Any
 from .base import BaseCrawler
 
 logger = logging.getLogger(__name__)
 
 class House852Crawler(BaseCrawler):
+    # 來源專屬的廣告文字，由 BaseCrawler 預先編譯
+    ad_texts = [
+        "訂閱我們的通訊",
+        "關注我們",
+        "最新房產新聞",
+    ]
+
     def __init__(self):
         super().__init__()
         self.source_name = "852HOUSE"
@@ -18,10 +24,6 @@ class House852Crawler(BaseCrawler):
     async def crawl(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
         """執行爬蟲主程序"""
         try:
-            # 設定 Chrome Driver
-            self.setup_driver()
-            logger.info("Chrome Driver 設定完成")
-            
             # 確保 start_date 和 end_date 是 datetime.date 物件
             if isinstance(start_date, str):
                 start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
@@ -42,6 +44,7 @@ class House852Crawler(BaseCrawler):
                     break
                 
                 logger.info(f"從第 {page} 頁找到 {len(articles_list)} 篇文章")
+                articles_list, should_stop = self.skip_known(articles_list)
                 
                 # 處理每篇文章
                 for article_info in articles_list:
@@ -100,11 +103,9 @@ class House852Crawler(BaseCrawler):
                 url = f"{self.news_url}?page={page}"
             
             logger.info(f"正在訪問列表頁: {url}")
-            self.wait_and_get(url)
-            time.sleep(3)  # 等待頁面加載
-            
-            # 解析頁面
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = self.fetch_page(url, validate_selector='div.tab-content.pt-2.px-2')
+            if not soup:
+                return []
             
             # 找到文章列表容器
             container = soup.select_one('div.tab-content.pt-2.px-2')
@@ -185,10 +186,9 @@ class House852Crawler(BaseCrawler):
                 return None
             
             logger.info(f"正在爬取文章: {url}")
-            self.wait_and_get(url)
-            time.sleep(2)  # 等待頁面加載
-            
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = self.fetch_page(url, validate_selector='main > div.detail-content-wrapper')
+            if not soup:
+                return None
             
             # 提取標題
             title_element = soup.select_one('main > div.detail-content-wrapper > div.container > div > div > h1')
@@ -229,12 +229,12 @@ class House852Crawler(BaseCrawler):
                 
                 if paragraphs:
                     content = '\n\n'.join(paragraphs)
-                    content = self._clean_content(content)
+                    content = self.clean_content(content)
                     logger.info(f"成功提取文章內容，長度: {len(content)} 字符")
                 else:
                     # 如果找不到段落，直接使用內容元素的文本
                     content = content_element.text.strip()
-                    content = self._clean_content(content)
+                    content = self.clean_content(content)
                     logger.info(f"使用備用方法提取內容，長度: {len(content)} 字符")
             
             if not content:
@@ -267,30 +267,3 @@ class House852Crawler(BaseCrawler):
             import traceback
             logger.error(traceback.format_exc())
             return None
-    
-    def _clean_content(self, content: str) -> str:
-        """清理文章內容"""
-        # 移除多餘的空白行
-        lines = [line.strip() for line in content.split('\n')]
-        lines = [line for line in lines if line]
-        
-        # 移除重複的行
-        lines = list(dict.fromkeys(lines))
-        
-        # 重新組合內容
-        content = '\n'.join(lines)
-        
-        # 移除連續的空格
-        content = re.sub(r'\s+', ' ', content).strip()
-        
-        # 移除常見的廣告文字或不需要的內容（根據實際情況調整）
-        ad_texts = [
-            "訂閱我們的通訊",
-            "關注我們",
-            "最新房產新聞"
-        ]
-        
-        for ad in ad_texts:
-            content = content.replace(ad, "")
-        
-        return content
\ No newline at end of file
@@ -0,0 +1,264 @@
+"""
+HTTP 回應快取
+以網址為 key 將帶有 ETag / Last-Modified 的回應存放在本機目錄，下次抓取同一網址時
+送出 If-None-Match / If-Modified-Since，伺服器回應 304 時直接使用快取內容，
+省下重複下載列表首頁與回補時已收錄文章的頻寬與時間。
+
+- 每個網址一個檔案（第一行為 JSON 中繼資料，其後為原始內容），多個爬蟲行程共用
+- 以檔案修改時間作為最近使用時間，總大小超過上限時淘汰最久未使用的項目
+- requests 透過 CachingAdapter、httpx 透過 CachingTransport 使用
+- 以移除 VOLATILE_PARAMS 後的網址為 key，帶有防快取時間戳記（例如 UDN 的 _=）的請求也能命中
+- 不處理 Vary 與 Cache-Control 的過期時間，一律向伺服器確認
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from app.core.config import settings
+from app.core.metrics import HTTP_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# 內容已解壓縮，這些標頭不能沿用
+_DROP_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+# 每次請求都不同的查詢參數（防快取的時間戳記，例如 UDN 的 _=），比對網址時忽略
+VOLATILE_PARAMS = frozenset({'_'})
+
+
+def normalize_url(url: str) -> str:
+    """移除 VOLATILE_PARAMS，讓只有防快取參數不同的網址對應到同一個項目"""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key not in VOLATILE_PARAMS]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+class HttpCache:
+    """以本機目錄存放的 HTTP 回應快取（LRU，依總大小淘汰）"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.cache_dir = cache_dir or settings.CRAWLER_HTTP_CACHE_DIR
+        self.max_bytes = max_bytes or settings.CRAWLER_HTTP_CACHE_MAX_MB * 1024 * 1024
+        self.enabled = settings.CRAWLER_HTTP_CACHE_ENABLED if enabled is None else enabled
+        self._lock = threading.Lock()
+        # 目前的總大小，第一次寫入時掃描目錄取得；其他行程的寫入會在淘汰時重新掃描
+        self._size: Optional[int] = None
+        if self.enabled:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"HTTP cache dir unavailable ({self.cache_dir}): {str(e)}, cache disabled")
+                self.enabled = False
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest())
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """取得快取項目並標記為最近使用
+
+        Returns:
+            {'url', 'headers', 'stored_at', 'body'}，不存在時回傳 None
+        """
+        path = self._path(url)
+        try:
+            with open(path, 'rb') as f:
+                meta, _, body = f.read().partition(b'\n')
+            entry = json.loads(meta)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != normalize_url(url):
+            return None
+        entry['body'] = body
+        return entry
+
+    def put(self, url: str, headers: Dict[str, str], body: bytes):
+        """寫入快取項目（先寫入暫存檔再取代，讀取端不會看到寫到一半的檔案）"""
+        if len(body) > self.max_bytes // 8:
+            return
+        path = self._path(url)
+        meta = json.dumps({'url': normalize_url(url), 'headers': headers, 'stored_at': time.time()}).encode('utf-8')
+        data = meta + b'\n' + body
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"無法寫入 HTTP 快取 {url}: {str(e)}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan()[1]
+            else:
+                self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        """回傳 ([(mtime, size, path)], 總大小)"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.tmp'):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries, sum(size for _, size, _ in entries)
+
+    def _evict(self):
+        """淘汰最久未使用的項目，直到總大小低於上限的 90%"""
+        entries, total = self._scan()
+        target = self.max_bytes * 0.9
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._size = total
+        logger.debug(f"HTTP 快取淘汰 {removed} 個項目，目前 {total / 1024 / 1024:.1f} MB")
+
+    def clear(self):
+        with self._lock:
+            for _, _, path in self._scan()[0]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """依快取項目產生條件式請求標頭"""
+        if not entry:
+            return {}
+        headers = {k.lower(): v for k, v in entry['headers'].items()}
+        conditional = {}
+        if 'etag' in headers:
+            conditional['If-None-Match'] = headers['etag']
+        if 'last-modified' in headers:
+            conditional['If-Modified-Since'] = headers['last-modified']
+        return conditional
+
+    @staticmethod
+    def cacheable(status_code: int, headers) -> bool:
+        """只快取帶有驗證資訊且未禁止儲存的 200 回應"""
+        if status_code != 200:
+            return False
+        if 'no-store' in headers.get('Cache-Control', '').lower():
+            return False
+        return bool(headers.get('ETag') or headers.get('Last-Modified'))
+
+    @staticmethod
+    def merge_headers(entry: Dict[str, Any], headers) -> Dict[str, str]:
+        """304 回應的標頭覆寫快取中的標頭"""
+        merged = {k.lower(): v for k, v in entry['headers'].items()}
+        for name, value in headers.items():
+            if name.lower() not in _DROP_HEADERS:
+                merged[name.lower()] = value
+        return merged
+
+
+def _stored_headers(headers) -> Dict[str, str]:
+    return {name.lower(): value for name, value in headers.items() if name.lower() not in _DROP_HEADERS}
+
+
+class CachingAdapter(HTTPAdapter):
+    """requests 的快取 adapter：GET 請求帶上條件式標頭，304 時回傳快取內容"""
+
+    def __init__(self, cache: Optional[HttpCache] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache or http_cache
+
+    def send(self, request, stream=False, **kwargs):
+        if not self.cache.enabled or request.method != 'GET' or stream:
+            return super().send(request, stream=stream, **kwargs)
+
+        url = request.url
+        entry = self.cache.get(url)
+        request.headers.update(HttpCache.conditional_headers(entry))
+        response = super().send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and entry:
+            HTTP_CACHE_REQUESTS.labels(result='hit').inc()
+            headers = HttpCache.merge_headers(entry, response.headers)
+            response.close()
+            response.status_code = 200
+            response.reason = 'OK'
+            response.headers = CaseInsensitiveDict(headers)
+            response.encoding = get_encoding_from_headers(response.headers)
+            response._content = entry['body']
+            response._content_consumed = True
+            response.from_cache = True
+            return response
+
+        HTTP_CACHE_REQUESTS.labels(result='miss').inc()
+        if HttpCache.cacheable(response.status_code, response.headers):
+            self.cache.put(url, _stored_headers(response.headers), response.content)
+        return response
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """httpx 的快取 transport，包裝實際送出請求的 transport"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: Optional[HttpCache] = None):
+        self.transport = transport
+        self.cache = cache or http_cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.cache.enabled or request.method != 'GET':
+            return await self.transport.handle_async_request(request)
+
+        url = str(request.url)
+        entry = self.cache.get(url)
+        request.headers.update(HttpCache.conditional_headers(entry))
+        response = await self.transport.handle_async_request(request)
+
+        if response.status_code == 304 and entry:
+            HTTP_CACHE_REQUESTS.labels(result='hit').inc()
+            await response.aclose()
+            headers = HttpCache.merge_headers(entry, response.headers)
+            return httpx.Response(200, headers=headers, content=entry['body'], request=request)
+
+        HTTP_CACHE_REQUESTS.labels(result='miss').inc()
+        if not HttpCache.cacheable(response.status_code, response.headers):
+            return response
+        body = await response.aread()  # 已解壓縮
+        headers = _stored_headers(response.headers)
+        self.cache.put(url, headers, body)
+        return httpx.Response(200, headers=headers, content=body, request=request)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+http_cache = HttpCache()
@@ -0,0 +1,124 @@
+"""
+HTTP 連線工廠
+依網域建立並重用 keep-alive session，同一次執行中所有爬蟲共用 TCP/TLS 連線與 cookie
+（包含 cloudscraper 取得的 Cloudflare clearance）。
+
+- session(url)：requests session，掛載連線池與回應快取（http_cache）
+- scraper(url)：cloudscraper session，未安裝 cloudscraper 時回傳 None
+- async_transport()：AsyncFetcher 使用的 httpx transport，安裝 h2 時啟用 HTTP/2
+
+requests 不支援 HTTP/2，只有 httpx 的 transport 會使用。
+"""
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+import requests
+
+from app.core.config import settings
+from app.services.crawler.http_cache import CachingAdapter
+
+try:
+    import cloudscraper
+    HAS_CLOUDSCRAPER = True
+except ImportError:
+    HAS_CLOUDSCRAPER = False
+
+try:
+    import h2  # noqa: F401  httpx 的 HTTP/2 需要 h2
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'zh-TW,zh;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+
+SCRAPER_BROWSER = {'browser': 'chrome', 'platform': 'windows', 'mobile': False}
+
+
+def _with_default_timeout(session: requests.Session, timeout: float) -> requests.Session:
+    """未指定 timeout 的請求套用預設值"""
+    request = session.request
+
+    def request_with_timeout(method, url, **kwargs):
+        kwargs.setdefault('timeout', timeout)
+        return request(method, url, **kwargs)
+
+    session.request = request_with_timeout
+    return session
+
+
+class HttpClientFactory:
+    """依網域建立並重用 HTTP session（執行緒安全）
+
+    Args:
+        pool_maxsize: 每個網域保留的連線數
+        timeout: 未指定 timeout 時的預設秒數
+    """
+
+    def __init__(self, pool_maxsize: Optional[int] = None, timeout: Optional[float] = None):
+        self.pool_maxsize = pool_maxsize or settings.CRAWLER_HTTP_POOL_MAXSIZE
+        self.timeout = timeout or settings.CRAWLER_TIMEOUT
+        self._sessions: Dict[Tuple[str, str], requests.Session] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlparse(url).netloc or url
+
+    def _get_or_create(self, kind: str, url: str, create: Callable[[], requests.Session]) -> requests.Session:
+        key = (kind, self.host(url))
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = _with_default_timeout(create(), self.timeout)
+                logger.debug(f"建立 {kind} session: {key[1]}")
+            return session
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = CachingAdapter(
+            pool_connections=settings.CRAWLER_HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.pool_maxsize
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(DEFAULT_HEADERS)
+        return session
+
+    def session(self, url: str) -> requests.Session:
+        """取得網址所屬網域的 requests session"""
+        return self._get_or_create('requests', url, self._create_session)
+
+    def scraper(self, url: str) -> Optional[requests.Session]:
+        """取得網址所屬網域的 cloudscraper session，未安裝時回傳 None"""
+        if not HAS_CLOUDSCRAPER:
+            return None
+        return self._get_or_create('cloudscraper', url, lambda: cloudscraper.create_scraper(browser=SCRAPER_BROWSER))
+
+    def async_transport(self) -> httpx.AsyncHTTPTransport:
+        """建立 httpx transport（每個 AsyncClient 一個，關閉 client 時一併關閉）"""
+        return httpx.AsyncHTTPTransport(
+            http2=HAS_H2 and settings.CRAWLER_HTTP2,
+            limits=httpx.Limits(
+                max_connections=settings.CRAWLER_HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=settings.CRAWLER_HTTP_POOL_MAXSIZE
+            )
+        )
+
+    def close(self):
+        """關閉所有 session，下次取用時重新建立"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+
+http_client = HttpClientFactory()
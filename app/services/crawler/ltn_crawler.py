@@ -4,20 +4,28 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from datetime import datetime
 import logging
-import requests
 from bs4 import BeautifulSoup
 import time
-import re
 from typing import Optional
 from app.models.article import Article
 
 logger = logging.getLogger(__name__)
 
 class LTNCrawler(BaseCrawler):
+    # 來源專屬的廣告文字，由 BaseCrawler 預先編譯
+    ad_texts = [
+        "不用抽 不用搶 現在用APP看新聞 保證天天中獎",
+        "點我下載APP",
+        "按我看活動辦法",
+        "相關新聞影音",
+        "更多房產新聞",
+    ]
+
     def __init__(self):
         super().__init__()
         self.source_name = "ltn"
         self.base_url = "https://estate.ltn.com.tw"
+        self.article_selector = ".text"
 
     async def crawl(self, start_date: str = None, end_date: str = None) -> list:
         """
@@ -26,9 +34,7 @@ class LTNCrawler(BaseCrawler):
         :param end_date: 結束日期 (YYYY-MM-DD)
         """
         try:
-            # 只在 driver 尚未設置時才初始化
-            if not self.driver:
-                self.setup_driver()
+            # 需要時 fetch_page 才會向 Driver 池租用瀏覽器
             articles = []
             page = 1
 
@@ -53,8 +59,8 @@ class LTNCrawler(BaseCrawler):
 
                 logger.info(f"第 {page} 頁找到 {len(article_list)} 篇文章")
 
-                has_valid_article = False
-                for index, article_info in enumerate(article_list, 1):
+                valid_articles = []
+                for article_info in article_list:
                     published_at = article_info.get('published_at')
 
                     # 檢查日期範圍
@@ -63,10 +69,13 @@ class LTNCrawler(BaseCrawler):
                             logger.debug(f"文章日期 {published_at} 不在範圍內，跳過")
                             continue
 
-                    has_valid_article = True
-                    logger.info(f"正在爬取第 {page} 頁第 {index} 篇文章: {article_info.get('url')}")
+                    valid_articles.append(article_info)
+
+                has_valid_article = bool(valid_articles)
+                valid_articles, stop_paging = self.skip_known(valid_articles)
+                logger.info(f"正在並行爬取第 {page} 頁 {len(valid_articles)} 篇文章")
 
-                    article_data = await self.crawl_article(article_info)
+                for article_data in await self.crawl_articles(valid_articles):
                     if article_data:
                         article = Article(
                             title=article_data['title'],
@@ -86,6 +95,9 @@ class LTNCrawler(BaseCrawler):
                     logger.info("本頁沒有符合日期範圍的文章，停止爬取")
                     break
 
+                if stop_paging:
+                    break
+
                 page += 1
 
             logger.info(f"LTN 爬蟲完成，總共爬取 {len(articles)} 篇文章")
@@ -100,11 +112,7 @@ class LTNCrawler(BaseCrawler):
             ajax_url = f"{self.base_url}/ajaxList/news/{page}"
             logger.info(f"Fetching AJAX page: {ajax_url}")
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(ajax_url, headers=headers)
+            response = self.http_get(ajax_url)
             if response.status_code == 200:
                 articles_data = response.json()
                 logger.info(f"Found {len(articles_data)} articles in JSON response")
@@ -149,83 +157,57 @@ class LTNCrawler(BaseCrawler):
         logger.info(f"Crawling article: {url}")
         
         try:
-            # 載入頁面
-            self.driver.get(url)
-            time.sleep(3)  # 等待頁面載入
-            
-            # 取得標題 (使用 h1 標籤)
-            try:
-                title = self.driver.find_element(By.TAG_NAME, "h1").text.strip()
-                logger.info(f"Found title: {title}")
-            except:
-                title = article_info.get('title', '')
-                logger.warning(f"Could not find title element for {url}")
-            
-            # 取得內文 (使用 class="text boxTitle")
-            try:
-                content_element = self.driver.find_element(By.CLASS_NAME, "text")
-                content = content_element.text.strip()
-                
-                # 移除不需要的文字
-                content = content.replace("請繼續往下閱讀...", "")
-                content = content.replace("不用抽 不用搶 現在用APP看新聞 保證天天中獎", "")
-                content = content.replace("點我下載APP", "")
-                content = content.replace("按我看活動辦法", "")
-                
-                logger.info(f"Found content with length: {len(content)}")
-            except:
-                content = ''
-                logger.warning(f"Could not find content element for {url}")
-                
-            # 取得圖片
-            try:
-                image_element = self.driver.find_element(By.CSS_SELECTOR, ".ph_i img")
-                image_url = image_element.get_attribute('src')
-            except:
-                image_url = None
-                
-            article_data = {
-                'url': url,
-                'title': title,
-                'content': content,
-                'published_at': article_info.get('published_at'),
-                'source': 'ltn',
-                'image_url': image_url,
-                'description': content[:200] if content else None
-            }
-            
-            return article_data
+            # 文章內文在靜態 HTML 中即可取得，僅在缺少內文時才改用瀏覽器
+            soup = self.fetch_page(url, validate_selector=self.article_selector)
+            if not soup:
+                return None
+
+            return self.parse_article(soup, article_info)
             
         except Exception as e:
             logger.error(f"Error crawling article {url}: {str(e)}", exc_info=True)
             return None
-    
-    def _clean_content(self, content: str) -> str:
-        """清理文章內容"""
-        # 移除廣告相關文字
-        ad_texts = [
-            "不用抽 不用搶 現在用APP看新聞 保證天天中獎",
-            "點我下載APP",
-            "按我看活動辦法",
-            "相關新聞影音",
-            "更多房產新聞",
-        ]
-        
-        # 移除廣告文字
-        for ad in ad_texts:
-            content = content.replace(ad, "")
-        
-        # 移除多餘的空白行
-        lines = [line.strip() for line in content.split('\n')]
-        lines = [line for line in lines if line]
-        
-        # 移除重複的行
-        lines = list(dict.fromkeys(lines))
-        
-        # 重新組合內容
-        content = '\n'.join(lines)
-        
-        # 移除連續的空格
-        content = re.sub(r'\s+', ' ', content).strip()
+
+    def parse_article(self, soup: BeautifulSoup, article_info: dict) -> Optional[dict]:
+        """從文章頁面解析內容"""
+        url = article_info.get('url')
+
+        # 取得標題 (使用 h1 標籤)
+        title_element = soup.select_one("h1")
+        if title_element and title_element.get_text(strip=True):
+            title = title_element.get_text(strip=True)
+            logger.info(f"Found title: {title}")
+        else:
+            title = article_info.get('title', '')
+            logger.warning(f"Could not find title element for {url}")
         
-        return content 
\ No newline at end of file
+        # 取得內文 (使用 class="text boxTitle")
+        content_element = soup.select_one(".text")
+        if content_element:
+            for unwanted in content_element.select('script, style, iframe'):
+                unwanted.decompose()
+            content = content_element.get_text('\n', strip=True)
+            
+            # 移除不需要的文字（保留段落換行）
+            content = self.content_cleaner.remove_ads(content)
+            
+            logger.info(f"Found content with length: {len(content)}")
+        else:
+            content = ''
+            logger.warning(f"Could not find content element for {url}")
+            
+        # 取得圖片
+        image_element = soup.select_one(".ph_i img")
+        image_url = None
+        if image_element:
+            image_url = image_element.get('src') or image_element.get('data-src')
+            
+        return {
+            'url': url,
+            'title': title,
+            'content': content,
+            'published_at': article_info.get('published_at'),
+            'source': 'ltn',
+            'image_url': image_url,
+            'description': content[:200] if content else None
+        }
@@ -3,17 +3,26 @@ from bs4 import BeautifulSoup
 import logging
 from datetime import datetime
 from app.models.article import Article
-import requests
+from app.core.config import settings
 from app.core.database import SessionLocal
+from app.services.crawler.async_fetcher import AsyncFetcher
+from app.services.crawler.base import HtmlParser, resolve_url
+from app.services.crawler.http_client import http_client
+from app.services.crawler.rate_limiter import rate_limiter
+from app.services.crawler.url_index import KnownUrlIndex
 
 class NextAppleCrawler:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        self.base_url = "https://tw.nextapple.com"
+        self.source_name = "nextapple"
+        self.session = http_client.session(self.base_url)  # 網域共用的 keep-alive session
+        self.known_urls: Optional[KnownUrlIndex] = None  # 已收錄網址，設定後會跳過這些文章
+        self.stop_on_known_page = settings.CRAWLER_STOP_ON_KNOWN_PAGE
+        self.last_page_size = 0  # 最近一頁列表的文章數（含已收錄者）
+        self.html_parser = HtmlParser()
+        self.pages_visited = 0  # 本次執行發出的頁面請求數
 
-    def crawl(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Article]:
+    async def crawl(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Article]:
         """
         爬取指定日期範圍的新聞文章並存入資料庫
         :param start_date: 起始日期 (YYYY-MM-DD)
@@ -31,10 +40,17 @@ class NextAppleCrawler:
         should_stop = False
         
         while page <= max_pages and not should_stop:
-            articles = self.get_news_list(page)
+            articles = await self.get_news_list(page)
             
             if not articles:
-                logging.info(f"第 {page} 頁沒有找到任何文章，停止爬取")
+                if self.last_page_size and not self.stop_on_known_page:
+                    # 整頁皆已收錄，繼續往下一頁找新文章
+                    page += 1
+                    continue
+                if self.last_page_size:
+                    logging.info(f"第 {page} 頁文章皆已收錄，停止翻頁")
+                else:
+                    logging.info(f"第 {page} 頁沒有找到任何文章，停止爬取")
                 break
                 
             # 檢查文章日期範圍
@@ -66,50 +82,82 @@ class NextAppleCrawler:
         """
         try:
             logging.info(f"正在爬取文章內容: {url}")
-            response = self.session.get(url)
+            rate_limiter.acquire(url)
+            self.pages_visited += 1
+            response = self.session.get(resolve_url(url))
             
             if response.status_code != 200:
                 logging.error(f"取得文章內容失敗: {response.status_code}")
                 return ""
             
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # 找到文章內容區塊
-            content_blocks = []
-            
-            # 先找摘要
-            summary = soup.select_one("blockquote div")
-            if summary:
-                content_blocks.append(summary.text.strip())
-            
-            # 找主要內容
-            content_div = soup.select_one("div.post-content")
-            if content_div:
-                # 取得所有段落
-                paragraphs = content_div.select("p")
-                for p in paragraphs:
-                    # 過濾廣告相關內容
-                    if not any(ad_text in p.text for ad_text in ["廣告", "taboola", "AD"]):
-                        content_blocks.append(p.text.strip())
-            
-            content = "\n".join(block for block in content_blocks if block)
-            
-            if not content:
-                logging.warning(f"無法找到文章內容: {url}")
-                return ""
-            
-            return content
+            return self.parse_article_content(response.text, url)
             
         except Exception as e:
             logging.error(f"爬取文章內容發生錯誤: {str(e)}")
             return ""
 
-    def get_news_list(self, page: int = 1) -> List[Article]:
+    def parse_article_content(self, html: str, url: str) -> str:
+        """
+        從文章頁面解析內容
+        """
+        soup = self.html_parser.parse(html)
+        
+        # 找到文章內容區塊
+        content_blocks = []
+        
+        # 先找摘要
+        summary = soup.select_one("blockquote div")
+        if summary:
+            content_blocks.append(summary.text.strip())
+        
+        # 找主要內容
+        content_div = soup.select_one("div.post-content")
+        if content_div:
+            # 取得所有段落
+            paragraphs = content_div.select("p")
+            for p in paragraphs:
+                # 過濾廣告相關內容
+                if not any(ad_text in p.text for ad_text in ["廣告", "taboola", "AD"]):
+                    content_blocks.append(p.text.strip())
+        
+        content = "\n".join(block for block in content_blocks if block)
+        
+        if not content:
+            logging.warning(f"無法找到文章內容: {url}")
+            return ""
+        
+        return content
+
+    async def fetch_article_contents(self, urls: List[str]) -> List[str]:
+        """
+        並行爬取多篇文章內容
+        """
+        async with AsyncFetcher(headers=dict(self.session.headers), source=self.source_name) as fetcher:
+            pages = await fetcher.fetch_all(urls)
+        self.pages_visited += len(urls)
+
+        contents = []
+        for url, html in zip(urls, pages):
+            if html is None:
+                # 並行抓取失敗時改用 session 重試一次
+                contents.append(self.get_article_content(url))
+                continue
+            try:
+                contents.append(self.parse_article_content(html, url))
+            except Exception as e:
+                logging.error(f"爬取文章內容發生錯誤: {str(e)}")
+                contents.append("")
+        return contents
+
+    async def get_news_list(self, page: int = 1) -> List[Article]:
         try:
-            api_url = f"https://tw.nextapple.com/realtime/property/{page}?infinitescroll=1"
+            self.last_page_size = 0
+            api_url = f"{self.base_url}/realtime/property/{page}?infinitescroll=1"
             logging.info(f"正在請求 API: {api_url}")
             
-            response = self.session.get(api_url)
+            rate_limiter.acquire(api_url)
+            self.pages_visited += 1
+            response = self.session.get(resolve_url(api_url))
             
             if response.status_code != 200:
                 logging.error(f"API請求失敗: {response.status_code}")
@@ -117,8 +165,8 @@ class NextAppleCrawler:
 
             logging.info("成功取得 API 回應")
             
-            articles = []
-            soup = BeautifulSoup(response.text, "html.parser")
+            entries = []
+            soup = self.html_parser.parse(response.text)
             article_elements = soup.find_all("article", attrs={"articleid": True})
             
             logging.info(f"找到 {len(article_elements)} 篇文章")
@@ -149,31 +197,50 @@ class NextAppleCrawler:
                     category_element = element.find("div", class_="category")
                     category = category_element.text.strip() if category_element else None
                     
-                    # 爬取文章內容
-                    content = self.get_article_content(url)
-                    if not content:
-                        logging.warning(f"無法取得文章內容，跳過: {url}")
-                        continue
-                    
-                    article = Article(
-                        url=url,
-                        source="nextapple",
-                        category=category,
-                        title=title,
-                        description=description,
-                        image_url=image_url,
-                        content=content,  # 加入文章內容
-                        published_at=published_at
-                    )
-                    articles.append(article)
-                    logging.debug(f"成功解析文章: {title}")
+                    entries.append({
+                        'url': url,
+                        'title': title,
+                        'description': description,
+                        'image_url': image_url,
+                        'published_at': published_at,
+                        'category': category
+                    })
                     
                 except Exception as e:
                     logging.warning(f"解析文章失敗: {str(e)}")
                     continue
+
+            self.last_page_size = len(entries)
+            if self.known_urls is not None:
+                entries = [entry for entry in entries if entry['url'] not in self.known_urls]
+                skipped = self.last_page_size - len(entries)
+                if skipped:
+                    logging.info(f"跳過 {skipped} 篇已收錄的文章")
+
+            # 並行爬取本頁所有文章內容
+            contents = await self.fetch_article_contents([entry['url'] for entry in entries])
+
+            articles = []
+            for entry, content in zip(entries, contents):
+                if not content:
+                    logging.warning(f"無法取得文章內容，跳過: {entry['url']}")
+                    continue
+                
+                article = Article(
+                    url=entry['url'],
+                    source=self.source_name,
+                    category=entry['category'],
+                    title=entry['title'],
+                    description=entry['description'],
+                    image_url=entry['image_url'],
+                    content=content,  # 加入文章內容
+                    published_at=entry['published_at']
+                )
+                articles.append(article)
+                logging.debug(f"成功解析文章: {entry['title']}")
                     
             return articles
             
         except Exception as e:
             logging.error(f"取得新聞列表失敗: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
@@ -0,0 +1,152 @@
+"""
+網域速率限制
+以 token bucket 控制每個網域的請求速率，取代各爬蟲散落的隨機 sleep。
+桶的狀態存放在本機檔案並以檔案鎖保護，讓多個爬蟲行程共用同一個速率。
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """每個網域一個 token bucket
+
+    - rate: 每秒補充的 token 數（即長期平均 RPS）
+    - burst: 桶容量，閒置後最多可連續發出的請求數
+    - 取 token 採預約制：token 不足時先扣成負數並回傳需等待的秒數，
+      同時等待的請求會依序排開，不需要忙碌輪詢
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        state_dir: Optional[str] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.rate = rate or settings.CRAWLER_RATE_LIMIT_RPS
+        self.burst = burst or settings.CRAWLER_RATE_LIMIT_BURST
+        self.state_dir = state_dir or settings.CRAWLER_RATE_LIMIT_DIR
+        self.enabled = settings.CRAWLER_RATE_LIMIT_ENABLED if enabled is None else enabled
+
+        self._host_limits: Dict[str, Tuple[float, float]] = {}
+        for host, limit in settings.CRAWLER_RATE_LIMIT_HOSTS.items():
+            self.configure_host(host, limit.get('rps', self.rate), limit.get('burst', self.burst))
+
+        self._lock = threading.Lock()
+        # 無法使用檔案時退回行程內的狀態
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._use_files = HAS_FCNTL and self._prepare_state_dir()
+
+    def _prepare_state_dir(self) -> bool:
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            return True
+        except OSError as e:
+            logger.warning(f"Rate limit state dir unavailable ({self.state_dir}): {str(e)}, using in-process limits")
+            return False
+
+    def configure_host(self, host: str, rate: float, burst: float):
+        """設定單一網域的速率
+
+        Args:
+            host: 網域名稱，例如 www.edgeprop.my
+            rate: 每秒請求數
+            burst: 可連續發出的請求數
+        """
+        self._host_limits[host] = (float(rate), float(burst))
+
+    def limits_for(self, host: str) -> Tuple[float, float]:
+        """取得網域的 (rate, burst)"""
+        return self._host_limits.get(host, (float(self.rate), float(self.burst)))
+
+    def _take(self, host: str, state: Optional[Tuple[float, float]], now: float) -> Tuple[Tuple[float, float], float]:
+        """從桶中預約一個 token，回傳新狀態與需等待的秒數"""
+        rate, burst = self.limits_for(host)
+        if state is None:
+            tokens = burst
+        else:
+            tokens, updated = state
+            tokens = min(burst, tokens + (now - updated) * rate)
+
+        tokens -= 1
+        wait = -tokens / rate if tokens < 0 else 0.0
+        return (tokens, now), wait
+
+    def _reserve_in_file(self, host: str) -> float:
+        path = os.path.join(self.state_dir, f"{host.replace(':', '_')}.bucket")
+        with open(path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read().split()
+                state = (float(raw[0]), float(raw[1])) if len(raw) == 2 else None
+                new_state, wait = self._take(host, state, time.time())
+                f.seek(0)
+                f.truncate()
+                f.write(f"{new_state[0]} {new_state[1]}")
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+
+    def reserve(self, url: str) -> float:
+        """為 url 所屬網域預約一次請求
+
+        Returns:
+            發出請求前需等待的秒數
+        """
+        if not self.enabled:
+            return 0.0
+
+        host = urlparse(url).netloc
+        if not host:
+            return 0.0
+
+        with self._lock:
+            if self._use_files:
+                try:
+                    return self._reserve_in_file(host)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Rate limit state file error for {host}: {str(e)}, using in-process limits")
+                    self._use_files = False
+
+            self._buckets[host], wait = self._take(host, self._buckets.get(host), time.time())
+            return wait
+
+    def acquire(self, url: str):
+        """等待直到可對 url 發出請求"""
+        wait = self.reserve(url)
+        if wait > 0:
+            logger.debug(f"Rate limit: waiting {wait:.2f}s for {url}")
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str):
+        """acquire 的非同步版本，等待期間不阻塞事件迴圈"""
+        if not self.enabled:
+            return
+        # 檔案鎖與狀態檔讀寫會阻塞，交給執行緒處理，事件迴圈上只有 asyncio.sleep
+        if self._use_files:
+            wait = await asyncio.to_thread(self.reserve, url)
+        else:
+            wait = self.reserve(url)
+        if wait > 0:
+            logger.debug(f"Rate limit: waiting {wait:.2f}s for {url}")
+            await asyncio.sleep(wait)
+
+
+rate_limiter = RateLimiter()
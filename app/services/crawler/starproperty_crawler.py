@@ -2,13 +2,21 @@ from datetime import datetime
 from bs4 import BeautifulSoup
 import logging
 import time
-import re
 from typing import List, Optional, Dict, Any
 from .base import BaseCrawler
 
 logger = logging.getLogger(__name__)
 
 class StarPropertyCrawler(BaseCrawler):
+    # 來源專屬的廣告文字，由 BaseCrawler 預先編譯
+    ad_texts = [
+        "Subscribe to our Telegram channel",
+        "Click to subscribe",
+        "Follow us on",
+        "For the latest property news",
+        "Click here for more property stories",
+    ]
+
     def __init__(self):
         super().__init__()
         self.source_name = "StarProperty Malaysia"
@@ -18,10 +26,6 @@ class StarPropertyCrawler(BaseCrawler):
     async def crawl(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
         """執行爬蟲主程序"""
         try:
-            # 設定 Chrome Driver
-            self.setup_driver()
-            logger.info("Chrome Driver 設定完成")
-            
             # 確保 start_date 和 end_date 是 datetime.date 物件
             if isinstance(start_date, str):
                 start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
@@ -42,6 +46,7 @@ class StarPropertyCrawler(BaseCrawler):
                     break
                 
                 logger.info(f"從第 {page} 頁找到 {len(articles_list)} 篇文章")
+                articles_list, should_stop = self.skip_known(articles_list)
                 
                 # 處理每篇文章
                 for article_info in articles_list:
@@ -100,11 +105,9 @@ class StarPropertyCrawler(BaseCrawler):
                 url = f"{self.news_url}?category=Property%20News&page={page}"
             
             logger.info(f"正在訪問列表頁: {url}")
-            self.wait_and_get(url)
-            time.sleep(3)  # 等待頁面加載
-            
-            # 解析頁面
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = self.fetch_page(url, validate_selector='div.row.row-flex.news-listing')
+            if not soup:
+                return []
             
             # 找到文章列表容器
             container = soup.select_one('div.row.row-flex.news-listing')
@@ -152,17 +155,8 @@ class StarPropertyCrawler(BaseCrawler):
                     # 解析日期，格式範例：Monday, 21 Apr 2025 17:04 PM
                     published_at = None
                     if date_text:
-                        try:
-                            # 移除星期幾部分
-                            if ',' in date_text:
-                                date_text = date_text.split(',', 1)[1].strip()
-                            
-                            # 嘗試解析日期
-                            published_at = datetime.strptime(date_text, '%d %b %Y %H:%M %p')
-                            logger.info(f"成功解析日期: {published_at}, 原始文本: {date_text}")
-                        except ValueError as e:
-                            logger.warning(f"無法解析日期: {date_text}, 錯誤: {e}")
-                            published_at = datetime.now()
+                        # 星期幾前綴由日期解析器移除
+                        published_at = self.parse_flexible_date(date_text) or datetime.now()
                     else:
                         published_at = datetime.now()
                     
@@ -194,10 +188,9 @@ class StarPropertyCrawler(BaseCrawler):
                 return None
             
             logger.info(f"正在爬取文章: {url}")
-            self.wait_and_get(url)
-            time.sleep(2)  # 等待頁面加載
-            
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = self.fetch_page(url, validate_selector='div[itemtype="https://schema.org/NewsArticle"].article')
+            if not soup:
+                return None
             
             # 找到文章容器
             article_container = soup.select_one('div[itemtype="https://schema.org/NewsArticle"].article')
@@ -220,13 +213,8 @@ class StarPropertyCrawler(BaseCrawler):
                 if "Posted on" in date_text:
                     date_text = date_text.replace("Posted on", "").strip()
                 
-                try:
-                    # 嘗試解析日期，格式範例：21 Apr 2025
-                    published_at = datetime.strptime(date_text, '%d %b %Y')
-                    logger.info(f"從文章頁面解析日期: {published_at}, 原始文本: {date_text}")
-                except ValueError:
-                    logger.warning(f"無法從文章頁面解析日期: {date_text}")
-                    # 使用列表頁提供的日期作為備用
+                # 格式範例：21 Apr 2025，無法解析時使用列表頁提供的日期作為備用
+                published_at = self.parse_flexible_date(date_text) or published_at
             
             # 提取作者
             author_element = article_container.select_one('div.article-sub div.article-author')
@@ -260,12 +248,12 @@ class StarPropertyCrawler(BaseCrawler):
                 
                 if paragraphs:
                     content = '\n\n'.join(paragraphs)
-                    content = self._clean_content(content)
+                    content = self.clean_content(content)
                     logger.info(f"成功提取文章內容，長度: {len(content)} 字符")
                 else:
                     # 如果找不到段落，直接使用內容元素的文本
                     content = content_element.text.strip()
-                    content = self._clean_content(content)
+                    content = self.clean_content(content)
                     logger.info(f"使用備用方法提取內容，長度: {len(content)} 字符")
             
             if not content:
@@ -290,32 +278,3 @@ class StarPropertyCrawler(BaseCrawler):
             import traceback
             logger.error(traceback.format_exc())
             return None
-    
-    def _clean_content(self, content: str) -> str:
-        """清理文章內容"""
-        # 移除多餘的空白行
-        lines = [line.strip() for line in content.split('\n')]
-        lines = [line for line in lines if line]
-        
-        # 移除重複的行
-        lines = list(dict.fromkeys(lines))
-        
-        # 重新組合內容
-        content = '\n'.join(lines)
-        
-        # 移除連續的空格
-        content = re.sub(r'\s+', ' ', content).strip()
-        
-        # 移除常見的廣告文字或不需要的內容
-        ad_texts = [
-            "Subscribe to our Telegram channel",
-            "Click to subscribe",
-            "Follow us on",
-            "For the latest property news",
-            "Click here for more property stories"
-        ]
-        
-        for ad in ad_texts:
-            content = content.replace(ad, "")
-        
-        return content
\ No newline at end of file
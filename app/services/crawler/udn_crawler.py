@@ -4,19 +4,28 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from datetime import datetime
 import logging
-import requests
+from bs4 import BeautifulSoup
 import time
-import re
 import asyncio
 from app.models.article import Article
 
 logger = logging.getLogger(__name__)
 
 class UDNCrawler(BaseCrawler):
+    # 來源專屬的廣告文字，由 BaseCrawler 預先編譯
+    ad_texts = [
+        "googletag.cmd.push",
+        "window.fbAsyncInit",
+        "分享此文：",
+        "延伸閱讀",
+        "相關新聞",
+    ]
+
     def __init__(self):
         super().__init__()
         self.source_name = "udn"
         self.base_url = "https://house.udn.com"
+        self.article_selector = ".article-content__paragraph"
         
     async def crawl(self, start_date: str = None, end_date: str = None) -> list:
         """
@@ -29,7 +38,6 @@ class UDNCrawler(BaseCrawler):
     async def _crawl(self, start_date: str = None, end_date: str = None) -> list:
         """非同步爬取主邏輯"""
         try:
-            self.setup_driver()
             articles = []
             page = 1
             
@@ -48,10 +56,12 @@ class UDNCrawler(BaseCrawler):
                     break
                 
                 logger.info(f"第 {page} 頁找到 {len(article_list)} 篇文章")
+                article_list, stop_paging = self.skip_known(article_list)
                 
-                for index, article_info in enumerate(article_list, 1):
-                    logger.info(f"正在爬取第 {page} 頁第 {index} 篇文章: {article_info.get('url')}")
-                    article_data = await self.crawl_article(article_info)
+                logger.info(f"正在並行爬取第 {page} 頁 {len(article_list)} 篇文章")
+                article_results = await self.crawl_articles(article_list)
+
+                for article_info, article_data in zip(article_list, article_results):
                     if article_data:
                         # 將字典轉換為 Article 物件
                         article = Article(
@@ -68,6 +78,9 @@ class UDNCrawler(BaseCrawler):
                         articles.append(article)
                         logger.info(f"成功爬取文章: {article.title}")
                 
+                if stop_paging:
+                    break
+
                 page += 1
                 
             logger.info(f"爬蟲完成，總共爬取 {len(articles)} 篇文章")
@@ -82,11 +95,7 @@ class UDNCrawler(BaseCrawler):
             timestamp = int(time.time() * 1000)
             ajax_url = f"{self.base_url}/house/api/newest?page={page}&_={timestamp}"
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(ajax_url, headers=headers)
+            response = self.http_get(ajax_url)
             if response.status_code == 200:
                 try:
                     data = response.json()
@@ -140,72 +149,46 @@ class UDNCrawler(BaseCrawler):
             if url.startswith("/"):
                 url = f"{self.base_url}{url}"
             
-            self.wait_and_get(url)
-            
-            # 等待文章內容載入
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "article-content__title"))
-            )
-            
-            # 取得文章內容
-            title = self.driver.find_element(By.CLASS_NAME, "article-content__title").text
-            
-            # 取得發布時間
-            time_element = self.driver.find_element(By.CLASS_NAME, "article-content__time")
-            published_at = datetime.strptime(time_element.text, "%Y-%m-%d %H:%M")
-            
-            # 取得記者
-            try:
-                reporter = self.driver.find_element(By.CLASS_NAME, "article-content__author").text
-            except:
-                reporter = None
-            
-            # 取得內文
-            content = self.driver.find_element(By.CLASS_NAME, "article-content__paragraph").text
-            content = self._clean_content(content)
-            
-            return {
-                "title": title,
-                "content": content,
-                "description": content[:100] if content else None,
-                "published_at": published_at,
-                "url": url,
-                "source": self.source_name,
-                "image_url": article_info.get('image_url'),
-                "reporter": reporter,
-                "category": article_info.get('category')
-            }
+            # 文章內容在靜態 HTML 中即可取得，僅在缺少內文時才改用瀏覽器
+            soup = self.fetch_page(url, validate_selector=self.article_selector)
+            if not soup:
+                return None
+
+            return self.parse_article(soup, dict(article_info, url=url))
             
         except Exception as e:
             logger.error(f"Error crawling article {url}: {str(e)}", exc_info=True)
             return None
     
-    def _clean_content(self, content: str) -> str:
-        """清理文章內容"""
-        # 移除廣告相關文字
-        ad_texts = [
-            "googletag.cmd.push",
-            "window.fbAsyncInit",
-            "分享此文：",
-            "延伸閱讀",
-            "相關新聞"
-        ]
-        
-        # 移除廣告文字
-        for ad in ad_texts:
-            content = content.replace(ad, "")
-        
-        # 移除多餘的空白行
-        lines = [line.strip() for line in content.split('\n')]
-        lines = [line for line in lines if line]
+    def parse_article(self, soup: BeautifulSoup, article_info: dict) -> dict:
+        """從文章頁面解析內容"""
+        # 取得文章內容
+        title_element = soup.select_one(".article-content__title")
+        title = title_element.get_text(strip=True) if title_element else ''
         
-        # 移除重複的行
-        lines = list(dict.fromkeys(lines))
+        # 取得發布時間
+        time_element = soup.select_one(".article-content__time")
+        published_at = datetime.strptime(time_element.get_text(strip=True), "%Y-%m-%d %H:%M")
         
-        # 重新組合內容
-        content = '\n'.join(lines)
+        # 取得記者
+        reporter_element = soup.select_one(".article-content__author")
+        reporter = reporter_element.get_text(' ', strip=True) if reporter_element else None
         
-        # 移除連續的空格
-        content = re.sub(r'\s+', ' ', content).strip()
+        # 取得內文
+        content_element = soup.select_one(".article-content__paragraph")
+        for unwanted in content_element.select('script, style, iframe'):
+            unwanted.decompose()
+        content = content_element.get_text('\n', strip=True)
+        content = self.clean_content(content)
         
-        return content
\ No newline at end of file
+        return {
+            "title": title,
+            "content": content,
+            "description": content[:100] if content else None,
+            "published_at": published_at,
+            "url": article_info.get('url'),
+            "source": self.source_name,
+            "image_url": article_info.get('image_url'),
+            "reporter": reporter,
+            "category": article_info.get('category')
+        }
@@ -0,0 +1,51 @@
+"""
+已收錄文章網址索引
+爬取開始時從資料庫載入各來源已存在的 Article.url，
+讓爬蟲在抓取文章內容前就能跳過已收錄的文章。
+"""
+import logging
+from typing import Iterable, Set
+
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+
+logger = logging.getLogger(__name__)
+
+
+class KnownUrlIndex:
+    """已收錄網址的記憶體索引
+
+    使用 set 而非 bloom filter：誤判會讓新文章被跳過，
+    而單一來源的網址數量（數萬筆）放在 set 中也只佔數 MB。
+    """
+
+    def __init__(self, urls: Iterable[str] = ()):
+        self._urls: Set[str] = set(urls)
+
+    @classmethod
+    def load(cls, db: Session, source: str, batch_size: int = 5000) -> "KnownUrlIndex":
+        """載入指定來源已收錄的網址
+
+        Args:
+            db: 資料庫 session
+            source: 文章來源代碼（與 Article.source 相同）
+            batch_size: 每次從資料庫取回的筆數
+        """
+        query = (
+            db.query(Article.url)
+            .filter(Article.source == source)
+            .execution_options(yield_per=batch_size)
+        )
+        index = cls(url for (url,) in query)
+        logger.info(f"已載入 {source} 的 {len(index)} 筆已收錄網址")
+        return index
+
+    def add(self, url: str):
+        self._urls.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
@@ -0,0 +1,341 @@
+"""
+文章匯出
+以伺服器端游標分批讀取文章並逐段輸出，記憶體用量不隨匯出筆數增加。
+CSV 與 Arrow IPC 直接串流，第一個位元組能立即送出；
+XLSX 與 Parquet 需要在檔尾寫入索引，先寫入暫存檔後再傳送。
+"""
+import codecs
+import csv
+import io
+import logging
+import os
+import re
+from datetime import datetime
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, Iterator, List, Optional
+
+from openpyxl import Workbook
+from sqlalchemy import Select, select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.search import search_filter
+from app.models.article import Article
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+# 匯出欄位（只選取需要的欄位，不載入 search_vector 等內部欄位）
+EXPORT_COLUMNS = [
+    Article.id,
+    Article.title,
+    Article.source,
+    Article.category,
+    Article.reporter,
+    Article.published_at,
+    Article.content,
+    Article.url,
+    Article.image_url,
+]
+EXPORT_HEADER = ['ID', '標題', '來源', '分類', '記者', '發布時間', '內容', '連結', '圖片連結']
+
+# 最新文章 Excel 匯出的欄位
+LATEST_COLUMNS = [
+    Article.id,
+    Article.title,
+    Article.source,
+    Article.url,
+    Article.published_at,
+    Article.created_at,
+    Article.updated_at,
+    Article.content,
+    Article.description,
+]
+LATEST_HEADER = ['ID', '標題', '來源', '網址', '發布時間', '建立時間', '更新時間', '內容', '描述']
+
+# 欄式格式（Parquet / Arrow）的欄位型別，欄位順序與 EXPORT_COLUMNS 相同
+ARROW_FIELDS = [
+    ('id', 'int64'),
+    ('title', 'string'),
+    ('source', 'string'),
+    ('category', 'string'),
+    ('reporter', 'string'),
+    ('published_at', 'timestamp'),
+    ('content', 'string'),
+    ('url', 'string'),
+    ('image_url', 'string'),
+]
+
+XLSX_MAX_CELL_LENGTH = 32767  # Excel 單一儲存格的字元上限
+# XML 不允許的控制字元，openpyxl 遇到會拋出 IllegalCharacterError
+XLSX_ILLEGAL_CHARACTERS = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+
+
+def build_export_query(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    keyword: Optional[str] = None,
+    source: Optional[str] = None
+) -> Select:
+    """建立匯出查詢
+
+    Args:
+        start_date: 起始日期 (YYYY-MM-DD)
+        end_date: 結束日期 (YYYY-MM-DD)
+        keyword: 標題關鍵字
+        source: 來源，'all' 或空值表示全部
+    """
+    query = select(*EXPORT_COLUMNS).order_by(Article.published_at.desc(), Article.id.desc())
+
+    if start_date and end_date:
+        start = datetime.strptime(f"{start_date} 00:00:00", '%Y-%m-%d %H:%M:%S')
+        end = datetime.strptime(f"{end_date} 23:59:59", '%Y-%m-%d %H:%M:%S')
+        query = query.where(Article.published_at.between(start, end))
+
+    if keyword:
+        condition, _ = search_filter(keyword, title_only=True)
+        query = query.where(condition)
+
+    if source and source != 'all':
+        query = query.where(Article.source == source)
+
+    return query
+
+
+def build_latest_query(source: Optional[str] = None, limit: Optional[int] = None) -> Select:
+    """建立最新文章匯出查詢
+
+    Args:
+        source: 來源，'all' 或空值表示全部
+        limit: 最多匯出筆數，None 表示不限制
+    """
+    query = select(*LATEST_COLUMNS).order_by(Article.published_at.desc(), Article.id.desc())
+    if source and source != 'all':
+        query = query.where(Article.source == source)
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def has_rows(query: Select) -> bool:
+    """查詢是否有任何結果"""
+    db = SessionLocal()
+    try:
+        return db.execute(query.limit(1)).first() is not None
+    finally:
+        db.close()
+
+
+def iter_rows(query: Select, chunk_size: Optional[int] = None) -> Iterator[Any]:
+    """以伺服器端游標逐批讀取
+
+    使用獨立的 session，讓回應串流期間連線保持開啟。
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    db = SessionLocal()
+    try:
+        result = db.execute(query.execution_options(stream_results=True, yield_per=chunk_size))
+        for row in result:
+            yield row
+    finally:
+        db.close()
+
+
+def format_row(row: Any) -> List[str]:
+    """轉換為匯出用的字串欄位"""
+    return [
+        str(row.id),
+        str(row.title or ''),
+        str(row.source or ''),
+        str(row.category or ''),
+        str(row.reporter or ''),
+        row.published_at.strftime('%Y-%m-%d %H:%M:%S'),
+        str(row.content or ''),
+        str(row.url or ''),
+        str(row.image_url or ''),
+    ]
+
+
+def stream_csv(query: Select, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """逐段產生 CSV（utf-8-sig，Excel 可直接開啟）
+
+    每累積 chunk_size 筆輸出一次，記憶體中最多只保留一個區塊。
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    encoder = codecs.getincrementalencoder('utf-8-sig')()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> bytes:
+        data = encoder.encode(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow(EXPORT_HEADER)
+    yield flush()
+
+    count = 0
+    for row in iter_rows(query, chunk_size):
+        writer.writerow(format_row(row))
+        count += 1
+        if count % chunk_size == 0:
+            yield flush()
+
+    yield flush() + encoder.encode('', final=True)
+    logger.info(f"CSV export finished: {count} articles")
+
+
+def format_latest_row(row: Any) -> List[Any]:
+    """最新文章 Excel 匯出的欄位值"""
+    return [
+        row.id,
+        row.title,
+        row.source,
+        row.url,
+        row.published_at,
+        row.created_at,
+        row.updated_at,
+        row.content,
+        row.description or '',
+    ]
+
+
+def _xlsx_value(value: Any) -> Any:
+    """移除 XML 不允許的字元並截斷過長的文字"""
+    if isinstance(value, str):
+        return XLSX_ILLEGAL_CHARACTERS.sub('', value)[:XLSX_MAX_CELL_LENGTH]
+    return value
+
+
+def write_xlsx(
+    query: Select,
+    header: List[str],
+    formatter: Callable[[Any], List[Any]],
+    sheet_name: str = '文章列表',
+    chunk_size: Optional[int] = None
+) -> str:
+    """以 openpyxl write-only 模式將查詢結果寫入暫存的 XLSX 檔
+
+    write-only 模式的列會直接寫入磁碟，記憶體用量不隨筆數增加。
+    呼叫者負責在傳送完成後刪除檔案。
+
+    Returns:
+        暫存檔路徑
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_name)
+    sheet.append(header)
+
+    count = 0
+    for row in iter_rows(query, chunk_size):
+        sheet.append([_xlsx_value(value) for value in formatter(row)])
+        count += 1
+
+    with NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
+        path = tmp.name
+    try:
+        workbook.save(path)
+    except Exception:
+        os.remove(path)
+        raise
+
+    logger.info(f"XLSX export finished: {count} articles")
+    return path
+
+
+def arrow_schema() -> "pa.Schema":
+    """欄式匯出的 Arrow schema"""
+    types = {
+        'int64': pa.int64(),
+        'string': pa.string(),
+        'timestamp': pa.timestamp('us'),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in ARROW_FIELDS])
+
+
+def iter_record_batches(query: Select, batch_size: Optional[int] = None) -> Iterator["pa.RecordBatch"]:
+    """將查詢結果轉為 Arrow RecordBatch，每批 batch_size 筆"""
+    batch_size = batch_size or settings.EXPORT_ROW_GROUP_SIZE
+    schema = arrow_schema()
+    names = [name for name, _ in ARROW_FIELDS]
+    columns = {name: [] for name in names}
+    count = 0
+
+    for row in iter_rows(query, min(batch_size, settings.EXPORT_CHUNK_SIZE)):
+        for name in names:
+            columns[name].append(getattr(row, name))
+        count += 1
+        if count == batch_size:
+            yield pa.RecordBatch.from_pydict(columns, schema=schema)
+            columns = {name: [] for name in names}
+            count = 0
+
+    if count:
+        yield pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def write_parquet(query: Select, row_group_size: Optional[int] = None) -> str:
+    """將查詢結果寫入暫存的 Parquet 檔，每批寫成一個 row group
+
+    Returns:
+        暫存檔路徑，呼叫者負責在傳送完成後刪除
+    """
+    with NamedTemporaryFile(suffix='.parquet', delete=False) as tmp:
+        path = tmp.name
+
+    count = 0
+    try:
+        with pq.ParquetWriter(path, arrow_schema(), compression='zstd') as writer:
+            for batch in iter_record_batches(query, row_group_size):
+                writer.write_batch(batch)
+                count += batch.num_rows
+    except Exception:
+        os.remove(path)
+        raise
+
+    logger.info(f"Parquet export finished: {count} articles")
+    return path
+
+
+class _ChunkSink:
+    """收集 Arrow 寫出的位元組，讓串流可以逐批送出"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def pop(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_arrow(query: Select, batch_size: Optional[int] = None) -> Iterator[bytes]:
+    """逐批產生 Arrow IPC stream 格式的資料"""
+    sink = _ChunkSink()
+    count = 0
+    with pa.ipc.new_stream(sink, arrow_schema()) as writer:
+        yield sink.pop()
+        for batch in iter_record_batches(query, batch_size):
+            writer.write_batch(batch)
+            count += batch.num_rows
+            yield sink.pop()
+    yield sink.pop()
+    logger.info(f"Arrow export finished: {count} articles")
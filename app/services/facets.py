@@ -0,0 +1,98 @@
+"""
+文章篩選面向（facet）快取
+來源、分類、各來源文章數與日期範圍變動不頻繁，
+彙總後快取一段時間，避免每次瀏覽都掃描整張表。
+
+爬蟲在 worker 行程寫入文章，網頁在另一個行程讀取，行程內的 clear() 無法通知對方，
+因此寫入端遞增資料庫中的版本（data_versions），讀取端以版本作為快取 key 的一部分，
+每次只需以主鍵查詢版本即可得知快取是否過時。TTL 仍作為未遞增版本的寫入（例如手動修改資料）的上限。
+"""
+import logging
+from typing import Any, Dict
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.article import Article
+from app.models.data_version import DataVersion
+
+logger = logging.getLogger(__name__)
+
+_facet_cache = TTLCache(ttl=settings.FACET_CACHE_TTL, max_entries=2)
+
+ARTICLES_VERSION = 'articles'
+
+
+def articles_version(db: Session) -> int:
+    """目前的文章資料版本，尚未寫入過時為 0"""
+    version = db.query(DataVersion.version).filter(DataVersion.name == ARTICLES_VERSION).scalar()
+    return version or 0
+
+
+def bump_articles_version(db: Session):
+    """遞增文章資料版本並提交"""
+    stmt = insert(DataVersion).values(name=ARTICLES_VERSION, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DataVersion.name],
+        set_={'version': DataVersion.version + 1, 'updated_at': func.now()}
+    )
+    db.execute(stmt)
+    db.commit()
+
+
+def compute_facets(db: Session) -> Dict[str, Any]:
+    """彙總篩選面向
+
+    Returns:
+        dict: sources、source_counts、categories、earliest、latest、total
+    """
+    source_rows = (
+        db.query(
+            Article.source,
+            func.count(Article.id),
+            func.min(Article.published_at),
+            func.max(Article.published_at)
+        )
+        .group_by(Article.source)
+        .order_by(Article.source)
+        .all()
+    )
+    category_rows = (
+        db.query(Article.category)
+        .filter(Article.category.isnot(None))
+        .group_by(Article.category)
+        .order_by(func.count(Article.id).desc())
+        .limit(settings.FACET_MAX_CATEGORIES)
+        .all()
+    )
+
+    earliest = [row[2] for row in source_rows if row[2]]
+    latest = [row[3] for row in source_rows if row[3]]
+    return {
+        'sources': [row[0] for row in source_rows],
+        'source_counts': {row[0]: row[1] for row in source_rows},
+        'categories': [row[0] for row in category_rows],
+        'earliest': min(earliest) if earliest else None,
+        'latest': max(latest) if latest else None,
+        'total': sum(row[1] for row in source_rows),
+    }
+
+
+def get_facets(db: Session) -> Dict[str, Any]:
+    """取得篩選面向，資料版本變動或快取過期時重新彙總
+
+    Returns:
+        dict: compute_facets 的結果，另含彙總時的資料版本 version，
+            可作為其他統計快取（例如 count_cache）的 key
+    """
+    version = articles_version(db)
+    return _facet_cache.get_or_set(('facets', version), lambda: {**compute_facets(db), 'version': version})
+
+
+def invalidate_facets(db: Session):
+    """寫入文章後呼叫：遞增資料版本，所有行程的統計快取隨之失效"""
+    bump_articles_version(db)
+    _facet_cache.clear()
@@ -0,0 +1,83 @@
+import asyncio
+from collections import Counter
+
+import httpx
+
+from app.services.crawler.async_fetcher import AsyncFetcher
+from app.services.crawler.base import BaseCrawler
+from app.services.crawler.rate_limiter import rate_limiter
+
+
+class ConcurrencyTracker:
+    """以 httpx.MockTransport 回應，記錄每個網域同時進行的請求數"""
+
+    def __init__(self, missing=()):
+        self.active = Counter()
+        self.peak = Counter()
+        self.missing = set(missing)
+
+    async def __call__(self, request):
+        host = request.url.host
+        self.active[host] += 1
+        self.peak[host] = max(self.peak[host], self.active[host])
+        await asyncio.sleep(0.01)
+        self.active[host] -= 1
+
+        path = request.url.path
+        if path.endswith('/404'):
+            return httpx.Response(404)
+        body = f'<div class="shell">{path}</div>' if path in self.missing else f'<div class="story">{path}</div>'
+        return httpx.Response(200, text=body)
+
+
+def test_fetch_all_limits_concurrency_per_host(monkeypatch):
+    """每個網域同時連線數不超過 max_per_domain，結果順序與網址相同"""
+    tracker = ConcurrencyTracker()
+    monkeypatch.setattr(AsyncFetcher, 'transport', httpx.MockTransport(tracker))
+    monkeypatch.setattr(rate_limiter, 'enabled', False)
+    urls = [f"https://{host}/news/{i}" for i in range(6) for host in ('a.example', 'b.example')]
+    urls.append('https://a.example/404')
+
+    async def fetch():
+        async with AsyncFetcher(max_per_domain=2) as fetcher:
+            return await fetcher.fetch_all(urls)
+
+    pages = asyncio.run(fetch())
+
+    assert tracker.peak == {'a.example': 2, 'b.example': 2}
+    assert pages[:-1] == [f'<div class="story">/news/{i}</div>' for i in range(6) for _ in range(2)]
+    assert pages[-1] is None
+
+
+class DummyCrawler(BaseCrawler):
+    def __init__(self):
+        super().__init__()
+        self.source_name = 'async-test'
+        self.article_selector = 'div.story'
+        self.fallbacks = []
+
+    async def crawl_list(self, page=1):
+        return []
+
+    async def crawl_article(self, article_info):
+        self.fallbacks.append(article_info['url'])
+        return {'url': article_info['url'], 'via': 'crawl_article'}
+
+    def parse_article(self, soup, article_info):
+        return {'url': article_info['url'], 'via': 'async', 'text': soup.select_one('div.story').text}
+
+
+def test_crawl_articles_falls_back_for_invalid_pages(monkeypatch):
+    """未通過 article_selector 驗證或抓取失敗的文章改走 crawl_article"""
+    tracker = ConcurrencyTracker(missing={'/news/2'})
+    monkeypatch.setattr(AsyncFetcher, 'transport', httpx.MockTransport(tracker))
+    monkeypatch.setattr(rate_limiter, 'enabled', False)
+    crawler = DummyCrawler()
+    infos = [{'url': f'https://a.example/news/{i}'} for i in range(4)] + [{'url': 'https://a.example/404'}]
+
+    results = asyncio.run(crawler.crawl_articles(infos))
+
+    assert [r['via'] for r in results] == ['async', 'async', 'crawl_article', 'async', 'crawl_article']
+    assert results[1]['text'] == '/news/1'
+    assert crawler.fallbacks == ['https://a.example/news/2', 'https://a.example/404']
+    assert crawler.pages_visited == 5
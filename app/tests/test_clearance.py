@@ -0,0 +1,128 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from app.core.config import settings
+from app.services.crawler import edgeprop_crawler
+from app.services.crawler.clearance import ClearanceStore, is_challenge
+from app.services.crawler.edgeprop_crawler import EdgePropCrawler
+from app.services.crawler.http_client import HAS_CLOUDSCRAPER
+from app.services.crawler.rate_limiter import rate_limiter
+
+CHALLENGE = '<html><head><title>Just a moment...</title></head><body>cf_chl_opt</body></html>'
+PAGE = '<html><body><div id="content-top"><h1>EdgeProp news</h1></div></body></html>'
+USER_AGENT = 'Mozilla/5.0 test'
+
+
+def _cookie(name, value, domain='127.0.0.1', expires=None):
+    return {'name': name, 'value': value, 'domain': domain, 'path': '/', 'expires': expires, 'secure': False}
+
+
+def test_store_roundtrip_and_expiry(tmp_path):
+    """clearance 跨實例共用（檔案），過期或失效後不再回傳"""
+    store = ClearanceStore(state_dir=str(tmp_path), ttl=60)
+    url = 'https://www.edgeprop.my/news'
+
+    # 只有 __cf_bm 不算通過 challenge
+    assert store.save(url, [_cookie('__cf_bm', 'x')], USER_AGENT) is None
+    saved = store.save(url, [_cookie('cf_clearance', 'ok'), _cookie('session', 'drop')], USER_AGENT)
+    assert [c['name'] for c in saved['cookies']] == ['cf_clearance']
+
+    other = ClearanceStore(state_dir=str(tmp_path), ttl=60)
+    assert other.get('https://www.edgeprop.my/content/1')['user_agent'] == USER_AGENT
+
+    store.invalidate(url)
+    assert other.get(url) is not None  # 行程內的副本仍有效
+    assert ClearanceStore(state_dir=str(tmp_path)).get(url) is None
+
+    store.save(url, [_cookie('cf_clearance', 'old', expires=time.time() - 1)], USER_AGENT)
+    assert store.get(url) is None
+
+
+class FakeDriver:
+    """模擬通過 challenge 的瀏覽器"""
+
+    def __init__(self):
+        self.loads = 0
+        self.page_source = ''
+
+    def get(self, url):
+        self.loads += 1
+        self.page_source = PAGE
+
+    def get_cookies(self):
+        return [{'name': 'cf_clearance', 'value': 'solved', 'domain': '127.0.0.1', 'path': '/'}]
+
+    def execute_script(self, script):
+        return USER_AGENT
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+
+@pytest.mark.skipif(not HAS_CLOUDSCRAPER, reason="未安裝 cloudscraper")
+def test_edgeprop_reuses_clearance(tmp_path, monkeypatch):
+    """瀏覽器解一次 challenge 後，後續頁面由 HTTP session 帶著 clearance 直接取得"""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            cleared = 'cf_clearance=solved' in (self.headers.get('Cookie') or '') \
+                and self.headers.get('User-Agent') == USER_AGENT
+            hits.append(cleared)
+            body = (PAGE if cleared else CHALLENGE).encode()
+            self.send_response(200 if cleared else 403)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        monkeypatch.setattr(rate_limiter, 'enabled', False)
+        monkeypatch.setattr(edgeprop_crawler, 'clearance_store', ClearanceStore(state_dir=str(tmp_path)))
+        monkeypatch.setattr(
+            settings, 'CRAWLER_ORIGIN_OVERRIDES', {'https://www.edgeprop.my': f"http://127.0.0.1:{server.server_port}"}
+        )
+        session = requests.Session()
+        crawler = EdgePropCrawler()
+        crawler.http_client = SimpleNamespace(scraper=lambda url: session)
+        crawler.uc_driver = FakeDriver()
+        crawler._browser_ready = True
+
+        assert crawler.fetch_html('https://www.edgeprop.my/news') == PAGE
+        assert crawler.fetch_html('https://www.edgeprop.my/content/1') == PAGE
+        assert crawler.fetch_html('https://www.edgeprop.my/content/2') == PAGE
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert crawler.uc_driver.loads == 1
+    assert hits == [False, True, True]
+    assert is_challenge(CHALLENGE) and not is_challenge(PAGE)
+
+
+def test_pooled_browser_fallback_counts_once(tmp_path, monkeypatch):
+    """改用 Driver 池的瀏覽器時只做一次速率等待與計數，也不會清除 cookie"""
+    acquired = []
+    monkeypatch.setattr(rate_limiter, 'acquire', lambda url: acquired.append(url))
+    monkeypatch.setattr(edgeprop_crawler, 'HAS_CLOUDSCRAPER', False)
+    monkeypatch.setattr(edgeprop_crawler, 'clearance_store', ClearanceStore(state_dir=str(tmp_path)))
+
+    driver = FakeDriver()
+    driver.delete_all_cookies = lambda: pytest.fail("不應清除 clearance cookie")
+    crawler = EdgePropCrawler()
+    crawler.driver = driver
+    crawler._browser_ready = True
+
+    assert crawler.fetch_html('https://www.edgeprop.my/news') == PAGE
+    assert acquired == ['https://www.edgeprop.my/news']
+    assert crawler.pages_visited == 1
+    assert driver.loads == 1
@@ -0,0 +1,33 @@
+from app.services.crawler.content_cleaner import ContentCleaner, get_cleaner
+from app.services.crawler.ltn_crawler import LTNCrawler
+
+
+def test_clean_removes_ads_blank_and_duplicate_lines():
+    """應移除廣告文字、空白行與重複行，並壓縮空白"""
+    cleaner = ContentCleaner(["點我下載APP", "延伸閱讀"])
+    content = "第一段  內容\n\n點我下載APP\n第二段\t內容\n第一段  內容\n延伸閱讀：第三段"
+
+    assert cleaner.clean(content) == "第一段 內容 第二段 內容 ：第三段"
+
+
+def test_longer_ads_take_precedence():
+    """較長的廣告文字應完整移除，不受其前綴影響"""
+    cleaner = ContentCleaner(["相關新聞", "相關新聞影音"])
+
+    assert cleaner.clean("正文\n相關新聞影音") == "正文"
+
+
+def test_remove_ads_keeps_line_breaks():
+    """remove_ads 只移除廣告，保留段落換行"""
+    cleaner = ContentCleaner(["按我看活動辦法"])
+
+    assert cleaner.remove_ads("第一段\n按我看活動辦法\n第二段") == "第一段\n\n第二段"
+
+
+def test_crawler_cleaner_compiled_once():
+    """相同廣告列表的爬蟲共用同一個已編譯的清理器，且包含預設廣告文字"""
+    first, second = LTNCrawler(), LTNCrawler()
+
+    assert first.content_cleaner is second.content_cleaner
+    assert first.content_cleaner is get_cleaner(LTNCrawler.ad_texts)
+    assert first.clean_content("內容 請繼續往下閱讀... 更多房產新聞") == "內容"
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.core.config import settings
+from app.models.crawl_job import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, CrawlJob, CrawlRun
+from app.services.crawl_queue import source_limit
+from app.services.crawl_runner import article_to_row, get_crawler
+
+
+def test_active_jobs_unique_per_source_and_range():
+    """同一來源、同一日期範圍只能有一個排隊中或執行中的任務，未指定日期也要去重"""
+    index = next(i for i in CrawlJob.__table__.indexes if i.name == 'uq_crawl_jobs_active')
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+
+    assert ddl.startswith("CREATE UNIQUE INDEX")
+    assert "coalesce(start_date" in ddl and "coalesce(end_date" in ddl
+    assert "WHERE status IN ('queued', 'running')" in ddl
+
+
+def test_source_limit(monkeypatch):
+    """個別來源的上限覆寫預設值"""
+    monkeypatch.setattr(settings, 'CRAWL_QUEUE_MAX_PER_SOURCE', 1)
+    monkeypatch.setattr(settings, 'CRAWL_QUEUE_SOURCE_LIMITS', {'ettoday': 2})
+
+    assert source_limit('ettoday') == 2
+    assert source_limit('edgeprop') == 1
+
+
+def test_article_to_row():
+    """dict 與 Article 物件都轉為相同的欄位，來源以任務為準"""
+    published_at = datetime(2025, 1, 1)
+    row = article_to_row({'url': 'https://example.com/a', 'title': '標題', 'published_at': published_at}, 'ltn')
+
+    assert row['url'] == 'https://example.com/a'
+    assert row['source'] == 'ltn'
+    assert row['reporter'] is None
+    assert get_crawler('unknown') is None
+
+
+def test_crawl_run_summary():
+    """CrawlRun 由各來源任務彙總狀態、數量與耗時"""
+    started = datetime(2025, 1, 1, 8, 0, 0)
+    run = CrawlRun(trigger='schedule')
+    run.jobs = [
+        CrawlJob(source='ltn', status=JOB_SUCCEEDED, articles_found=10, pages_visited=3, saved_count=8,
+                 updated_count=2, started_at=started, finished_at=started + timedelta(seconds=30)),
+        CrawlJob(source='udn', status=JOB_QUEUED),
+    ]
+
+    assert run.status == JOB_RUNNING
+    assert run.finished_at is None
+    assert run.articles_found == 10 and run.pages_visited == 3
+    assert run.jobs[0].duration_seconds == 30
+
+    run.jobs[1].status = JOB_FAILED
+    run.jobs[1].error = 'timeout'
+    run.jobs[1].started_at = started + timedelta(seconds=5)
+    run.jobs[1].finished_at = started + timedelta(seconds=60)
+
+    assert run.status == JOB_FAILED
+    assert run.duration_seconds == 60
@@ -8,6 +8,7 @@ from app.services.crawler.edgeprop_crawler import EdgePropCrawler
 from app.services.crawler.starproperty_crawler import StarPropertyCrawler
 from app.services.crawler.freemalaysiatoday_crawler import FreeMalaysiaTodayCrawler
 from app.services.crawler.hk852house_crawler import House852Crawler
+from app.services.crawl_runner import run_crawl
 from app.core.database import SessionLocal
 from app.models.article import Article
 import pytest
@@ -30,110 +31,20 @@ logger = logging.getLogger(__name__)
 # 資料庫連線設定
 DATABASE_URL = "postgresql://user:password@db:5432/newsdb"
 
-def get_crawler(crawler_name: str):
-	"""根據名稱取得對應的爬蟲實例"""
-	crawlers = {
-		'ltn': LTNCrawler(),
-		'udn': UDNCrawler(),
-		'nextapple': NextAppleCrawler(),
-		'ettoday': EttodayCrawler(),
-		'edgeprop': EdgePropCrawler(),
-		'starproperty': StarPropertyCrawler(),
-		'freemalaysiatoday': FreeMalaysiaTodayCrawler(),
-		'hk852house': House852Crawler()
-	}
-	return crawlers.get(crawler_name)
-
 @pytest.mark.asyncio
-async def test_crawler(crawler_type="ltn", start_date=None, end_date=None):
-	"""測試爬蟲"""
-	try:
-		# 根據參數選擇爬蟲
-		crawler = get_crawler(crawler_type.lower())
-		if not crawler:
-			raise ValueError(f"未知的爬蟲類型: {crawler_type}")
-
-		logger.info(f"開始爬取 {crawler_type} 文章 (日期範圍: {start_date} ~ {end_date})...")
-		
-		# 初始化 driver (如果爬蟲需要的話)
-		if hasattr(crawler, 'setup_driver'):
-			crawler.setup_driver()
-		
-		try:
-			# 根據不同爬蟲使用對應的方法
-			if crawler_type.lower() == "ltn":
-				articles = await crawler.crawl(start_date=start_date, end_date=end_date)
-			elif crawler_type.lower() == "udn":
-				articles = await crawler.crawl(start_date=start_date, end_date=end_date)
-			elif crawler_type.lower() == "nextapple":
-				articles = crawler.crawl(start_date=start_date, end_date=end_date)
-			elif crawler_type.lower() == "ettoday":
-				articles = await crawler.crawl(start_date=start_date, end_date=end_date)
-			elif crawler_type.lower() == "edgeprop":
-				articles = await crawler.crawl(start_date=start_date, end_date=end_date)
-			elif crawler_type.lower() == "starproperty":
-				articles = await crawler.crawl(start_date=start_date, end_date=end_date)
-			elif crawler_type.lower() == "freemalaysiatoday":
-				articles = await crawler.crawl(start_date=start_date, end_date=end_date)
-			elif crawler_type.lower() == "hk852house":
-				articles = await crawler.crawl(start_date=start_date, end_date=end_date)
-			else:
-				raise ValueError(f"未知的爬蟲類型: {crawler_type}")
-			
-			logger.info(f"爬取到 {len(articles)} 篇文章")
-			
-			# 存入資料庫（使用批次操作）
-			db = SessionLocal()
-			try:
-				from app.core.db_utils import batch_upsert_articles
+async def test_crawler(crawler_type="ltn", start_date=None, end_date=None, stop_on_known_page=None):
+	"""測試爬蟲
 
-				# 準備文章資料
-				article_data_list = []
-				for article in articles:
-					if isinstance(article, dict):
-						article_data = {
-							'url': article.get('url'),
-							'title': article.get('title'),
-							'content': article.get('content'),
-							'published_at': article.get('published_at'),
-							'source': crawler_type.lower(),
-							'image_url': article.get('image_url'),
-							'description': article.get('description'),
-							'category': article.get('category'),
-							'reporter': article.get('reporter'),
-						}
-					else:
-						article_data = {
-							'url': article.url,
-							'title': article.title,
-							'content': article.content,
-							'published_at': article.published_at,
-							'source': crawler_type.lower(),
-							'image_url': article.image_url,
-							'description': article.description,
-							'category': getattr(article, 'category', None),
-							'reporter': getattr(article, 'reporter', None),
-						}
-					article_data_list.append(article_data)
-
-				# 批次 upsert
-				saved_count, updated_count = batch_upsert_articles(db, article_data_list, batch_size=50)
-
-				logger.info(f"完成！新增: {saved_count} 篇，更新: {updated_count} 篇")
-				return len(articles)
-
-			except Exception as e:
-				logger.error(f"資料庫操作失敗: {str(e)}")
-				db.rollback()
-				raise
-			finally:
-				db.close()
-				
-		finally:
-			# 如果爬蟲有 cleanup 方法，就呼叫它
-			if hasattr(crawler, 'cleanup'):
-				crawler.cleanup()
-				
+	stop_on_known_page 為 None 時依 CRAWLER_STOP_ON_KNOWN_PAGE 設定；
+	回補缺漏文章時應傳入 False，避免遇到已收錄的頁面就停止。
+	"""
+	try:
+		return await run_crawl(
+			crawler_type.lower(),
+			start_date=start_date,
+			end_date=end_date,
+			stop_on_known_page=stop_on_known_page
+		)
 	except Exception as e:
 		logger.error(f"爬蟲執行失敗: {str(e)}")
 		raise
@@ -198,7 +109,7 @@ def test_nextapple_crawler():
 		logging.info("爬蟲實例化完成，開始爬取文章...")
 		
 		# 爬取文章
-		articles = crawler.crawl()
+		articles = asyncio.run(crawler.crawl())
 		logging.info(f"爬取完成，共取得 {len(articles)} 篇文章")
 		
 		# 儲存到資料庫
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from app.services.crawler.date_parser import DateParser
+
+
+def test_fast_paths():
+    """常見格式應由快速路徑直接解析"""
+    parser = DateParser()
+
+    assert parser.parse("2025-01-02 12:30") == datetime(2025, 1, 2, 12, 30)
+    assert parser.parse("2025/1/2") == datetime(2025, 1, 2)
+    assert parser.parse("2025-01-02T08:09:10") == datetime(2025, 1, 2, 8, 9, 10)
+    assert parser.parse("Mei 5, 2025 @ 3:45pm") == datetime(2025, 5, 5, 15, 45)
+    assert parser.parse("5 Ogos 2025") == datetime(2025, 8, 5)
+    assert parser.parse("Monday, 21 Apr 2025 17:04 PM") == datetime(2025, 4, 21, 17, 4)
+    assert parser.parse("02 Jan 2025 | Updated 3 days ago") == datetime(2025, 1, 2)
+    assert set(parser.hits) == {'iso', 'day_month_year', 'month_day_year'}
+
+
+def test_fallback_remembers_last_format():
+    """快速路徑未命中時退回 strptime，並優先嘗試上次成功的格式"""
+    parser = DateParser(source='test')
+
+    assert parser.parse("13/01/2025") == datetime(2025, 1, 13)
+    assert parser.last_format == '%d/%m/%Y'
+    assert parser.parse("02/01/2025") == datetime(2025, 1, 2)
+    assert parser.hits['%d/%m/%Y'] == 2
+
+
+def test_invalid_dates_and_stats():
+    """無法解析時回傳 None，並計入命中率統計"""
+    parser = DateParser()
+
+    assert parser.parse("") is None
+    assert parser.parse("2025-02-30") is None
+    assert parser.parse("2025-01-01") == datetime(2025, 1, 1)
+    assert parser.stats() == {'failed': 0.5, 'iso': 0.5}
+
+
+def test_ambiguous_format_not_promoted():
+    """解析過只符合 %m/%d/%Y 的日期後，同一個有歧義的字串結果不變"""
+    parser = DateParser(source='test')
+
+    before = parser.parse('02/01/2025')
+    assert parser.parse('01/13/2025') == datetime(2025, 1, 13)
+    after = parser.parse('02/01/2025')
+
+    assert before == after == datetime(2025, 1, 2)
+    assert parser.last_format != '%m/%d/%Y'
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.db_utils import COPY_COLUMNS, _copy_buffer, _group_by_columns, _upsert_statement
+
+
+def test_upsert_statement_is_single_multi_row_insert():
+    """整批文章應編譯為單一 INSERT，並以 RETURNING 回報插入或更新"""
+    stmt = _upsert_statement([
+        {'url': "https://example.com/a", 'title': "A", 'source': "ltn"},
+        {'url': "https://example.com/b", 'title': "B", 'source': "ltn"},
+    ])
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("INSERT INTO articles") == 1
+    assert "url_m1" in sql
+    assert "ON CONFLICT (url) DO UPDATE" in sql
+    assert "RETURNING xmax = 0" in sql
+
+
+def test_mixed_shape_batch_keeps_server_defaults():
+    """欄位不同的資料分開寫入，缺少 updated_at 的資料不應送出 NULL"""
+    rows = [
+        {'url': "https://example.com/a", 'title': "A", 'source': "ltn"},
+        {'url': "https://example.com/b", 'title': "B", 'source': "ltn", 'updated_at': datetime(2025, 1, 7)},
+        {'url': "https://example.com/c", 'title': "C", 'source': "ltn"},
+    ]
+    groups = _group_by_columns(rows)
+
+    assert [[row['url'][-1] for row in group] for group in groups] == [['a', 'c'], ['b']]
+    plain = str(_upsert_statement(groups[0]).compile(dialect=postgresql.dialect()))
+    insert_columns = plain.split(') VALUES')[0]
+    assert 'updated_at' not in insert_columns and 'created_at' not in insert_columns
+    assert 'updated_at' in str(_upsert_statement(groups[1]).compile(dialect=postgresql.dialect())).split(') VALUES')[0]
+
+
+def test_copy_buffer_escapes_values():
+    """COPY 輸入應跳脫特殊字元，None 轉為 \\N"""
+    buffer = _copy_buffer([{
+        'url': "https://example.com/a",
+        'title': "標題\t含 tab",
+        'content': "第一段\n第二段\\",
+        'published_at': datetime(2025, 1, 7, 8, 30),
+    }])
+    fields = buffer.read().rstrip('\n').split('\t')
+    row = dict(zip(COPY_COLUMNS, fields))
+
+    assert row['title'] == "標題\\t含 tab"
+    assert row['content'] == "第一段\\n第二段\\\\"
+    assert row['category'] == "\\N"
+    assert row['published_at'] == "2025-01-07T08:30:00"
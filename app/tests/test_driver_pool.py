@@ -0,0 +1,96 @@
+import pytest
+from app.services.crawler.driver_pool import DriverPool
+
+
+class FakeDriver:
+    """模擬 WebDriver，記錄是否被關閉"""
+
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+
+    def get(self, url):
+        pass
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("browser crashed")
+        return 1
+
+    def quit(self):
+        self.closed = True
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def factory(needs_javascript=True, stealth_mode=False):
+        driver = FakeDriver()
+        created.append(driver)
+        return driver
+
+    pool = DriverPool(driver_factory=factory, **kwargs)
+    return pool, created
+
+
+def test_driver_reused_after_release():
+    """歸還後的 driver 應被下一個爬蟲沿用，而非重新啟動"""
+    pool, created = make_pool(max_size=2, max_page_loads=10, acquire_timeout=1)
+
+    driver = pool.acquire()
+    pool.release(driver)
+    again = pool.acquire()
+
+    assert again is driver
+    assert len(created) == 1
+
+
+def test_pool_size_is_bounded():
+    """池滿時租用應等待，逾時則拋出 TimeoutError"""
+    pool, created = make_pool(max_size=1, max_page_loads=10, acquire_timeout=0.1)
+
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    assert len(created) == 1
+
+
+def test_driver_recycled_after_max_page_loads():
+    """達到頁面載入上限的 driver 歸還時應被關閉"""
+    pool, created = make_pool(max_size=1, max_page_loads=2, acquire_timeout=1)
+
+    driver = pool.acquire()
+    driver.get("https://example.com/1")
+    driver.get("https://example.com/2")
+    pool.release(driver)
+
+    assert created[0].closed
+    assert pool.acquire() is not driver
+    assert len(created) == 2
+
+
+def test_unhealthy_driver_replaced():
+    """健康檢查失敗的閒置 driver 應被替換"""
+    pool, created = make_pool(max_size=1, max_page_loads=10, acquire_timeout=1)
+
+    driver = pool.acquire()
+    pool.release(driver)
+    created[0].healthy = False
+
+    replacement = pool.acquire()
+    assert replacement is not driver
+    assert created[0].closed
+    assert pool.size == 1
+
+
+def test_idle_driver_with_other_options_evicted():
+    """池滿且只有其他設定的閒置 driver 時，應關閉它騰出位置"""
+    pool, created = make_pool(max_size=1, max_page_loads=10, acquire_timeout=1)
+
+    driver = pool.acquire(needs_javascript=True)
+    pool.release(driver)
+    other = pool.acquire(needs_javascript=False)
+
+    assert other.key == (False, False)
+    assert created[0].closed
+    assert pool.size == 1
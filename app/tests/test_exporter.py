@@ -0,0 +1,85 @@
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from openpyxl import load_workbook
+
+from app.services import exporter
+
+
+def make_rows(count):
+    return [
+        SimpleNamespace(
+            id=i, title=f"標題{i}", source="ltn", category=None, reporter=None,
+            published_at=datetime(2025, 1, 7, 8, 0), content="內文,含逗號", url=f"https://example.com/{i}",
+            image_url=None
+        )
+        for i in range(count)
+    ]
+
+
+def test_csv_streamed_in_chunks(monkeypatch):
+    """CSV 應分段輸出，BOM 只出現在開頭"""
+    monkeypatch.setattr(exporter, 'iter_rows', lambda query, chunk_size=None: iter(make_rows(5)))
+
+    chunks = list(exporter.stream_csv(query=None, chunk_size=2))
+    data = b''.join(chunks)
+
+    assert len(chunks) > 3
+    assert data.startswith(b'\xef\xbb\xbf')
+    assert data.count(b'\xef\xbb\xbf') == 1
+
+    lines = data.decode('utf-8-sig').splitlines()
+    assert lines[0].startswith('ID,標題')
+    assert lines[1] == '0,標題0,ltn,,,2025-01-07 08:00:00,"內文,含逗號",https://example.com/0,'
+    assert len(lines) == 6
+
+
+def test_xlsx_written_from_cursor(monkeypatch):
+    """XLSX 應逐列寫入，並移除 Excel 不接受的控制字元"""
+    rows = [
+        SimpleNamespace(
+            id=i, title=f"標題{i}\x0b", source="ltn", url=f"https://example.com/{i}",
+            published_at=datetime(2025, 1, 7, 8, 0), created_at=datetime(2025, 1, 7, 9, 0),
+            updated_at=datetime(2025, 1, 7, 9, 0), content="內文", description=None
+        )
+        for i in range(3)
+    ]
+    monkeypatch.setattr(exporter, 'iter_rows', lambda query, chunk_size=None: iter(rows))
+
+    path = exporter.write_xlsx(None, exporter.LATEST_HEADER, exporter.format_latest_row)
+    try:
+        sheet = load_workbook(path, read_only=True).active
+        values = list(sheet.values)
+    finally:
+        os.remove(path)
+
+    assert values[0][0] == 'ID'
+    assert len(values) == 4
+    assert values[1][:3] == (0, '標題0', 'ltn')
+    assert values[1][4] == datetime(2025, 1, 7, 8, 0)
+
+
+def test_parquet_and_arrow_keep_types(monkeypatch):
+    """Parquet 與 Arrow 匯出應保留欄位型別"""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    monkeypatch.setattr(exporter, 'iter_rows', lambda query, chunk_size=None: iter(make_rows(5)))
+
+    path = exporter.write_parquet(None, row_group_size=2)
+    try:
+        parquet_file = pq.ParquetFile(path)
+        table = parquet_file.read()
+    finally:
+        os.remove(path)
+
+    assert parquet_file.num_row_groups == 3
+    assert table.num_rows == 5
+    assert table.schema.field('published_at').type == pa.timestamp('us')
+    assert table.column('id').to_pylist() == [0, 1, 2, 3, 4]
+
+    data = b''.join(exporter.stream_arrow(None, batch_size=2))
+    streamed = pa.ipc.open_stream(data).read_all()
+    assert streamed.equals(table)
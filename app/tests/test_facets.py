@@ -0,0 +1,46 @@
+from app.services import facets
+
+
+def test_facets_cached_until_invalidated(monkeypatch):
+    """彙總結果應被快取，寫入文章後清除快取才重新彙總"""
+    calls = []
+    versions = [0]
+
+    def fake_compute(db):
+        calls.append(db)
+        return {'sources': ['ltn'], 'total': len(calls)}
+
+    monkeypatch.setattr(facets, 'compute_facets', fake_compute)
+    monkeypatch.setattr(facets, 'articles_version', lambda db: versions[0])
+    monkeypatch.setattr(facets, 'bump_articles_version', lambda db: versions.__setitem__(0, versions[0] + 1))
+    facets._facet_cache.clear()
+
+    assert facets.get_facets('db')['total'] == 1
+    assert facets.get_facets('db')['total'] == 1
+
+    facets.invalidate_facets('db')
+    assert facets.get_facets('db')['total'] == 2
+    assert facets.get_facets('db')['version'] == 1
+
+
+def test_facets_recomputed_when_version_changes_in_other_process(monkeypatch):
+    """其他行程遞增資料版本後（本行程未清除快取），應重新彙總"""
+    calls = []
+    versions = [5]
+
+    def fake_compute(db):
+        calls.append(db)
+        return {'sources': ['ltn'], 'total': len(calls)}
+
+    monkeypatch.setattr(facets, 'compute_facets', fake_compute)
+    monkeypatch.setattr(facets, 'articles_version', lambda db: versions[0])
+    facets._facet_cache.clear()
+
+    assert facets.get_facets('db')['total'] == 1
+    assert facets.get_facets('db')['total'] == 1
+
+    # worker 行程寫入文章，只改變資料庫中的版本
+    versions[0] = 6
+    assert facets.get_facets('db')['total'] == 2
+    assert facets.get_facets('db')['version'] == 6
+    assert len(facets._facet_cache._entries) <= 2
@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime
+
+from app.core.config import settings
+from app.services.crawler.base import BaseCrawler, BrowserFetcher, HttpFetcher
+
+STATIC_PAGE = '<html><body><div class="shell"></div></body></html>'
+RENDERED_PAGE = '<html><body><div class="article">內容</div></body></html>'
+
+
+class StubHttpFetcher(HttpFetcher):
+    def __init__(self, html):
+        self.html = html
+        self.calls = 0
+
+    def fetch(self, crawler, url, validate_selector=None, wait_timeout=None):
+        self.calls += 1
+        return self.html
+
+
+class StubBrowserFetcher(BrowserFetcher):
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, crawler, url, validate_selector=None, wait_timeout=None):
+        self.calls += 1
+        return RENDERED_PAGE
+
+
+class DummyCrawler(BaseCrawler):
+    async def crawl_list(self, page=1):
+        return []
+
+    async def crawl_article(self, url):
+        return None
+
+
+def make_crawler(http_html):
+    crawler = DummyCrawler()
+    crawler.fetchers = [StubHttpFetcher(http_html), StubBrowserFetcher()]
+    return crawler, crawler.fetchers[0], crawler.fetchers[1]
+
+
+def test_http_page_with_selector_skips_browser():
+    """HTTP 取得的頁面包含 selector 時不使用瀏覽器"""
+    crawler, http, browser = make_crawler(RENDERED_PAGE)
+
+    soup = crawler.fetch_page('https://example.com/1', validate_selector='div.article')
+
+    assert soup.select_one('div.article').text == '內容'
+    assert (http.calls, browser.calls) == (1, 0)
+
+
+def test_missing_selector_escalates_to_browser():
+    """HTTP 頁面缺少 selector（需要 JavaScript）時改用瀏覽器"""
+    crawler, http, browser = make_crawler(STATIC_PAGE)
+
+    soup = crawler.fetch_page('https://example.com/1', validate_selector='div.article')
+
+    assert soup.select_one('div.article') is not None
+    assert (http.calls, browser.calls) == (1, 1)
+
+
+def test_http_is_skipped_after_miss_limit(monkeypatch):
+    """HTTP 連續未通過驗證達 CRAWLER_HTTP_MISS_LIMIT 次後，本次執行直接使用瀏覽器"""
+    monkeypatch.setattr(settings, 'CRAWLER_HTTP_MISS_LIMIT', 2)
+    crawler, http, browser = make_crawler(STATIC_PAGE)
+
+    for i in range(4):
+        assert crawler.fetch_page(f'https://example.com/{i}', validate_selector='div.article') is not None
+
+    assert http.calls == 2
+    assert browser.calls == 4
+
+
+def test_run_with_http_pages_never_leases_browser(monkeypatch):
+    """所有頁面都由 HTTP 取得時，run 不應租用瀏覽器"""
+    class ListCrawler(DummyCrawler):
+        async def crawl_list(self, page=1):
+            if page > 2:
+                return []
+            return [{'url': f'https://example.com/{page}', 'published_at': datetime(2025, 1, 7)}]
+
+        async def crawl_article(self, article_info):
+            soup = self.fetch_page(article_info['url'], validate_selector='div.article')
+            return {'url': article_info['url'], 'content': soup.select_one('div.article').text}
+
+    crawler = ListCrawler()
+    crawler.fetchers = [StubHttpFetcher(RENDERED_PAGE), BrowserFetcher()]
+    leases = []
+    monkeypatch.setattr(crawler, 'setup_driver', lambda *args, **kwargs: leases.append(1))
+
+    articles = asyncio.run(crawler.run())
+
+    assert [article['content'] for article in articles] == ['內容', '內容']
+    assert leases == []
@@ -0,0 +1,38 @@
+import pytest
+
+from app.services.crawler.base import HAS_LXML, HtmlParser
+
+PAGE = """
+<html><head><title>標題</title></head>
+<body>
+  <div class="nav">選單</div>
+  <div class="story"><p>第一段</p><p>第二段</p></div>尾巴
+  <div class="story"><p>其他</p></div>
+</body></html>
+"""
+
+
+def test_parse_container_subtree():
+    """指定容器時只回傳第一個符合的元素，不含其後的文字"""
+    story = HtmlParser().parse(PAGE, '.story')
+
+    assert story.name == 'div'
+    assert story.get_text('|', strip=True) == '第一段|第二段'
+    assert story.select_one('.nav') is None
+
+
+def test_parse_full_page_and_missing_container():
+    """未指定容器時解析整頁；找不到容器或內容為空時回傳 None"""
+    parser = HtmlParser()
+
+    assert parser.parse(PAGE).select_one('title').get_text() == '標題'
+    assert parser.parse(PAGE, 'article') is None
+    assert parser.parse('', '.story') is None
+
+
+@pytest.mark.skipif(not HAS_LXML, reason="需要 lxml")
+def test_selector_compiled_once():
+    """相同的 selector 只編譯一次"""
+    parser = HtmlParser()
+
+    assert parser.selector('.story p') is parser.selector('.story p')
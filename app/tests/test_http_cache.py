@@ -0,0 +1,105 @@
+import asyncio
+import os
+
+import httpx
+import requests
+
+from app.benchmarks.mock_sites import MockSites, MockSiteServer
+from app.services.crawler.http_cache import CachingAdapter, CachingTransport, HttpCache
+
+
+def test_requests_revalidates_with_etag(tmp_path):
+    """第二次請求帶上 If-None-Match，304 時回傳快取的內容"""
+    cache = HttpCache(cache_dir=str(tmp_path), enabled=True)
+    session = requests.Session()
+    session.mount('http://', CachingAdapter(cache))
+
+    with MockSiteServer(MockSites(token='c1')) as server:
+        url = f"{server.origin}/ltn/ajaxList/news/1"
+        first = session.get(url)
+        second = session.get(url)
+
+    assert server.not_modified['ltn'] == 1
+    assert second.status_code == 200
+    assert getattr(second, 'from_cache', False)
+    assert second.json() == first.json()
+
+
+def test_httpx_transport_revalidates(tmp_path):
+    """AsyncFetcher 使用的 transport 同樣以 304 取得快取內容"""
+    cache = HttpCache(cache_dir=str(tmp_path), enabled=True)
+
+    async def fetch_twice(url):
+        async with httpx.AsyncClient(transport=CachingTransport(httpx.AsyncHTTPTransport(), cache)) as client:
+            first = await client.get(url)
+            second = await client.get(url)
+            return first.text, second.text
+
+    with MockSiteServer(MockSites(token='c2')) as server:
+        first, second = asyncio.run(fetch_twice(f"{server.origin}/udn/house/story/c2-1-1"))
+
+    assert server.not_modified['udn'] == 1
+    assert second == first and 'article-content__title' in second
+
+
+def test_evicts_least_recently_used(tmp_path):
+    """超過大小上限時淘汰最久未使用的項目"""
+    cache = HttpCache(cache_dir=str(tmp_path), max_bytes=8000, enabled=True)
+    body = b'x' * 900
+    for i in range(8):
+        cache.put(f"https://example.com/{i}", {'etag': f'"{i}"'}, body)
+        os.utime(cache._path(f"https://example.com/{i}"), (i, i))
+    # 讀取會更新使用時間，0 號不會被淘汰
+    assert cache.get('https://example.com/0')
+
+    cache.put('https://example.com/8', {'etag': '"8"'}, body)
+    cache.put('https://example.com/9', {'etag': '"9"'}, body)
+
+    assert cache.get('https://example.com/0') is not None
+    assert cache.get('https://example.com/1') is None
+    assert cache.get('https://example.com/9') is not None
+    assert HttpCache.conditional_headers(cache.get('https://example.com/9')) == {'If-None-Match': '"9"'}
+
+
+def test_injected_transport_bypasses_cache(tmp_path, monkeypatch):
+    """AsyncFetcher 指定 transport（錄製、重播）時不送出條件式請求"""
+    from app.services.crawler import async_fetcher
+    from app.services.crawler.async_fetcher import AsyncFetcher
+    from app.services.crawler.rate_limiter import rate_limiter
+
+    url = 'https://estate.ltn.com.tw/article/1'
+    cache = HttpCache(cache_dir=str(tmp_path), enabled=True)
+    cache.put(url, {'etag': '"v1"'}, b'<h1>cached</h1>')
+    monkeypatch.setattr(async_fetcher, 'http_cache', cache)
+    monkeypatch.setattr(rate_limiter, 'enabled', False)
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get('If-None-Match'))
+        return httpx.Response(200, text='<h1>live</h1>')
+
+    monkeypatch.setattr(AsyncFetcher, 'transport', httpx.MockTransport(handler))
+
+    async def fetch():
+        async with AsyncFetcher() as fetcher:
+            return await fetcher.fetch(url)
+
+    assert asyncio.run(fetch()) == '<h1>live</h1>'
+    assert seen == [None]
+
+
+def test_cache_busting_params_share_entry(tmp_path):
+    """只有防快取參數 _= 不同的請求共用同一個項目，第二次請求取得 304"""
+    cache = HttpCache(cache_dir=str(tmp_path), enabled=True)
+    session = requests.Session()
+    session.mount('http://', CachingAdapter(cache))
+
+    with MockSiteServer(MockSites(token='c4')) as server:
+        first = session.get(f"{server.origin}/udn/house/api/newest?page=1&_=1700000000000")
+        second = session.get(f"{server.origin}/udn/house/api/newest?page=1&_=1700000000999")
+
+    assert len(os.listdir(tmp_path)) == 1
+    assert server.not_modified['udn'] == 1
+    assert getattr(second, 'from_cache', False)
+    assert second.json() == first.json()
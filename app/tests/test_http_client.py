@@ -0,0 +1,52 @@
+import pytest
+
+from app.benchmarks.mock_sites import MockSites, MockSiteServer
+from app.services.crawler.base import BaseCrawler
+from app.services.crawler.http_client import HAS_CLOUDSCRAPER, HttpClientFactory
+from app.services.crawler.rate_limiter import rate_limiter
+
+
+class DummyCrawler(BaseCrawler):
+    async def crawl_list(self, page=1):
+        return []
+
+    async def crawl_article(self, url):
+        return None
+
+
+def test_sessions_are_reused_per_host():
+    """同一網域重用同一個 session，不同網域各自獨立"""
+    factory = HttpClientFactory()
+
+    ltn = factory.session('https://estate.ltn.com.tw/ajaxList/news/1')
+    assert factory.session('https://estate.ltn.com.tw/article/1') is ltn
+    assert factory.session('https://house.udn.com/house/api/newest') is not ltn
+
+    factory.close()
+    assert factory.session('https://estate.ltn.com.tw/article/1') is not ltn
+
+
+@pytest.mark.skipif(not HAS_CLOUDSCRAPER, reason="未安裝 cloudscraper")
+def test_scraper_is_reused_per_host():
+    """cloudscraper session 同樣依網域重用，保留 Cloudflare cookie"""
+    factory = HttpClientFactory()
+    scraper = factory.scraper('https://www.edgeprop.my/news')
+
+    assert factory.scraper('https://www.edgeprop.my/content/1') is scraper
+    assert scraper is not factory.session('https://www.edgeprop.my/news')
+
+
+def test_http_get_uses_injected_factory(monkeypatch):
+    """http_get 經由爬蟲的 http_client 取得 session，連線在多次請求間重用"""
+    monkeypatch.setattr(rate_limiter, 'enabled', False)
+    crawler = DummyCrawler()
+    crawler.http_client = HttpClientFactory(timeout=5)
+
+    with MockSiteServer(MockSites(token='h1')) as server:
+        url = f"{server.origin}/ltn/ajaxList/news/1"
+        assert crawler.http_get(url).json()[0]['title'] == 'ltn 模擬新聞 h1-1-1'
+        assert crawler.http_get(url).status_code == 200
+        host = HttpClientFactory.host(url)
+
+    assert list(crawler.http_client._sessions) == [('requests', host)]
+    assert crawler.pages_visited == 2
@@ -0,0 +1,68 @@
+import pytest
+
+from app.core import metrics
+from app.core.metrics import DB_UPSERT_SECONDS, FETCH_RETRIES, observe, render_metrics
+
+pytestmark = pytest.mark.skipif(not metrics.HAS_PROMETHEUS, reason="prometheus_client 未安裝")
+
+
+def _sample(name, **labels):
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_observe_records_duration_even_on_error():
+    """區塊拋出例外時仍記錄耗時"""
+    before = _sample('reas_db_upsert_batch_seconds_count', method='test')
+
+    with pytest.raises(ValueError):
+        with observe(DB_UPSERT_SECONDS, method='test'):
+            raise ValueError("boom")
+
+    assert _sample('reas_db_upsert_batch_seconds_count', method='test') == before + 1
+
+
+def test_wait_and_get_retries_are_counted(monkeypatch):
+    """wait_and_get 逾時重試時累加重試次數"""
+    from selenium.common.exceptions import TimeoutException
+    from app.services.crawler.base import BaseCrawler
+    from app.services.crawler.rate_limiter import rate_limiter
+
+    class FlakyDriver:
+        def get(self, url):
+            raise TimeoutException("slow")
+
+        def execute_script(self, script):
+            pass
+
+        def delete_all_cookies(self):
+            pass
+
+    class DummyCrawler(BaseCrawler):
+        async def crawl_list(self, page=1):
+            return []
+
+        async def crawl_article(self, url):
+            return None
+
+    crawler = DummyCrawler()
+    crawler.source_name = 'metrics-test'
+    crawler.driver = FlakyDriver()
+    before = _sample('reas_crawler_fetch_retries_total', source='metrics-test', method='selenium')
+
+    monkeypatch.setattr(rate_limiter, 'enabled', False)
+    monkeypatch.setattr(BaseCrawler.wait_and_get.retry, 'sleep', lambda seconds: None)
+    with pytest.raises(Exception):
+        crawler.wait_and_get('http://127.0.0.1/never')
+
+    assert _sample('reas_crawler_fetch_retries_total', source='metrics-test', method='selenium') == before + 2
+    assert crawler.pages_visited == 3
+
+
+def test_render_metrics():
+    """匯出內容包含爬蟲與 API 指標"""
+    content, content_type = render_metrics()
+
+    assert content_type.startswith('text/plain')
+    assert b'reas_crawler_fetch_seconds' in content
+    assert b'reas_api_request_seconds' in content
@@ -0,0 +1,40 @@
+import asyncio
+
+from app.benchmarks.mock_sites import MockSites, MockSiteServer
+from app.core.config import settings
+from app.services.crawler.base import resolve_url
+from app.services.crawler.ltn_crawler import LTNCrawler
+from app.services.crawler.rate_limiter import rate_limiter
+
+
+def test_resolve_url(monkeypatch):
+    """只替換完整的 origin，其他網址維持不變"""
+    monkeypatch.setattr(settings, 'CRAWLER_ORIGIN_OVERRIDES', {'https://house.udn.com': 'http://127.0.0.1:8900/udn/'})
+
+    assert resolve_url('https://house.udn.com/house/api/newest?page=2') == 'http://127.0.0.1:8900/udn/house/api/newest?page=2'
+    assert resolve_url('https://house.udn.com') == 'http://127.0.0.1:8900/udn'
+    assert resolve_url('https://house.udn.com.tw/house') == 'https://house.udn.com.tw/house'
+    assert resolve_url('https://estate.ltn.com.tw/') == 'https://estate.ltn.com.tw/'
+
+
+def test_ltn_crawl_against_mock_site(monkeypatch):
+    """LTN 爬蟲經由模擬站完成列表與文章解析，文章網址仍是原網站的網址"""
+    sites = MockSites(pages=2, per_page=3, token='t1')
+    monkeypatch.setattr(rate_limiter, 'enabled', False)
+    with MockSiteServer(sites) as server:
+        monkeypatch.setattr(settings, 'CRAWLER_ORIGIN_OVERRIDES', server.overrides())
+        day = sites.article_date.isoformat()
+        articles = asyncio.run(LTNCrawler().crawl(start_date=day, end_date=day))
+
+    assert len(articles) == 6
+    assert articles[0].url == 'https://estate.ltn.com.tw/article/t1-1-1'
+    assert '第 1 段' in articles[0].content
+    # 2 個列表頁 + 第 3 頁（空列表） + 6 篇文章
+    assert server.requests['ltn'] == 9
+
+
+def test_mock_site_error_rate():
+    """錯誤率為 1 時所有請求都回應 503 並計入統計"""
+    with MockSiteServer(MockSites(), error_rate=1) as server:
+        assert server.handle('/ltn/ajaxList/news/1')[0] == 503
+    assert server.errors['ltn'] == 1
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.cache import TTLCache
+from app.core.pagination import decode_cursor, encode_cursor, keyset_condition, next_cursor, page_links
+from app.models.article import Article
+
+
+def test_cursor_round_trip():
+    """游標應可還原 (published_at, id)"""
+    article = Article(id=42, published_at=datetime(2025, 1, 7, 8, 30, 15))
+
+    assert decode_cursor(encode_cursor(article)) == (datetime(2025, 1, 7, 8, 30, 15), 42)
+
+
+def test_invalid_cursor_rejected():
+    """格式錯誤的游標應拋出 ValueError"""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_condition_uses_published_at_range():
+    """條件應包含 published_at 範圍，讓查詢可使用索引"""
+    cursor = encode_cursor(Article(id=42, published_at=datetime(2025, 1, 7)))
+    sql = str(keyset_condition(cursor).compile(dialect=postgresql.dialect()))
+
+    assert "articles.published_at <=" in sql
+    assert "articles.id <" in sql
+
+
+def test_next_cursor_only_when_page_full():
+    """本頁未滿時沒有下一頁"""
+    articles = [Article(id=i, published_at=datetime(2025, 1, 7)) for i in range(3)]
+
+    assert next_cursor(articles, limit=5) is None
+    assert decode_cursor(next_cursor(articles, limit=3)) == (datetime(2025, 1, 7), 2)
+
+
+def test_page_links_carry_cursors():
+    """keyset 分頁的頁碼連結都應帶有游標，不產生只有 page 的深層頁碼"""
+    links = page_links(10, 50, prev_cursor='p', next_cursor='n')
+    queries = dict(links['pages'])
+
+    assert sorted(queries) == [8, 9, 10, 11, 12]
+    assert queries[10] is None
+    assert queries[9] == 'page=9&before=p&skip=0'
+    assert queries[8] == 'page=8&before=p&skip=1'
+    assert queries[12] == 'page=12&cursor=n&skip=1'
+    assert links['first'] == 'page=1'
+    assert links['last'] == 'page=50&last=1'
+    for page, query in links['pages']:
+        if query:
+            assert 'cursor=' in query or 'before=' in query
+
+
+def test_page_links_follow_cursors_not_total():
+    """是否有上一頁／下一頁依游標判斷，不依賴（可能過時的）總頁數"""
+    first = page_links(1, 3, prev_cursor=None, next_cursor='n')
+    assert first['first'] is None and first['prev'] is None
+    assert [page for page, _ in first['pages']] == [1, 2, 3]
+
+    # 快取的總數過時：總頁數為 1，但實際還有下一頁
+    stale = page_links(1, 1, prev_cursor=None, next_cursor='n')
+    assert stale['next'] == 'page=2&cursor=n'
+    assert stale['last'] == 'page=2&last=1'
+
+    end = page_links(3, 3, prev_cursor='p', next_cursor=None)
+    assert end['next'] is None and end['last'] is None
+
+
+def test_ttl_cache_expires():
+    """過期的值應重新計算"""
+    cache = TTLCache(ttl=0)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_set('total', factory) == 1
+    assert cache.get_or_set('total', factory) == 2
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+from app.services.crawler.rate_limiter import RateLimiter
+
+
+def test_burst_then_wait(tmp_path):
+    """桶內 token 用完後，後續請求應依速率排開"""
+    limiter = RateLimiter(rate=2, burst=2, state_dir=str(tmp_path), enabled=True)
+
+    assert limiter.reserve("https://example.com/1") == 0
+    assert limiter.reserve("https://example.com/2") == 0
+    assert 0.4 < limiter.reserve("https://example.com/3") <= 0.5
+    assert 0.9 < limiter.reserve("https://example.com/4") <= 1.0
+
+
+def test_hosts_are_independent(tmp_path):
+    """不同網域各自擁有獨立的桶，且可個別設定速率"""
+    limiter = RateLimiter(rate=1, burst=1, state_dir=str(tmp_path), enabled=True)
+    limiter.configure_host("slow.example.com", rate=0.5, burst=1)
+
+    assert limiter.reserve("https://a.example.com/") == 0
+    assert limiter.reserve("https://b.example.com/") == 0
+    assert limiter.reserve("https://slow.example.com/") == 0
+    assert 1.9 < limiter.reserve("https://slow.example.com/next") <= 2.0
+
+
+def test_state_shared_between_limiters(tmp_path):
+    """使用同一狀態目錄的限制器（例如不同行程）共用同一個桶"""
+    first = RateLimiter(rate=1, burst=1, state_dir=str(tmp_path), enabled=True)
+    second = RateLimiter(rate=1, burst=1, state_dir=str(tmp_path), enabled=True)
+
+    assert first.reserve("https://example.com/a") == 0
+    assert second.reserve("https://example.com/b") > 0.9
+
+
+def test_disabled_limiter_never_waits(tmp_path):
+    """停用時不應等待"""
+    limiter = RateLimiter(rate=1, burst=1, state_dir=str(tmp_path), enabled=False)
+
+    for _ in range(5):
+        assert limiter.reserve("https://example.com/") == 0
+
+
+def test_acquire_async_reserves_off_the_event_loop(tmp_path):
+    """acquire_async 的檔案鎖與狀態檔讀寫不應在事件迴圈的執行緒上執行"""
+    limiter = RateLimiter(rate=100, burst=1, state_dir=str(tmp_path), enabled=True)
+    reserve_in_file = limiter._reserve_in_file
+    threads = []
+
+    def tracking_reserve(host):
+        threads.append(threading.get_ident())
+        return reserve_in_file(host)
+
+    limiter._reserve_in_file = tracking_reserve
+
+    async def acquire_twice():
+        await asyncio.gather(
+            limiter.acquire_async("https://example.com/a"),
+            limiter.acquire_async("https://example.com/b"),
+        )
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(acquire_twice())
+
+    assert len(threads) == 2
+    assert loop_thread not in threads
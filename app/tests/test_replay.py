@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+import requests
+
+from app.benchmarks.replay import (
+    FIXTURE_DIR, FixtureStore, ReplayAdapter, ReplayServer, ReplayTransport, fixture_paths, replay, route_requests
+)
+
+SAMPLE = Path(__file__).parent / 'fixtures' / 'replay' / 'ltn.json'
+RECORDED = fixture_paths(FIXTURE_DIR)
+
+
+def test_fixture_store_roundtrip(tmp_path):
+    """fixture 以 gzip 儲存後可完整讀回，JSON 回應自動標記為 json"""
+    store = FixtureStore('ltn', pages=2)
+    store.add('https://estate.ltn.com.tw/ajaxList/news/1', 200, 'application/json', '[]', 'list')
+    store.add('https://estate.ltn.com.tw/article/1', 200, 'text/html', '<h1>標題</h1>', 'article')
+
+    loaded = FixtureStore.load(store.save(tmp_path / 'ltn.json.gz'))
+
+    assert loaded.pages == 2
+    assert loaded.count('json') == 1 and loaded.count('article') == 1
+    assert loaded.lookup('https://estate.ltn.com.tw/article/1')['response']['body'] == '<h1>標題</h1>'
+
+
+def test_cache_busting_params_are_ignored():
+    """UDN 列表網址的 _= 時間戳記每次不同，重播時仍能對應到錄製的回應"""
+    store = FixtureStore('udn')
+    store.add('https://house.udn.com/house/api/newest?page=1&_=1700000000000', 200, 'application/json', '{}', 'list')
+
+    assert store.lookup('https://house.udn.com/house/api/newest?page=1&_=1800000000000') is not None
+    assert store.lookup('https://house.udn.com/house/api/newest?page=2&_=1700000000000') is None
+
+
+def test_requests_are_routed_to_replay_server():
+    """原本的網址改送到重播伺服器，未錄製的網址回應 404"""
+    store = FixtureStore.load(SAMPLE)
+    with ReplayServer(store) as server, \
+            route_requests(ReplayAdapter(server.origin), ReplayTransport(server.origin)):
+        session = requests.Session()
+        assert session.get('https://estate.ltn.com.tw/ajaxList/news/1').json()[0]['title'] == '房市新聞 1'
+        assert session.get('https://estate.ltn.com.tw/missing').status_code == 404
+
+    assert server.misses == ['https://estate.ltn.com.tw/missing']
+
+
+def test_replay_ltn_sample():
+    """重播 LTN 範例：列表 JSON 與文章頁皆解析成功，且沒有送出未錄製的請求"""
+    result = replay(FixtureStore.load(SAMPLE), iterations=1, measure_memory=False)
+
+    assert result['listed'] == 2
+    assert result['complete'] == 2
+    assert result['misses'] == []
+    assert '點我下載APP' not in result['sample']['content']
+
+
+@pytest.mark.parametrize('source', sorted(RECORDED) or [pytest.param(None, marks=pytest.mark.skip(reason="尚未錄製 fixture"))])
+def test_recorded_fixtures(source, request):
+    """錄製的 fixture 重播後仍能解析出文章；安裝 pytest-benchmark 時一併量測"""
+    store = FixtureStore.load(RECORDED[source])
+    result = replay(store, iterations=1, measure_memory=False)
+
+    assert result['articles'] > 0
+    assert result['complete'] == result['articles']
+
+    if request.config.pluginmanager.hasplugin('benchmark'):
+        benchmark = request.getfixturevalue('benchmark')
+        benchmark.pedantic(replay, args=(store,), kwargs={'iterations': 0, 'measure_memory': False}, rounds=3)
@@ -0,0 +1,53 @@
+from sqlalchemy.dialects import postgresql
+
+from app.core.search import build_search_query, build_search_vector, search_filter, tokenize
+
+
+def test_tokenize_mixed_text():
+    """中文切成二元組，英文與馬來文以小寫單字為單位"""
+    assert tokenize("台北房價 Harga Rumah 2025") == ["台北", "北房", "房價", "harga", "rumah", "2025"]
+
+
+def test_single_cjk_character_kept():
+    """單一中文字不切分"""
+    assert tokenize("買、賣") == ["買", "賣"]
+
+
+def test_search_vector_weights():
+    """標題權重為 A，內文為 C"""
+    vector = build_search_vector("房價", content="房價上漲")
+
+    assert "'房價':1A,2C" in vector
+    assert "'價上':3C" in vector
+
+
+def test_search_query():
+    """關鍵字所有詞彙皆須出現，單一中文字不列入 tsquery，標題搜尋限定權重 A"""
+    assert build_search_query("房價 KLCC") == "'房價' & 'klcc'"
+    assert build_search_query("房") is None
+    assert build_search_query("房 KLCC") == "'klcc'"
+    assert build_search_query("房價", title_only=True) == "'房價':A"
+    assert build_search_query("!!!") is None
+
+
+def test_punctuation_splits_words():
+    """標點符號不列入詞彙，避免破壞 tsquery 語法"""
+    assert build_search_query("it's") == "'it' & 's'"
+    assert build_search_vector("o'neil") == "'o':1A 'neil':2A"
+
+
+def test_single_cjk_character_matches_second_position():
+    """單一中文字只出現在二元組第二個字（買房）時也要命中，改用 ILIKE 比對"""
+    assert "房" not in [token[0] for token in tokenize("買房")]
+
+    condition, rank = search_filter("房")
+    sql = str(condition.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+    assert rank is None
+    assert "articles.title ILIKE '%%房%%'" in sql
+    assert "articles.content ILIKE '%%房%%'" in sql
+
+    condition, rank = search_filter("房 KLCC", title_only=True)
+    sql = str(condition.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+    assert rank is not None
+    assert "@@" in sql and "articles.title ILIKE '%%房%%'" in sql
+    assert "content" not in sql
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import logging
+
+import pytest
+
+from app.core.logging_config import StructuredFormatter
+from app.core.timing import span, timed, timing_run
+from app.services.crawler.base import BaseCrawler
+
+
+def test_spans_are_summarized_per_run():
+    """同一次執行中的 span 依階段累計，例外時也會記錄"""
+    with timing_run('ltn', log=False) as timings:
+        with span('parse'):
+            pass
+        with pytest.raises(ValueError):
+            with span('parse'):
+                raise ValueError("boom")
+        with span('db_upsert'):
+            pass
+
+    summary = timings.as_dict()
+    assert summary['parse']['calls'] == 2
+    assert summary['db_upsert']['calls'] == 1
+
+    # 執行結束後的 span 不再累計
+    with span('parse'):
+        pass
+    assert timings.as_dict()['parse']['calls'] == 2
+
+
+def test_crawler_methods_are_timed_with_url():
+    """子類的 crawl_list / crawl_article 自動計時，文章網址帶入 url 欄位"""
+    class DummyCrawler(BaseCrawler):
+        async def crawl_list(self, page=1):
+            return [{'url': 'https://example.com/a'}]
+
+        async def crawl_article(self, article_info):
+            return {'url': article_info['url']}
+
+    async def run():
+        crawler = DummyCrawler()
+        infos = await crawler.crawl_list()
+        return await crawler.crawl_article(infos[0])
+
+    with timing_run('dummy', log=False) as timings:
+        assert asyncio.run(run()) == {'url': 'https://example.com/a'}
+
+    assert set(timings.as_dict()) == {'crawl_list', 'crawl_article'}
+
+
+def test_timed_extracts_url_argument(caplog):
+    """timed 從指定參數取出網址，並以結構化欄位輸出"""
+    @timed('fetch', url_arg='url')
+    def fetch(url):
+        return url
+
+    with caplog.at_level(logging.DEBUG, logger='app.core.timing'):
+        fetch('https://example.com/b')
+
+    record = next(r for r in caplog.records if getattr(r, 'stage', None) == 'fetch')
+    data = json.loads(StructuredFormatter().format(record))
+    assert data['stage'] == 'fetch'
+    assert data['url'] == 'https://example.com/b'
+    assert 'duration' in data
@@ -0,0 +1,39 @@
+from app.services.crawler.ltn_crawler import LTNCrawler
+from app.services.crawler.url_index import KnownUrlIndex
+
+
+def make_crawler(known, stop_on_known_page=True):
+    crawler = LTNCrawler()
+    crawler.known_urls = KnownUrlIndex(known)
+    crawler.stop_on_known_page = stop_on_known_page
+    return crawler
+
+
+def test_known_articles_skipped():
+    """已收錄的文章應在抓取內容前被過濾"""
+    crawler = make_crawler(["https://example.com/a"])
+
+    new_infos, stop = crawler.skip_known([
+        {'url': "https://example.com/a"},
+        {'url': "https://example.com/b"},
+    ])
+
+    assert [info['url'] for info in new_infos] == ["https://example.com/b"]
+    assert not stop
+
+
+def test_stop_when_page_entirely_known():
+    """整頁皆已收錄時應停止翻頁，停用選項時則繼續"""
+    page = [{'url': "https://example.com/a"}, {'url': "https://example.com/b"}]
+    known = ["https://example.com/a", "https://example.com/b"]
+
+    assert make_crawler(known).skip_known(page) == ([], True)
+    assert make_crawler(known, stop_on_known_page=False).skip_known(page) == ([], False)
+
+
+def test_without_index_nothing_skipped():
+    """未載入索引時不過濾任何文章"""
+    crawler = LTNCrawler()
+    page = [{'url': "https://example.com/a"}]
+
+    assert crawler.skip_known(page) == (page, False)
@@ -0,0 +1,143 @@
+"""
+爬取任務 worker
+從 crawl_jobs 佇列取出任務並執行，增加 worker 行程（或容器）即可提高爬取吞吐量。
+
+使用方式：
+    python -m app.worker --concurrency 2
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import Base, engine, SessionLocal
+from app.core.logging_config import setup_logging
+from app.core.metrics import mark_process_dead, reset_multiprocess_dir, start_metrics_server
+from app.core.search import ensure_search_schema
+from app.services.crawl_queue import claim_job, finish_job, heartbeat
+from app.services.crawl_runner import run_crawl
+from app.services.crawler.driver_pool import driver_pool
+
+logger = logging.getLogger(__name__)
+
+
+class Heartbeat(threading.Thread):
+    """任務執行期間定期更新 heartbeat，讓其他 worker 知道任務仍在進行"""
+
+    def __init__(self, job_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            heartbeat(self.job_id)
+
+    def stop(self):
+        self._stopped.set()
+
+
+def run_job(job) -> Optional[str]:
+    """執行單一任務
+
+    Returns:
+        失敗時的錯誤訊息，成功時為 None
+    """
+    beat = Heartbeat(job.id, settings.CRAWL_JOB_HEARTBEAT_INTERVAL)
+    beat.start()
+    try:
+        count = asyncio.run(run_crawl(
+            job.source,
+            start_date=job.start_date.isoformat() if job.start_date else None,
+            end_date=job.end_date.isoformat() if job.end_date else None,
+            stop_on_known_page=job.stop_on_known_page,
+            progress=lambda stage, **counts: heartbeat(job.id, stage, **counts),
+        ))
+        logger.info(f"✅ 爬取任務 #{job.id} ({job.source}) 完成，共爬取 {count} 篇文章")
+        return None
+    except Exception as e:
+        logger.error(f"❌ 爬取任務 #{job.id} ({job.source}) 失敗: {str(e)}", exc_info=True)
+        return str(e) or type(e).__name__
+    finally:
+        beat.stop()
+
+
+def worker_loop(stop: threading.Event, poll_interval: float):
+    """持續取出並執行任務，直到收到停止訊號"""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"worker {worker_id} 已啟動")
+
+    try:
+        while not stop.is_set():
+            db = SessionLocal()
+            try:
+                job = claim_job(db, worker_id)
+            except Exception as e:
+                logger.error(f"取出爬取任務失敗: {str(e)}")
+                job = None
+            finally:
+                db.close()
+
+            if job is None:
+                stop.wait(poll_interval)
+                continue
+
+            finish_job(job.id, error=run_job(job))
+    finally:
+        driver_pool.shutdown()
+        logger.info(f"worker {worker_id} 已停止")
+
+
+def worker_process(stop, poll_interval: float):
+    """子行程進入點"""
+    setup_logging()
+    # fork 後不沿用父行程的資料庫連線
+    engine.dispose(close=False)
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    worker_loop(stop, poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='爬取任務 worker')
+    parser.add_argument('--concurrency', type=int, default=settings.CRAWL_WORKER_CONCURRENCY,
+                        help='worker 行程數量')
+    parser.add_argument('--poll-interval', type=float, default=settings.CRAWL_WORKER_POLL_INTERVAL,
+                        help='佇列為空時的輪詢間隔（秒）')
+    args = parser.parse_args()
+
+    setup_logging()
+    Base.metadata.create_all(bind=engine)
+    ensure_search_schema(engine)
+
+    # 子行程的指標寫入 PROMETHEUS_MULTIPROC_DIR，由主行程彙總匯出
+    reset_multiprocess_dir()
+    start_metrics_server(settings.CRAWL_WORKER_METRICS_PORT)
+
+    stop = multiprocessing.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    # 執行中的任務會先完成再結束
+    processes = [
+        multiprocessing.Process(target=worker_process, args=(stop, args.poll_interval), name=f"crawl-worker-{i}")
+        for i in range(max(1, args.concurrency))
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"已啟動 {len(processes)} 個 worker 行程")
+
+    for process in processes:
+        process.join()
+        mark_process_dead(process.pid)
+
+
+if __name__ == '__main__':
+    main()